@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare the per-file CLI loop used by validate-pr.yml with --batch mode.
+
+Usage: python benchmarks/bench_batch_validate.py [--files N] [--yaml-ratio R]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import write_corpus
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'scripts' / 'validate_submission.py'
+
+
+def time_per_file_loop(paths):
+    start = time.perf_counter()
+    for path in paths:
+        subprocess.run([sys.executable, str(SCRIPT), str(path)],
+                       stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def time_batch(directory, jobs):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(SCRIPT), '--batch', '--jobs', str(jobs), directory],
+                   stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=500)
+    parser.add_argument('--yaml-ratio', type=float, default=0.2)
+    parser.add_argument('--loop-files', type=int, default=100,
+                        help="files timed with the per-file loop (extrapolated to --files)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_corpus(tmp, args.files, yaml_ratio=args.yaml_ratio)
+
+        sample = paths[:args.loop_files]
+        loop = time_per_file_loop(sample) * len(paths) / len(sample)
+        print(f"per-file loop (extrapolated): {loop:8.2f}s  {len(paths) / loop:8.0f} files/s")
+
+        jobs = 1
+        while True:
+            elapsed = time_batch(tmp, jobs)
+            print(f"--batch --jobs {jobs:<3}          {elapsed:8.2f}s  "
+                  f"{len(paths) / elapsed:8.0f} files/s  ({loop / elapsed:.1f}x)")
+            if jobs >= (os.cpu_count() or 1):
+                break
+            jobs = min(jobs * 2, os.cpu_count() or 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Build a claim similarity index of synthetic claims and time near-duplicate queries.
+
+Claims are random sentences over a fixed vocabulary. Half of the queries
+are stored claims with one or two words replaced (near-duplicates whose
+recall is reported), half are new sentences. The cost of the pairwise scan
+the index replaces is extrapolated from scanning a sample.
+
+Usage: python benchmarks/bench_claim_index.py [--claims 1000000] [--queries 1000]
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from claim_index import DEFAULT_THRESHOLD, ClaimIndex, jaccard, shingles
+
+
+def make_vocabulary(rng: random.Random, size: int = 20000):
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return [''.join(rng.choice(letters) for _ in range(rng.randint(2, 11))) for _ in range(size)]
+
+
+def make_claim(rng: random.Random, words) -> str:
+    return ' '.join(rng.choice(words) for _ in range(rng.randint(10, 24))) + '.'
+
+
+def reword(rng: random.Random, text: str, words) -> str:
+    tokens = text.rstrip('.').split()
+    for _ in range(rng.randint(1, 2)):
+        tokens[rng.randrange(len(tokens))] = rng.choice(words)
+    return ' '.join(tokens) + '.'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--claims', type=int, default=1000000)
+    parser.add_argument('--claims-per-file', type=int, default=5)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--scan-sample', type=int, default=20000,
+                        help="claims scanned pairwise to extrapolate the linear cost")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    words = make_vocabulary(rng)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'claims.sqlite')
+        index = ClaimIndex(db_path)
+        stored = []
+        start = time.perf_counter()
+        for file_number in range(0, args.claims, args.claims_per_file):
+            claims = [('claims', position, make_claim(rng, words))
+                      for position in range(1, min(args.claims_per_file, args.claims - file_number) + 1)]
+            index.add(f"user_{file_number % 1000}/s_{file_number}.json", claims)
+            if len(stored) < args.queries:
+                stored.append(claims[0][2])
+        index.flush()
+        elapsed = time.perf_counter() - start
+        index.close()
+        size = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp))
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"build {args.claims} claims: {elapsed:.1f}s ({args.claims / elapsed:.0f} claims/s), "
+              f"database {size / 1e6:.0f} MB, peak RSS {peak:.0f} MB")
+
+        near = [reword(rng, text, words) for text in stored[:args.queries // 2]]
+        fresh = [make_claim(rng, words) for _ in range(args.queries - len(near))]
+        index = ClaimIndex(db_path, readonly=True)
+        for label, queries in (('near-duplicate', near), ('new', fresh)):
+            start = time.perf_counter()
+            found = sum(1 for text in queries if index.query(text))
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<15} {elapsed / len(queries) * 1000:8.3f} ms/query, "
+                  f"{found}/{len(queries)} with matches >= {DEFAULT_THRESHOLD}")
+        expected = sum(1 for original, text in zip(stored, near)
+                       if jaccard(shingles(original), shingles(text)) >= DEFAULT_THRESHOLD)
+        print(f"  near-duplicates above the threshold: {expected}/{len(near)}")
+
+        sample = [shingles(text) for (text,) in index.conn.execute(
+            "SELECT text FROM claims LIMIT ?", (args.scan_sample,))]
+        query = shingles(fresh[0])
+        start = time.perf_counter()
+        for other in sample:
+            jaccard(query, other)
+        elapsed = (time.perf_counter() - start) / len(sample) * args.claims
+        print(f"  pairwise scan   {elapsed * 1000:8.1f} ms/query (extrapolated, shingles precomputed)")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
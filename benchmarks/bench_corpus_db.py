@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Full build, incremental update and search latency of the corpus database.
+
+Usage: python benchmarks/bench_corpus_db.py [--files 10000] [--changed 100]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from corpus_db import CorpusDB
+from synthetic import write_organized_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--changed', type=int, default=100)
+    parser.add_argument('--queries', nargs='+', default=['bandgap', 'python step_1', 'DFT PBE', 'nonexistentterm'])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'organized')
+        paths = write_organized_corpus(root, args.files)
+
+        with CorpusDB(os.path.join(tmp, 'corpus.sqlite')) as db:
+            start = time.perf_counter()
+            stats = db.build(root)
+            print(f"full build: {time.perf_counter() - start:.2f}s {stats}")
+
+            for path in paths[:args.changed]:
+                data = json.loads(path.read_text())
+                data['claims'][0]['claim'] += ' Revised.'
+                path.write_text(json.dumps(data))
+            start = time.perf_counter()
+            stats = db.build(root)
+            print(f"incremental ({args.changed} changed): {time.perf_counter() - start:.2f}s {stats}")
+
+            start = time.perf_counter()
+            stats = db.build(root)
+            print(f"no-op rebuild: {time.perf_counter() - start:.2f}s")
+
+            for query in args.queries:
+                start = time.perf_counter()
+                for _ in range(20):
+                    hits = db.search_claims(query)
+                elapsed = (time.perf_counter() - start) / 20
+                print(f"search {query!r}: {elapsed * 1e3:.2f} ms ({len(hits)} hits)")
+
+
+if __name__ == "__main__":
+    main()
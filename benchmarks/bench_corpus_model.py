@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Compare the memory of the compact corpus model with plain dicts.
+
+Synthetic submissions are written as JSON lines to a temporary file and
+parsed back, so their strings are separate objects as after loading files.
+The dict form keeps every parsed dict; the model is built from the same
+stream, one dict at a time. Memory is what tracemalloc reports as still
+allocated once each form is built, traced separately.
+
+Usage: python benchmarks/bench_corpus_model.py [--submissions 100000] [--claims 3] [--steps 4]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from corpus_model import Corpus
+from synthetic import make_submission, username_picker
+
+CLAIM_TYPES = ('pip_libraries', 'custom_code', 'materials_project')
+SETUP_STEPS = ('pip install -r requirements.txt', 'conda env create -f environment.yml')
+
+
+def write_records(path: str, count: int, claims: int, steps: int):
+    rng = random.Random(0)
+    pick_username = username_picker(rng, 1000, 1.1)
+    with open(path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            data = make_submission(rng, i, username=pick_username(i), claims=claims, steps=steps)
+            data['claim_type'] = rng.choice(CLAIM_TYPES)
+            for claim in data['claims']:
+                claim['instruction'][0] = rng.choice(SETUP_STEPS)
+            f.write(json.dumps([f"{data['username']}/submission_{i:06d}.json", data]) + '\n')
+
+
+def read_records(path: str):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--submissions', type=int, default=100000)
+    parser.add_argument('--claims', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=4)
+    args = parser.parse_args()
+
+    print(f"{args.submissions} submissions, {args.claims} claims x {args.steps} steps")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'records.jsonl')
+        write_records(path, args.submissions, args.claims, args.steps)
+        dicts, dict_bytes, dict_peak, dict_time = measure(lambda: [data for _, data in read_records(path)])
+        del dicts
+        corpus, model_bytes, model_peak, model_time = measure(lambda: Corpus.from_records(read_records(path)))
+    print(f"  dicts  {dict_bytes / 1e6:8.1f} MB held, {dict_peak / 1e6:8.1f} MB peak ({dict_time:.1f}s)")
+    print(f"  model  {model_bytes / 1e6:8.1f} MB held, {model_peak / 1e6:8.1f} MB peak ({model_time:.1f}s)")
+    print(f"  ratio  {dict_bytes / model_bytes:8.1f}x smaller")
+    print("  " + ', '.join(f"{name}: {count}" for name, count in corpus.stats().items()))
+
+    start = time.perf_counter()
+    steps = sum(1 for submission in corpus for _ in submission.steps())
+    elapsed = time.perf_counter() - start
+    print(f"  iterate {steps} steps: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Time corpus statistics builds, incremental refreshes and vectorized summaries.
+
+A synthetic organized corpus is built from scratch, refreshed unchanged and
+refreshed after rewriting a share of its files. The vectorized summary is
+compared with the same per-user group-by done row by row in Python.
+
+Usage: python benchmarks/bench_corpus_stats.py [--files 20000] [--users 500] [--changed 0.01]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from corpus_stats import CorpusStats
+from synthetic import make_submission, write_organized_corpus
+
+
+def python_group_by(stats: CorpusStats):
+    c = {name: column.tolist() for name, column in stats.columns.items()}
+    row_steps = defaultdict(int)
+    for row, steps in zip(c['claim_row'], c['steps']):
+        row_steps[row] += steps
+    per_user = defaultdict(lambda: [0, 0, 0, 0])
+    for row, user in enumerate(c['user']):
+        totals = per_user[user]
+        totals[0] += 1
+        totals[1] += c['claims'][row]
+        totals[2] += c['non_reproducible'][row]
+        totals[3] += row_steps[row]
+    return per_user
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--changed', type=float, default=0.01,
+                        help="share of files rewritten before a refresh")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'organized')
+        state = os.path.join(tmp, 'stats.npz')
+        paths = write_organized_corpus(root, args.files, users=args.users)
+        print(f"{args.files} files, {args.users} users")
+
+        stats = CorpusStats(state)
+        counts, elapsed = timed(lambda: stats.refresh(root))
+        stats.save()
+        print(f"  full build        {elapsed:8.3f}s  {counts}")
+
+        stats = CorpusStats(state)
+        counts, elapsed = timed(lambda: stats.refresh(root))
+        print(f"  unchanged refresh {elapsed:8.3f}s  {counts}")
+
+        rng = random.Random(1)
+        for path in rng.sample(paths, int(args.files * args.changed)):
+            path.write_text(json.dumps(make_submission(rng, 0, username=path.parent.name, claims=5)))
+        stats = CorpusStats(state)
+        counts, elapsed = timed(lambda: stats.refresh(root))
+        print(f"  {f'{args.changed:.0%} changed':<17} {elapsed:8.3f}s  {counts}")
+
+        _, vectorized = timed(stats.summary)
+        _, python = timed(lambda: python_group_by(stats))
+        print(f"  full summary      {vectorized * 1000:8.1f} ms (numpy)")
+        print(f"  per-user only     {python * 1000:8.1f} ms (row by row in Python)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare fail-fast with full validation on a mostly-invalid batch.
+
+A share of the synthetic submissions is broken twice: the username is
+invalid (an early rule) and every claim has an empty instruction step (the
+late, per-claim rules). Full validation reports every failure; fail-fast
+stops at the username. Rules are timed on parsed data and end to end on
+files with --batch --jobs 1.
+
+Usage: python benchmarks/bench_fail_fast.py [--files 2000] [--invalid 0.9] [--claims 20]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from synthetic import make_submission
+from validate_submission import SubmissionValidator, validate_paths
+
+
+def make_batch(count: int, invalid: float, claims: int, steps: int):
+    rng = random.Random(0)
+    batch = []
+    for i in range(count):
+        data = make_submission(rng, i, claims=claims, steps=steps)
+        if rng.random() < invalid:
+            data['username'] = f"user {i}"
+            for claim in data['claims']:
+                claim['instruction'][-1] = ' '
+        batch.append(data)
+    return batch
+
+
+def _best(function, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--invalid', type=float, default=0.9, help="share of invalid submissions")
+    parser.add_argument('--claims', type=int, default=20)
+    parser.add_argument('--steps', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    batch = make_batch(args.files, args.invalid, args.claims, args.steps)
+    print(f"{args.files} submissions, {args.invalid:.0%} invalid, {args.claims} claims x {args.steps} steps")
+
+    print("\nrules only (parsed data)")
+    times = {}
+    for label, fail_fast in (('full', False), ('fail-fast', True)):
+        validator = SubmissionValidator(fail_fast=fail_fast)
+        times[label] = _best(lambda: [validator.validate_data(data) for data in batch], args.repeat)
+        print(f"  {label:<10} {times[label]:8.3f}s {args.files / times[label]:10.0f} submissions/s")
+    print(f"  speedup    {times['full'] / times['fail-fast']:8.1f}x")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, data in enumerate(batch):
+            path = Path(tmp, f"submission_{i:06d}.json")
+            path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+            paths.append(str(path))
+
+        print("\nend to end (read + parse + rules, --jobs 1)")
+        for label, fail_fast in (('full', False), ('fail-fast', True)):
+            times[label] = _best(lambda: validate_paths(paths, jobs=1, fail_fast=fail_fast), args.repeat)
+            print(f"  {label:<10} {times[label]:8.3f}s {args.files / times[label]:10.0f} files/s")
+        print(f"  speedup    {times['full'] / times['fail-fast']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
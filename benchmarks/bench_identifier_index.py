@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build an identifier index of synthetic DOIs and time cold and warm lookups.
+
+Usage: python benchmarks/bench_identifier_index.py [--entries 1000000] [--lookups 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from identifier_index import IdentifierIndex, normalize_identifier
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=1000000)
+    parser.add_argument('--lookups', type=int, default=10000)
+    parser.add_argument('--prefix-length', type=int, default=2)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index_dir = os.path.join(tmp, 'index')
+        index = IdentifierIndex(index_dir, prefix_length=args.prefix_length)
+        start = time.perf_counter()
+        for i in range(args.entries):
+            index.add(normalize_identifier(f"10.1038/s41563-{i:08d}"), f"user_{i % 1000}/s_{i}.json")
+        index.flush()
+        print(f"build {args.entries} entries: {time.perf_counter() - start:.2f}s")
+
+        rng = random.Random(0)
+        keys = [normalize_identifier(f"https://doi.org/10.1038/S41563-{rng.randrange(args.entries * 2):08d}")
+                for _ in range(args.lookups)]
+
+        index = IdentifierIndex(index_dir)
+        start = time.perf_counter()
+        index.lookup(keys[0])
+        print(f"first lookup (one shard load): {(time.perf_counter() - start) * 1e3:.2f} ms")
+
+        for label in ('cold', 'warm'):
+            start = time.perf_counter()
+            hits = sum(1 for key in keys if index.lookup(key))
+            elapsed = time.perf_counter() - start
+            print(f"{label} lookups: {elapsed / len(keys) * 1e6:8.2f} µs/lookup ({hits} hits)")
+
+
+if __name__ == "__main__":
+    main()
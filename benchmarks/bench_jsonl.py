@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Throughput of streaming JSON Lines validation against bare line parsing.
+
+Usage: python benchmarks/bench_jsonl.py [--records 100000] [--claims 3] [--invalid-ratio 0.1]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from synthetic import make_submission
+from validate_submission import SubmissionValidator, validate_jsonl
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--records', type=int, default=100000)
+    parser.add_argument('--claims', type=int, default=3)
+    parser.add_argument('--invalid-ratio', type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = os.path.join(tmp, 'feed.jsonl')
+        with open(feed, 'w', encoding='utf-8') as f:
+            for i in range(args.records):
+                data = make_submission(rng, i, claims=args.claims)
+                if rng.random() < args.invalid_ratio:
+                    del data['paper_title']
+                f.write(json.dumps(data, separators=(',', ':')) + '\n')
+        size = os.path.getsize(feed)
+        print(f"{args.records} records, {size / 1e6:.1f} MB")
+
+        def lines(stream):
+            for _ in stream:
+                pass
+
+        def parse(stream):
+            for line in stream:
+                json.loads(line)
+
+        def validate(stream):
+            for _ in validate_jsonl(stream, SubmissionValidator()):
+                pass
+
+        for label, function in (('read lines', lines), ('json.loads', parse), ('validate_jsonl', validate)):
+            with open(feed, 'rb', buffering=1 << 20) as stream:
+                start = time.perf_counter()
+                function(stream)
+                elapsed = time.perf_counter() - start
+            print(f"{label:<16} {elapsed:7.2f}s {args.records / elapsed:10.0f} records/s "
+                  f"{size / elapsed / 1e6:7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Compare listing, insert and lookup in the flat and hash-prefix sharded layouts.
+
+One prolific user gets ``--files`` organized files in each layout. Listing
+walks all of the user's files and, separately, reads its largest
+directory (what ``ls`` and git pay per directory); insert organizes ``--insert`` new files with
+a fresh name index per run, as the organizer does, so the cost of listing
+the target directories is included; lookup resolves stored names to paths
+and stats them.
+
+Usage: python benchmarks/bench_layout.py [--files 50000] [--shard-width 2] [--insert 100]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from organize_by_username import organize_user
+from organized_layout import Layout, OrganizedTree, save_layout
+
+USER = 'prolific_user'
+
+
+def populate(root: Path, layout: Layout, names):
+    save_layout(root, layout)
+    user_dir = root / USER
+    for name in names:
+        directory = layout.directory(user_dir, name)
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / name).write_bytes(b'{}')
+
+
+def best(function, repeat: int = 3) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=50000)
+    parser.add_argument('--shard-width', type=int, default=2)
+    parser.add_argument('--insert', type=int, default=100)
+    parser.add_argument('--lookups', type=int, default=10000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    names = [f"submission_{i:07d}.json" for i in range(args.files)]
+    probes = rng.sample(names, min(args.lookups, len(names)))
+    print(f"{args.files} files of one user; sharded layout: {16 ** args.shard_width} directories per user")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, layout in (('flat', Layout()), ('sharded', Layout(args.shard_width))):
+            root = Path(tmp, label, 'organized')
+            populate(root, layout, names)
+            tree = OrganizedTree(str(root))
+
+            listing = best(lambda: sum(1 for _ in tree.files(USER)))
+            largest = max((entry.path for entry in os.scandir(root / USER) if entry.is_dir()),
+                          key=lambda path: len(os.listdir(path)), default=str(root / USER))
+            directory = best(lambda: os.listdir(largest))
+
+            source = Path(tmp, label, 'source')
+            source.mkdir()
+            insert_times = []
+            for run in range(3):
+                paths = []
+                for i in range(args.insert):
+                    path = source / f"new_{run}_{i}.json"
+                    path.write_bytes(b'{}')
+                    paths.append(path)
+                start = time.perf_counter()
+                processed, errors, _, _ = organize_user(str(root), USER, paths, layout=layout)
+                insert_times.append(time.perf_counter() - start)
+                assert (processed, errors) == (args.insert, 0)
+            insert = min(insert_times)
+
+            lookup = best(lambda: all(tree.resolve(f"{USER}/{name}") for name in probes))
+            print(f"  {label:<8} list all {listing * 1000:7.1f} ms   "
+                  f"list largest directory {directory * 1000:6.2f} ms   "
+                  f"insert {insert / args.insert * 1e6:7.1f} us/file   "
+                  f"lookup {lookup / len(probes) * 1e6:6.2f} us/file")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Startup time and parse throughput of the shared JSON/YAML loader.
+
+Startup is the wall time of a fresh interpreter importing the validator and
+validating one JSON file (does it import PyYAML at all?). Throughput parses a
+JSON-only and a YAML-heavy synthetic corpus with the pure-Python SafeLoader
+and with libyaml's CSafeLoader when available.
+
+Usage: python benchmarks/bench_loader.py [--files 2000] [--repeat 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+sys.path.insert(0, SCRIPTS)
+
+import data_loader
+from synthetic import write_corpus
+
+STARTUP = """
+import sys, time
+start = time.perf_counter()
+sys.path.insert(0, {scripts!r})
+from validate_submission import SubmissionValidator
+SubmissionValidator().validate_file({path!r})
+print(time.perf_counter() - start, 'yaml' in sys.modules)
+"""
+
+
+def startup(path: Path, repeat: int):
+    code = STARTUP.format(scripts=SCRIPTS, path=str(path))
+    best, imported = float('inf'), None
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        seconds, imported = output.split()
+        best = min(best, float(seconds))
+    print(f"startup + 1 JSON file: {best * 1000:7.1f} ms (PyYAML imported: {imported})")
+
+
+def _best(texts, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text, file_ext in texts:
+            data_loader.loads(text, file_ext)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def throughput(label: str, texts, repeat: int):
+    if all(file_ext == '.json' for _, file_ext in texts):
+        print(f"{label:<12} {'json':<12} {len(texts) / _best(texts, repeat):10.0f} files/s")
+        return
+    import yaml
+    loaders = [('SafeLoader', yaml.SafeLoader)]
+    if hasattr(yaml, 'CSafeLoader'):
+        loaders.append(('CSafeLoader', yaml.CSafeLoader))
+    for name, loader_class in loaders:
+        data_loader._yaml = (loader_class, yaml.YAMLError)
+        print(f"{label:<12} {name:<12} {len(texts) / _best(texts, repeat):10.0f} files/s")
+    data_loader._yaml = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        json_paths = write_corpus(os.path.join(temp_dir, 'json'), args.files, yaml_ratio=0.0)
+        yaml_paths = write_corpus(os.path.join(temp_dir, 'yaml'), args.files, yaml_ratio=0.8)
+        startup(json_paths[0], args.repeat)
+        for label, paths in (('JSON-only', json_paths), ('YAML-heavy', yaml_paths)):
+            texts = [(path.read_text(encoding='utf-8'), path.suffix.lower()) for path in paths]
+            throughput(label, texts, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Organize many same-named files for one user and compare name resolution with
+the previous stat-probing loop.
+
+Usage: python benchmarks/bench_organize_names.py [--files 10000] [--legacy-files 2000]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from organize_by_username import organize_files
+
+
+def legacy_probe(user_dir: Path, count: int) -> int:
+    """Resolve ``count`` names the old way; returns the number of stat calls."""
+    stats = 0
+    for _ in range(count):
+        target_file = user_dir / 'submission.json'
+        counter = 1
+        while True:
+            stats += 1
+            if not target_file.exists():
+                break
+            target_file = user_dir / f"submission_{counter}.json"
+            counter += 1
+        target_file.touch()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--legacy-files', type=int, default=2000,
+                        help="files resolved with the old probing loop (it is quadratic)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp, 'source')
+        body = json.dumps({'username': 'prolific', 'paper_title': 'Same name'})
+        for i in range(args.files):
+            directory = source / f"{i:06d}"
+            directory.mkdir(parents=True)
+            (directory / 'submission.json').write_text(body)
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            processed, errors = organize_files(str(source), str(Path(tmp, 'organized')))
+        elapsed = time.perf_counter() - start
+        print(f"organize_files: {processed} files, {errors} errors in {elapsed:.2f}s "
+              f"({processed / elapsed:.0f} files/s)")
+
+        legacy_dir = Path(tmp, 'legacy')
+        legacy_dir.mkdir()
+        start = time.perf_counter()
+        stats = legacy_probe(legacy_dir, args.legacy_files)
+        elapsed = time.perf_counter() - start
+        print(f"legacy probing: {args.legacy_files} names, {stats} stat calls in {elapsed:.2f}s "
+              f"(~{stats * (args.files / args.legacy_files) ** 2:.0f} stats at {args.files} files)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Throughput of organize_files for a large merge at different --jobs settings.
+
+Usage: python benchmarks/bench_organize_parallel.py [--files 100000] [--jobs 1 2 4 8]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from organize_by_username import organize_files
+from synthetic import write_corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=100000)
+    parser.add_argument('--yaml-ratio', type=float, default=0.2)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pristine = Path(tmp, 'pristine')
+        write_corpus(str(pristine), args.files, yaml_ratio=args.yaml_ratio)
+
+        for jobs in sorted(set(args.jobs)):
+            source, target = Path(tmp, 'source'), Path(tmp, 'organized')
+            shutil.copytree(pristine, source)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                processed, errors = organize_files(str(source), str(target), jobs=jobs)
+            elapsed = time.perf_counter() - start
+            print(f"--jobs {jobs:<3} {processed} files, {errors} errors in {elapsed:7.2f}s "
+                  f"({processed / elapsed:8.0f} files/s)")
+            shutil.rmtree(source)
+            shutil.rmtree(target)
+
+
+if __name__ == "__main__":
+    main()
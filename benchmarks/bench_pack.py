@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Compare the packed corpus with the loose-file layout.
+
+Times a full scan (every submission parsed), lookups of all of one user's
+submissions, and lookups by DOI. Loose-file lookups list the user directory
+or go through the identifier index and then load the files.
+
+Usage: python benchmarks/bench_pack.py [--files 10000] [--users 100] [--lookups 1000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from corpus_pack import CorpusPacker, PackedCorpus
+from identifier_index import IdentifierIndex, normalize_identifier
+from organize_by_username import iter_organized_files, load_data_file
+from synthetic import write_organized_corpus
+
+
+def _timed(label: str, function, count: int = 1):
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    per = f" ({elapsed / count * 1e6:9.1f} µs each)" if count > 1 else ""
+    print(f"{label:<32} {elapsed:8.3f}s{per}")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=10000)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--lookups', type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp, 'organized')
+        pack_dir = os.path.join(tmp, 'packed')
+        paths = write_organized_corpus(str(root), args.files, users=args.users)
+
+        with CorpusPacker(pack_dir) as packer:
+            _timed("pack", lambda: packer.pack(str(root)))
+        packed_bytes = sum(p.stat().st_size for p in Path(pack_dir).iterdir())
+        loose_bytes = sum(p.stat().st_size for p in paths)
+        print(f"size: loose {loose_bytes / 1e6:.1f} MB in {len(paths)} files, "
+              f"packed {packed_bytes / 1e6:.1f} MB in {len(os.listdir(pack_dir))} files")
+
+        index = IdentifierIndex(os.path.join(tmp, 'identifier_index'), str(root))
+        index.rebuild(iter_organized_files(root), load_data_file)
+
+        rng = random.Random(0)
+        users = [f"user_{rng.randrange(args.users)}" for _ in range(args.lookups)]
+        sample = [load_data_file(str(rng.choice(paths))) for _ in range(args.lookups)]
+        dois = [data['identifier'] for data in sample]
+
+        print("\nfull scan")
+        _timed("  loose", lambda: [load_data_file(str(p)) for p in iter_organized_files(root)])
+        with PackedCorpus(pack_dir) as corpus:
+            _timed("  packed", lambda: list(corpus.scan()))
+
+        print("\nlookup by user")
+        _timed("  loose", lambda: [[load_data_file(str(p)) for p in sorted((root / user).iterdir())]
+                                   for user in users], len(users))
+        with PackedCorpus(pack_dir) as corpus:
+            _timed("  packed", lambda: [corpus.by_user(user) for user in users], len(users))
+
+        print("\nlookup by DOI")
+        _timed("  loose (identifier index)",
+               lambda: [[load_data_file(str(root / p)) for p in index.lookup(normalize_identifier(doi))]
+                        for doi in dois], len(dois))
+        with PackedCorpus(pack_dir) as corpus:
+            _timed("  packed", lambda: [corpus.by_identifier(doi) for doi in dois], len(dois))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Compare the single-parse validate-and-organize pipeline with validating and organizing separately.
+
+The separate run is ``validate_paths`` followed by ``organize_files``, so
+every file is read and parsed twice; the pipeline is
+``organize_files(validate=True)`` (``process_submissions.py``), which
+validates the object it parsed for organizing. Each run gets a freshly
+written synthetic corpus because organizing moves the files.
+
+Usage: python benchmarks/bench_pipeline.py [--files 2000] [--yaml-ratio 0.2] [--jobs 1]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from organize_by_username import organize_files
+from synthetic import write_corpus
+from validate_submission import validate_paths
+
+
+def separate(source: str, target: str, jobs: int):
+    paths = sorted(entry.path for entry in os.scandir(source))
+    results = validate_paths(paths, jobs=jobs)
+    assert all(valid for _, valid, _, _ in results)
+    return organize_files(source, target, jobs=jobs)
+
+
+def pipeline(source: str, target: str, jobs: int):
+    return organize_files(source, target, jobs=jobs, validate=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=2000)
+    parser.add_argument('--yaml-ratio', type=float, default=0.2)
+    parser.add_argument('--jobs', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{args.files} submissions ({args.yaml_ratio:.0%} YAML), --jobs {args.jobs}")
+    times = {}
+    for label, run in (('separate', separate), ('pipeline', pipeline)):
+        best = float('inf')
+        for _ in range(args.repeat):
+            with tempfile.TemporaryDirectory() as tmp:
+                source, target = os.path.join(tmp, 'submissions'), os.path.join(tmp, 'organized')
+                write_corpus(source, args.files, yaml_ratio=args.yaml_ratio)
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    processed, errors = run(source, target, args.jobs)
+                best = min(best, time.perf_counter() - start)
+                assert (processed, errors) == (args.files, 0)
+        times[label] = best
+        print(f"  {label:<10} {best:8.3f}s {args.files / best:10.0f} files/s")
+    print(f"  speedup    {times['separate'] / times['pipeline']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
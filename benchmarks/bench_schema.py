@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of per-submission rule evaluation for large claim lists.
+
+Usage: python benchmarks/bench_schema.py [--claims 10 100 1000 10000] [--steps 4]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from synthetic import make_submission
+from validate_submission import SubmissionValidator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--claims', type=int, nargs='+', default=[10, 100, 1000, 10000])
+    parser.add_argument('--steps', type=int, default=4)
+    args = parser.parse_args()
+
+    validator = SubmissionValidator()
+    for claims in args.claims:
+        data = make_submission(random.Random(0), 0, claims=claims, steps=args.steps)
+
+        def run():
+            validator.errors, validator.warnings = [], []
+            validator._validate_data_structure(data)
+
+        number = max(1, 20000 // claims)
+        best = min(timeit.repeat(run, number=number, repeat=5)) / number
+        print(f"{claims:>6} claims x {args.steps} steps: {best * 1e6:10.1f} µs/submission "
+              f"({best * 1e9 / claims:7.0f} ns/claim)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Latency and throughput of the validation service against one CLI run per request.
+
+Starts scripts/validation_server.py in its own process, then times
+sequential requests over one keep-alive connection (latency percentiles),
+concurrent clients (throughput) and one batched request, next to spawning
+validate_submission.py once per submission.
+
+Usage: python benchmarks/bench_service.py [--requests 2000] [--clients 8] [--cli-runs 20]
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from synthetic import make_submission
+
+SCRIPTS = Path(__file__).resolve().parent.parent / 'scripts'
+
+
+def _row(label: str, latency: str, rate: str):
+    print(f"{label:<22} {latency:<48} {rate:>20}")
+
+
+def _percentiles(latencies):
+    latencies = sorted(latencies)
+    pick = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000
+    return f"p50 {pick(0.5):7.2f} ms  p95 {pick(0.95):7.2f} ms  mean {statistics.mean(latencies) * 1000:7.2f} ms"
+
+
+def time_cli(bodies, runs: int):
+    latencies = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, body in enumerate(bodies[:runs]):
+            path = os.path.join(tmp, f"submission_{i}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(body)
+            start = time.perf_counter()
+            subprocess.run([sys.executable, str(SCRIPTS / 'validate_submission.py'), path],
+                           stdout=subprocess.DEVNULL)
+            latencies.append(time.perf_counter() - start)
+    _row("CLI per request", _percentiles(latencies), f"{len(latencies) / sum(latencies):.0f} req/s")
+
+
+def _post(connection: http.client.HTTPConnection, path: str, body: str) -> dict:
+    connection.request('POST', path, body=body.encode('utf-8'), headers={'Content-Type': 'application/json'})
+    response = connection.getresponse()
+    return json.loads(response.read())
+
+
+def time_service(port: int, bodies, clients: int):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    latencies = []
+    for body in bodies:
+        start = time.perf_counter()
+        _post(connection, '/validate', body)
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+    _row("service, sequential", _percentiles(latencies), f"{len(latencies) / sum(latencies):.0f} req/s")
+
+    def client(share):
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        for body in share:
+            _post(connection, '/validate', body)
+        connection.close()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(client, [bodies[i::clients] for i in range(clients)]))
+    elapsed = time.perf_counter() - start
+    _row(f"service, {clients} clients", '', f"{len(bodies) / elapsed:.0f} req/s")
+
+    batch = '[' + ','.join(bodies[:100]) + ']'
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    start = time.perf_counter()
+    results = _post(connection, '/validate', batch)['results']
+    elapsed = time.perf_counter() - start
+    connection.close()
+    _row(f"service, batch of {len(results)}", f"{elapsed * 1000:.2f} ms",
+         f"{len(results) / elapsed:.0f} submissions/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--cli-runs', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    bodies = [json.dumps(make_submission(rng, i)) for i in range(args.requests)]
+
+    server = subprocess.Popen([sys.executable, str(SCRIPTS / 'validation_server.py'), '--port', '0'],
+                              stdout=subprocess.PIPE, text=True)
+    try:
+        banner = server.stdout.readline()
+        port = int(banner.split('http://', 1)[1].split('/', 1)[0].rsplit(':', 1)[1])
+        time_cli(bodies, args.cli_runs)
+        time_service(port, bodies, args.clients)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Time static site index builds and measure what the docs site downloads.
+
+A synthetic organized corpus is indexed from scratch, rebuilt unchanged and
+rebuilt after rewriting a share of its files and adding as many new ones.
+Sizes show the fixed initial download (the manifest and the newest listing
+page) against the whole corpus as one JSON file.
+
+Usage: python benchmarks/bench_site_index.py [--files 20000] [--users 500] [--changed 0.01]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from site_index import SiteIndex
+from synthetic import make_submission, write_organized_corpus
+
+
+def timed(function):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = function()
+    return result, time.perf_counter() - start
+
+
+def sizes(directory):
+    return [path.stat().st_size for path in sorted(Path(directory).glob('*.json.gz'))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=20000)
+    parser.add_argument('--users', type=int, default=500)
+    parser.add_argument('--changed', type=float, default=0.01,
+                        help="share of files rewritten (and of new files added) before a rebuild")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = os.path.join(tmp, 'organized'), os.path.join(tmp, 'corpus')
+        paths = write_organized_corpus(root, args.files, users=args.users)
+        corpus_bytes = sum(len(json.dumps(json.loads(path.read_text()))) for path in paths)
+        print(f"{args.files} files, {args.users} users")
+
+        counts, elapsed = timed(lambda: SiteIndex(out).build(root))
+        print(f"  full build        {elapsed:8.3f}s  {counts}")
+        counts, elapsed = timed(lambda: SiteIndex(out).build(root))
+        print(f"  unchanged rebuild {elapsed:8.3f}s  {counts}")
+
+        rng = random.Random(1)
+        changed = int(args.files * args.changed)
+        for path in rng.sample(paths, changed):
+            path.write_text(json.dumps(make_submission(rng, 0, username=path.parent.name, claims=5)))
+        for number in range(changed):
+            path = Path(root, 'newcomer', f'new_{number}.json')
+            path.parent.mkdir(exist_ok=True)
+            path.write_text(json.dumps(make_submission(rng, number, username='newcomer', claims=5)))
+        counts, elapsed = timed(lambda: SiteIndex(out).build(root))
+        print(f"  {f'{args.changed:.0%} changed+new':<17} {elapsed:8.3f}s  {counts}")
+
+        pages, shards = sizes(os.path.join(out, 'pages')), sizes(os.path.join(out, 'index'))
+        manifest = os.path.getsize(os.path.join(out, 'manifest.json'))
+        print(f"  corpus as JSON    {corpus_bytes / 1e6:8.2f} MB")
+        print(f"  initial download  {(manifest + pages[-1]) / 1e3:8.1f} kB (manifest + newest page)")
+        print(f"  listing pages     {len(pages):8d}  avg {sum(pages) / len(pages) / 1e3:.1f} kB gzip")
+        print(f"  index shards      {len(shards):8d}  avg {sum(shards) / len(shards) / 1e3:.1f} kB gzip")
+
+
+if __name__ == "__main__":
+    main()
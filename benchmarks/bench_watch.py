@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Compare watch-mode updates with re-running validation over the whole tree.
+
+After a synthetic submissions tree has been validated once, a few files are
+rewritten. The watch session re-validates only those, while a fresh run
+validates every file again. The time from a write to its notification is
+measured for the inotify and polling watchers as well.
+
+Usage: python benchmarks/bench_watch.py [--files 5000] [--changed 3] [--jobs N]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from file_watcher import InotifyWatcher, PollingWatcher
+from synthetic import write_corpus
+from validate_submission import WatchSession, validate_paths
+
+
+def _notify_latency(watcher, path: str, repeat: int) -> float:
+    best = float('inf')
+    for i in range(repeat):
+        start = time.perf_counter()
+        with open(path, 'a') as f:
+            f.write(' ' * (i + 1))
+        while path not in watcher.read(1.0):
+            pass
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--files', type=int, default=5000)
+    parser.add_argument('--changed', type=int, default=3, help="files rewritten per update")
+    parser.add_argument('--jobs', type=int, default=None)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'submissions')
+        paths = [str(p) for p in write_corpus(root, args.files)]
+        print(f"{args.files} submissions, {args.changed} changed per update")
+
+        start = time.perf_counter()
+        validate_paths(paths, jobs=args.jobs)
+        full = time.perf_counter() - start
+        print(f"  full run      {full * 1000:10.1f} ms")
+
+        session = WatchSession([root], jobs=args.jobs)
+        session.start()
+        best = float('inf')
+        for i in range(args.repeat):
+            changed = paths[i * args.changed:(i + 1) * args.changed]
+            for path in changed:
+                with open(path, 'a') as f:
+                    f.write('\n')
+            start = time.perf_counter()
+            session.update(changed)
+            best = min(best, time.perf_counter() - start)
+        print(f"  watch update  {best * 1000:10.3f} ms  ({full / best:.0f}x faster)")
+
+        print("\nwrite-to-notification latency")
+        watchers = [('inotify', lambda: InotifyWatcher([root])),
+                    ('polling 0.1s', lambda: PollingWatcher([root], interval=0.1))]
+        for label, make_watcher in watchers:
+            try:
+                watcher = make_watcher()
+            except OSError as e:
+                print(f"  {label:<13} unavailable ({e})")
+                continue
+            try:
+                latency = _notify_latency(watcher, paths[0], args.repeat)
+            finally:
+                watcher.close()
+            print(f"  {label:<13} {latency * 1000:10.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the validator and organizer on synthetic corpora.
+
+Times SubmissionValidator.validate_file, organize_files and the parse phase of
+each at several corpus sizes and saves the results as JSON, so runs from
+different commits can be compared.
+
+Usage:
+    python benchmarks/run_suite.py [--sizes 1000 10000 100000] [--output results.json]
+    python benchmarks/run_suite.py --compare old.json new.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from data_loader import loads
+from organize_by_username import organize_files, resolve_username
+from synthetic import write_corpus
+from validate_submission import SubmissionValidator
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=Path(__file__).resolve().parent, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def _timed(function: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        function()
+    return time.perf_counter() - start
+
+
+def _parse_all(paths: List[Path]):
+    """Read and parse every file exactly as SubmissionValidator does."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            loads(f.read().decode('utf-8'), path.suffix.lower())
+
+
+def run_size(size: int, config: Dict[str, Any], workdir: Path) -> List[Dict[str, Any]]:
+    corpus = workdir / 'corpus'
+    paths = write_corpus(str(corpus), size, seed=config['seed'], yaml_ratio=config['yaml_ratio'],
+                         users=config['users'], skew=config['skew'],
+                         claims=config['claims'], steps=config['steps'])
+
+    def validate_all():
+        validator = SubmissionValidator()
+        for path in paths:
+            validator.validate_file(str(path))
+
+    def organize():
+        organize_files(str(source), str(workdir / 'organized'))
+
+    timings = {
+        'validator.parse': _timed(lambda: _parse_all(paths)),
+        'validator.validate_file': _timed(validate_all),
+        'organizer.parse': _timed(lambda: list(map(resolve_username, paths))),
+    }
+    source = workdir / 'source'
+    shutil.copytree(corpus, source)
+    timings['organizer.organize_files'] = _timed(organize)
+    shutil.rmtree(workdir / 'organized')
+    shutil.rmtree(corpus)
+
+    return [
+        {'benchmark': name, 'files': size, 'seconds': round(seconds, 6),
+         'files_per_second': round(size / seconds, 1) if seconds else None}
+        for name, seconds in timings.items()
+    ]
+
+
+def compare(old_path: str, new_path: str) -> int:
+    with open(old_path) as f:
+        old = {(r['benchmark'], r['files']): r for r in json.load(f)['results']}
+    with open(new_path) as f:
+        new = json.load(f)['results']
+    print(f"{'benchmark':<28} {'files':>8} {'old s':>10} {'new s':>10} {'change':>8}")
+    for result in new:
+        before = old.get((result['benchmark'], result['files']))
+        if before is None:
+            continue
+        change = (result['seconds'] - before['seconds']) / before['seconds'] * 100
+        print(f"{result['benchmark']:<28} {result['files']:>8} {before['seconds']:>10.3f} "
+              f"{result['seconds']:>10.3f} {change:>+7.1f}%")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the validator and organizer.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--claims', type=int, default=3)
+    parser.add_argument('--steps', type=int, default=4)
+    parser.add_argument('--yaml-ratio', type=float, default=0.2)
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--skew', type=float, default=1.1, help="Zipf exponent for usernames (0 = uniform)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two results files")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+
+    config = {name: getattr(args, name) for name in ('claims', 'steps', 'yaml_ratio', 'users', 'skew', 'seed')}
+    commit = _git_commit()
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            for result in run_size(size, config, Path(tmp)):
+                print(f"{result['benchmark']:<28} {size:>8} files {result['seconds']:>9.3f}s "
+                      f"{result['files_per_second']:>10} files/s")
+                results.append(result)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'config': config,
+            'results': results,
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic submissions shaped like submissions/example_submission_in.json.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+
+def make_submission(rng: random.Random, index: int, username: str = None,
+                    claims: int = 3, steps: int = 4) -> Dict[str, Any]:
+    """Build one valid submission with the given number of claims and steps."""
+    return {
+        'username': username or f"user_{index % 100}",
+        'paper_title': f"Synthetic study {index} of hybrid framework adsorption",
+        'paper_pdf': f"https://arxiv.org/pdf/2301.{index:05d}.pdf",
+        'identifier': f"10.1038/s41563-023-{index:05d}-{rng.randint(0, 9)}",
+        'claim_type': 'custom_code',
+        'code_url': f"https://github.com/materials-discovery/repo-{index % 500}",
+        'data_url': f"https://materialsproject.org/materials/mp-{index}",
+        'claims': [
+            {
+                'claim': f"Claim {c} of submission {index}: bandgap is {rng.uniform(0.5, 5):.2f} eV.",
+                'context': "Computed with DFT using the PBE functional",
+                'instruction': [f"python step_{s}.py --claim {c}" for s in range(steps)],
+            }
+            for c in range(claims)
+        ],
+        'non_reproducible_claims': [
+            {
+                'claim': "XRD patterns confirm single-phase formation.",
+                'reason': "Requires physical X-ray diffraction measurements",
+            }
+        ],
+    }
+
+
+def username_picker(rng: random.Random, users: int = 100, skew: float = 0.0):
+    """Return a function drawing usernames from ``users`` accounts.
+
+    ``skew=0`` spreads submissions evenly; larger values follow a Zipf-like
+    distribution where a few prolific users own most of the corpus.
+    """
+    names = [f"user_{u}" for u in range(users)]
+    if skew <= 0:
+        return lambda index: names[index % users]
+    weights = [1 / (rank ** skew) for rank in range(1, users + 1)]
+    return lambda index: rng.choices(names, weights)[0]
+
+
+def write_corpus(directory: str, count: int, seed: int = 0, yaml_ratio: float = 0.0,
+                 users: int = 100, skew: float = 0.0, **kwargs) -> List[Path]:
+    """Write ``count`` submissions into ``directory`` and return their paths.
+
+    ``yaml_ratio`` is the share written as YAML; ``users``/``skew`` control the
+    username distribution (see ``username_picker``); remaining keyword
+    arguments (``claims``, ``steps``) go to ``make_submission``.
+    """
+    rng = random.Random(seed)
+    pick_username = username_picker(rng, users, skew)
+    target = Path(directory)
+    target.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        data = make_submission(rng, i, username=pick_username(i), **kwargs)
+        if rng.random() < yaml_ratio:
+            path = target / f"submission_{i:06d}.yaml"
+            path.write_text(yaml.safe_dump(data, sort_keys=False), encoding='utf-8')
+        else:
+            path = target / f"submission_{i:06d}.json"
+            path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+        paths.append(path)
+    return paths
+
+
+def write_organized_corpus(directory: str, count: int, users: int = 100, seed: int = 0,
+                           **kwargs) -> List[Path]:
+    """Write ``count`` submissions laid out like data/organized/<username>/."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        username = f"user_{i % users}"
+        path = Path(directory, username, f"submission_{i:06d}.json")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(make_submission(rng, i, username=username, **kwargs)), encoding='utf-8')
+        paths.append(path)
+    return paths
@@ -452,6 +452,216 @@ function downloadFile() {
     window.URL.revokeObjectURL(url);
 }
 
+// Optional local validation service: python scripts/validation_server.py
+const LOCAL_VALIDATOR_URL = 'http://127.0.0.1:8765/validate';
+
+function checkWithLocalValidator() {
+    const panel = document.getElementById('localValidation');
+    panel.style.display = 'block';
+    panel.textContent = 'Checking with the local validator...';
+    
+    fetch(LOCAL_VALIDATOR_URL, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(collectFormData())
+    })
+        .then(response => response.json())
+        .then(result => renderLocalValidation(panel, result))
+        .catch(() => {
+            panel.textContent = 'The local validator is not running. Start it with: ' +
+                'python scripts/validation_server.py';
+        });
+}
+
+function renderLocalValidation(panel, result) {
+    panel.textContent = '';
+    const summary = document.createElement('strong');
+    if (result.error) {
+        summary.textContent = '❌ ' + result.error;
+        panel.appendChild(summary);
+        return;
+    }
+    summary.textContent = result.valid ? '✅ Passes the repository validation rules' : '❌ Validation failed';
+    panel.appendChild(summary);
+    
+    const issues = result.errors.concat(result.warnings);
+    if (issues.length > 0) {
+        const list = document.createElement('ul');
+        issues.forEach(issue => {
+            const item = document.createElement('li');
+            item.className = 'issue-' + issue.severity;
+            item.textContent = (issue.severity === 'warning' ? '⚠️ ' : '') + issue.message;
+            list.appendChild(item);
+        });
+        panel.appendChild(list);
+    }
+}
+
+// Corpus summary written by scripts/corpus_stats.py after each merge
+function loadCorpusStats() {
+    fetch('corpus_stats.json')
+        .then(response => response.ok ? response.json() : Promise.reject())
+        .then(summary => {
+            const totals = summary.totals;
+            document.getElementById('corpusTotals').textContent =
+                `${totals.submissions} submissions from ${totals.users} contributors, with ` +
+                `${totals.claims} reproducible and ${totals.non_reproducible_claims} non-reproducible claims.`;
+            const claimTypes = Object.entries(summary.claim_types)
+                .map(([claimType, count]) => `${claimType} (${count})`);
+            document.getElementById('corpusClaimTypes').textContent =
+                claimTypes.length > 0 ? 'Claim types: ' + claimTypes.join(', ') : '';
+            document.getElementById('corpusStats').style.display = 'block';
+        })
+        .catch(() => {});
+}
+
+// Corpus browser over the static shards in corpus/ (built by scripts/site_index.py).
+// Only the manifest is loaded up front; listing pages and index shards are
+// fetched, gunzipped and cached when a page or query needs them.
+const CORPUS_URL = 'corpus/';
+const CORPUS_RESULTS_PER_PAGE = 20;
+const corpusShards = {};
+let corpusManifest = null;
+// page counts from the newest listing page (0) or through the current search results
+const corpusView = { page: 0, pages: 0, matches: null };
+
+function fetchCorpusShard(path) {
+    if (!corpusShards[path]) {
+        corpusShards[path] = fetch(CORPUS_URL + path).then(response => {
+            if (!response.ok) {
+                return null;
+            }
+            const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+            return new Response(stream).json();
+        });
+    }
+    return corpusShards[path];
+}
+
+function corpusTermHash(term) {
+    // 32-bit FNV-1a over UTF-8 bytes, as in site_index.term_hash
+    let hash = 0x811c9dc5;
+    for (const byte of new TextEncoder().encode(term)) {
+        hash = Math.imul(hash ^ byte, 0x01000193) >>> 0;
+    }
+    return hash.toString(16).padStart(8, '0');
+}
+
+function corpusTerms(query) {
+    const terms = query.toLowerCase().match(/[\p{L}\p{N}]+/gu) || [];
+    return [...new Set(terms)].filter(term =>
+        term.length >= corpusManifest.min_term_length && !corpusManifest.stopwords.includes(term));
+}
+
+function corpusEntries(ids) {
+    const pageSize = corpusManifest.page_size;
+    const pages = [...new Set(ids.map(id => Math.floor(id / pageSize)))];
+    return Promise.all(pages.map(page => fetchCorpusShard(`pages/${String(page).padStart(5, '0')}.json.gz`)))
+        .then(loaded => {
+            const byPage = {};
+            pages.forEach((page, i) => { byPage[page] = loaded[i] || []; });
+            return ids.map(id => byPage[Math.floor(id / pageSize)][id % pageSize]).filter(entry => entry);
+        });
+}
+
+function showCorpusPage(page) {
+    if (page < 0 || page >= corpusView.pages) {
+        return;
+    }
+    corpusView.page = page;
+    let ids;
+    if (corpusView.matches) {
+        ids = corpusView.matches.slice(page * CORPUS_RESULTS_PER_PAGE, (page + 1) * CORPUS_RESULTS_PER_PAGE);
+    } else {
+        // Newest documents have the highest ids
+        const last = corpusManifest.ids - 1 - page * corpusManifest.page_size;
+        ids = [];
+        for (let id = last; id > last - corpusManifest.page_size && id >= 0; id--) {
+            ids.push(id);
+        }
+    }
+    corpusEntries(ids).then(entries => renderCorpusEntries(entries));
+}
+
+function searchCorpus(query) {
+    const terms = corpusTerms(query);
+    if (terms.length === 0) {
+        corpusView.matches = null;
+        corpusView.pages = corpusManifest.pages;
+        document.getElementById('corpusStatus').textContent = `${corpusManifest.documents} submissions`;
+        showCorpusPage(0);
+        return;
+    }
+    const prefix = corpusManifest.prefix_length;
+    Promise.all(terms.map(term => {
+        const hash = corpusTermHash(term);
+        return fetchCorpusShard(`index/${hash.slice(0, prefix)}.json.gz`)
+            .then(shard => (shard && shard[term]) || []);
+    })).then(postings => {
+        // Intersect, starting from the rarest term
+        postings.sort((a, b) => a.length - b.length);
+        let matches = postings[0];
+        postings.slice(1).forEach(ids => {
+            const set = new Set(ids);
+            matches = matches.filter(id => set.has(id));
+        });
+        corpusView.matches = matches.slice().reverse();
+        corpusView.pages = Math.max(1, Math.ceil(matches.length / CORPUS_RESULTS_PER_PAGE));
+        document.getElementById('corpusStatus').textContent =
+            `${matches.length} submission${matches.length === 1 ? '' : 's'} match "${terms.join(' ')}"`;
+        showCorpusPage(0);
+    });
+}
+
+function renderCorpusEntries(entries) {
+    const list = document.getElementById('corpusResults');
+    list.textContent = '';
+    entries.forEach(entry => {
+        const item = document.createElement('li');
+        // Corpus data is contributor input: only link http(s) URLs, never javascript: and the like
+        const link = typeof entry.paper_pdf === 'string' && /^https?:\/\//i.test(entry.paper_pdf);
+        const title = document.createElement(link ? 'a' : 'strong');
+        title.textContent = entry.title || entry.path;
+        if (link) {
+            title.href = entry.paper_pdf;
+            title.target = '_blank';
+            title.rel = 'noopener';
+        }
+        item.appendChild(title);
+        const details = document.createElement('div');
+        details.className = 'corpus-details';
+        details.textContent = [
+            entry.user,
+            entry.identifier,
+            entry.claim_type,
+            `${entry.claims} reproducible / ${entry.non_reproducible} non-reproducible claims`
+        ].filter(part => part).join(' · ');
+        item.appendChild(details);
+        list.appendChild(item);
+    });
+    document.getElementById('corpusNewer').disabled = corpusView.page === 0;
+    document.getElementById('corpusOlder').disabled = corpusView.page >= corpusView.pages - 1;
+}
+
+function loadCorpusBrowser() {
+    if (typeof DecompressionStream === 'undefined') {
+        return;
+    }
+    fetch(CORPUS_URL + 'manifest.json')
+        .then(response => response.ok ? response.json() : Promise.reject())
+        .then(manifest => {
+            corpusManifest = manifest;
+            document.getElementById('corpusBrowser').style.display = 'block';
+            searchCorpus('');
+        })
+        .catch(() => {});
+}
+
+document.getElementById('corpusSearchForm').addEventListener('submit', function(e) {
+    e.preventDefault();
+    searchCorpus(document.getElementById('corpusQuery').value);
+});
+
 // Form submission handler
 document.getElementById('submissionForm').addEventListener('submit', function(e) {
     e.preventDefault();
@@ -461,6 +671,7 @@ document.getElementById('submissionForm').addEventListener('submit', function(e)
     
     document.getElementById('outputContent').textContent = output;
     document.getElementById('output').style.display = 'block';
+    document.getElementById('localValidation').style.display = 'none';
     
     // Scroll to output
     document.getElementById('output').scrollIntoView({ behavior: 'smooth' });
@@ -472,4 +683,6 @@ document.addEventListener('DOMContentLoaded', function() {
     if (nonReproducibleContainer && nonReproducibleContainer.children.length === 0) {
         addNonReproducibleClaim();
     }
+    loadCorpusStats();
+    loadCorpusBrowser();
 });
\ No newline at end of file
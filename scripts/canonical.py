@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Canonical JSON form of a submission.
+
+Organizing with ``--canonical`` stores every accepted submission as
+key-sorted, compact UTF-8 JSON, with surrounding whitespace stripped from
+strings and DOI/arXiv identifiers spelled one way. Equal content then has
+equal bytes, and so equal content hashes, whatever format it was sent in,
+and downstream readers only ever parse JSON.
+
+The stored form keeps the arXiv version (``arXiv:2301.12345v2``), as it
+records what was reproduced. Only the deduplication hash from ``encode``
+leaves it out, so the same submission citing another version of the paper
+is still recognized.
+"""
+
+import datetime
+import hashlib
+import json
+from typing import Any, Dict, Tuple
+
+from identifier_index import arxiv_version, normalize_identifier
+
+# Fields holding a paper identifier that is rewritten to its canonical spelling
+IDENTIFIER_FIELDS = ('identifier',)
+
+
+def canonical_identifier(value: str, version: bool = True) -> str:
+    """Return the canonical spelling of a DOI or arXiv ID; anything else is kept.
+
+    The arXiv version is kept unless ``version`` is false.
+
+    >>> canonical_identifier('https://doi.org/10.1038/S41563-023-01234-5')
+    '10.1038/s41563-023-01234-5'
+    >>> canonical_identifier('https://arxiv.org/abs/2301.12345v2')
+    'arXiv:2301.12345v2'
+    >>> canonical_identifier('https://arxiv.org/abs/2301.12345v2', version=False)
+    'arXiv:2301.12345'
+    """
+    key = normalize_identifier(value)
+    if key and key.startswith('doi:'):
+        return key[len('doi:'):]
+    if key and key.startswith('arxiv:'):
+        suffix = (arxiv_version(value) or '') if version else ''
+        return f"arXiv:{key[len('arxiv:'):]}{suffix}"
+    return value
+
+
+def canonicalize(value: Any) -> Any:
+    """Strip strings and turn YAML-only types into their JSON equivalents.
+
+    Raises ``ValueError`` when two keys of a mapping differ only by
+    surrounding whitespace or type (``1`` and ``'1'``), instead of silently
+    keeping one of them.
+    """
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            name = str(key).strip()
+            if name in result:
+                raise ValueError(f"keys {name!r} collide once converted to stripped strings")
+            result[name] = canonicalize(item)
+        return result
+    if isinstance(value, (list, tuple)):
+        return [canonicalize(item) for item in value]
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def canonical_submission(data: Dict[str, Any], version: bool = True) -> Dict[str, Any]:
+    data = canonicalize(data)
+    for field in IDENTIFIER_FIELDS:
+        if isinstance(data.get(field), str) and data[field]:
+            data[field] = canonical_identifier(data[field], version)
+    return data
+
+
+def _serialize(data: Dict[str, Any]) -> bytes:
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'), allow_nan=False)
+    return text.encode('utf-8') + b'\n'
+
+
+def dumps(data: Dict[str, Any]) -> bytes:
+    """Serialize a submission in canonical form.
+
+    Raises ``TypeError`` or ``ValueError`` for content JSON cannot represent.
+    """
+    return _serialize(canonical_submission(data))
+
+
+def encode(data: Dict[str, Any]) -> Tuple[bytes, str]:
+    """Return the canonical form of a submission and its deduplication hash.
+
+    The hash is the SHA-256 of the canonical form with arXiv versions left
+    out, which is the hash of the stored bytes when there is no version.
+    Raises like ``dumps``.
+    """
+    data = canonical_submission(data)
+    payload = _serialize(data)
+    unversioned = dict(data)
+    for field in IDENTIFIER_FIELDS:
+        if isinstance(data.get(field), str) and data[field]:
+            unversioned[field] = canonical_identifier(data[field], version=False)
+    key_bytes = payload if unversioned == data else _serialize(unversioned)
+    return payload, hashlib.sha256(key_bytes).hexdigest()
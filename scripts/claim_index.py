@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+MinHash/LSH index of claim text for near-duplicate detection.
+
+The text of ``claims[].claim`` and ``non_reproducible_claims[].claim`` is
+normalized (case, punctuation, whitespace) and cut into overlapping 5-byte
+shingles. Each claim gets a 120-value MinHash signature, computed with one
+hash per shingle (one-permutation hashing with densification), split into
+24 bands of 5 values. Claims sharing a band bucket are candidates, and
+candidates are scored by the exact Jaccard similarity of their shingle sets.
+A query therefore reads 24 index entries, however many claims are stored.
+
+The index is a SQLite database with one row per claim and one per (bucket,
+claim), so the organizer can add and remove files incrementally.
+"""
+
+import argparse
+import os
+import re
+import sqlite3
+import struct
+import sys
+import zlib
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    field TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS claims_path ON claims(path);
+CREATE TABLE IF NOT EXISTS buckets (
+    key INTEGER NOT NULL,
+    claim_id INTEGER NOT NULL,
+    PRIMARY KEY (key, claim_id)
+) WITHOUT ROWID;
+"""
+
+CLAIM_FIELDS = ('claims', 'non_reproducible_claims')
+
+SHINGLE_SIZE = 5
+NUM_PERM = 120
+BANDS = 24
+DEFAULT_THRESHOLD = 0.6
+
+# Bucket rows buffered before a sorted bulk insert
+PENDING_ROWS = 1 << 20
+
+_NON_WORD = re.compile(r'[\W_]+')
+_HASH_RANGE = 1 << 32
+# Distance offsets for borrowed bins, largest first
+_OFFSETS = [distance << 32 for distance in range(1023, -1, -1)]
+
+
+class ClaimMatch(NamedTuple):
+    """A stored claim similar to a queried one."""
+    path: str
+    field: str
+    position: int
+    text: str
+    similarity: float
+
+
+def normalize_claim(text: str) -> str:
+    """Lowercase ``text`` and reduce punctuation and whitespace runs to one space.
+
+    >>> normalize_claim('  The band-gap is 1.2 eV!  ')
+    'the band gap is 1 2 ev'
+    """
+    return _NON_WORD.sub(' ', text.lower()).strip()
+
+
+def shingles(text: str) -> FrozenSet[int]:
+    """Return the hashes of the overlapping byte shingles of normalized ``text``."""
+    data = normalize_claim(text).encode('utf-8')
+    if len(data) <= SHINGLE_SIZE:
+        return frozenset([zlib.crc32(data)]) if data else frozenset()
+    crc32 = zlib.crc32
+    return frozenset([crc32(data[i:i + SHINGLE_SIZE]) for i in range(len(data) - SHINGLE_SIZE + 1)])
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def signature(shingle_set: FrozenSet[int], num_perm: int = NUM_PERM) -> Optional[List[int]]:
+    """Return the MinHash signature of a set of shingle hashes, or None for an empty set.
+
+    Each hash falls into one of ``num_perm`` equal ranges (bins) and each bin
+    keeps its minimum. Empty bins borrow the value of the next filled bin,
+    offset by the distance, so short texts still get a full signature whose
+    bins agree exactly when the borrowed bins agree.
+    """
+    if not shingle_set:
+        return None
+    width = -(-_HASH_RANGE // num_perm)
+    # Later (smaller) hashes overwrite larger ones, leaving each bin's minimum
+    minima = {h // width: h for h in sorted(shingle_set, reverse=True)}
+    if len(minima) == num_perm:
+        return [minima[index] for index in range(num_perm)]
+    # Build the ring starting after the last filled bin: each filled bin
+    # covers itself and the empty bins before it, then rotate into place
+    offsets = _OFFSETS[-num_perm:]
+    ring = []
+    previous = max(minima) - num_perm
+    for index in sorted(minima):
+        ring.extend(map(minima[index].__add__, offsets[previous - index:]))
+        previous = index
+    start = num_perm - 1 - previous
+    return ring[start:] + ring[:start]
+
+
+def band_keys(sig: List[int], bands: int = BANDS) -> List[int]:
+    """Hash each band of a signature to a 32-bit bucket key.
+
+    A rare key collision only adds a candidate, which scoring discards.
+    """
+    size = len(sig) // bands * 8
+    data = struct.pack(f'>{len(sig)}Q', *sig)
+    crc32 = zlib.crc32
+    # Seeding with the band number keeps equal values in different bands apart
+    return [crc32(data[i:i + size], band) for band, i in enumerate(range(0, len(data), size))]
+
+
+def submission_claims(data: Dict[str, Any]) -> List[Tuple[str, int, str]]:
+    """Return ``(field, position, text)`` for every non-empty claim text (positions from 1)."""
+    claims = []
+    for field in CLAIM_FIELDS:
+        items = data.get(field)
+        for position, item in enumerate(items if isinstance(items, list) else [], 1):
+            text = item.get('claim') if isinstance(item, dict) else None
+            if isinstance(text, str) and text.strip():
+                claims.append((field, position, text.strip()))
+    return claims
+
+
+def describe_match(match: ClaimMatch) -> str:
+    return f"{match.path} {match.field}[{match.position - 1}] ({match.similarity:.2f})"
+
+
+class ClaimIndex:
+    """On-disk MinHash/LSH index from claim text to organized submission paths.
+
+    Paths are stored relative to ``root`` (by default the directory holding
+    the database). Changes are committed in one transaction by ``flush``.
+    Bucket rows are buffered and inserted in key order, so a large build
+    appends to the bucket B-tree instead of touching random pages. With
+    ``readonly``, a missing database is an empty index and nothing is
+    written.
+    """
+
+    def __init__(self, db_path: str, root: str = None, readonly: bool = False,
+                 num_perm: int = NUM_PERM, bands: int = BANDS):
+        self.db_path = Path(db_path)
+        self.root = Path(root) if root else self.db_path.parent
+        if readonly and not self.db_path.exists():
+            self.conn = sqlite3.connect(':memory:')
+        elif readonly:
+            self.conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self.conn = sqlite3.connect(str(self.db_path))
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.execute("PRAGMA synchronous = NORMAL")
+            self.conn.execute("PRAGMA cache_size = -65536")
+        if not readonly or not self.db_path.exists():
+            self.conn.executescript(SCHEMA)
+        meta = dict(self.conn.execute("SELECT key, value FROM meta"))
+        if meta:
+            num_perm, bands = int(meta['num_perm']), int(meta['bands'])
+        if num_perm % bands:
+            raise ValueError(f"{num_perm} signature values do not split into {bands} bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self._built = bool(meta)
+        self._pending: List[Tuple[int, int]] = []
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def exists(self) -> bool:
+        return self._built
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0]
+
+    def relative(self, filepath: str) -> Optional[str]:
+        """Return ``filepath`` as stored in the index, or None when it is outside the root."""
+        try:
+            return Path(filepath).resolve().relative_to(self.root.resolve()).as_posix()
+        except ValueError:
+            return None
+
+    def _keys(self, text: str) -> List[int]:
+        sig = signature(shingles(text), self.num_perm)
+        return band_keys(sig, self.bands) if sig is not None else []
+
+    def add(self, path: str, claims: Iterable[Tuple[str, int, str]]) -> int:
+        """Index the claims of the submission at ``path``; returns how many were added."""
+        count = 0
+        for field, position, text in claims:
+            keys = self._keys(text)
+            if not keys:
+                continue
+            claim_id = self.conn.execute(
+                "INSERT INTO claims (path, field, position, text) VALUES (?, ?, ?, ?)",
+                (path, field, position, text)).lastrowid
+            self._pending.extend([(key, claim_id) for key in keys])
+            count += 1
+        if len(self._pending) >= PENDING_ROWS:
+            self._write_pending()
+        return count
+
+    def _write_pending(self):
+        if self._pending:
+            self._pending.sort()
+            self.conn.executemany("INSERT OR IGNORE INTO buckets (key, claim_id) VALUES (?, ?)",
+                                  self._pending)
+            self._pending = []
+
+    def remove(self, path: str) -> int:
+        """Drop every claim of the submission at ``path``; returns how many were removed."""
+        self._write_pending()
+        rows = self.conn.execute("SELECT id, text FROM claims WHERE path = ?", (path,)).fetchall()
+        for claim_id, text in rows:
+            self.conn.executemany("DELETE FROM buckets WHERE key = ? AND claim_id = ?",
+                                  [(key, claim_id) for key in self._keys(text)])
+        self.conn.execute("DELETE FROM claims WHERE path = ?", (path,))
+        return len(rows)
+
+    def rename_paths(self, moves: Dict[str, str]):
+        """Replace every stored path ``old`` by ``moves[old]`` and commit."""
+        self.conn.executemany("UPDATE claims SET path = ? WHERE path = ?",
+                              [(new, old) for old, new in moves.items()])
+        self.flush()
+
+    def flush(self):
+        """Commit pending changes and record the index parameters."""
+        self._write_pending()
+        if not self._built:
+            self.conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                  [('num_perm', str(self.num_perm)), ('bands', str(self.bands))])
+            self._built = True
+        self.conn.commit()
+
+    def query(self, text: str, threshold: float = DEFAULT_THRESHOLD, limit: int = 10,
+              exclude: Optional[str] = None) -> List[ClaimMatch]:
+        """Return stored claims at least ``threshold`` similar to ``text``, most similar first.
+
+        Claims of the submission at ``exclude`` are left out.
+        """
+        query_shingles = shingles(text)
+        sig = signature(query_shingles, self.num_perm)
+        if sig is None:
+            return []
+        keys = band_keys(sig, self.bands)
+        self._write_pending()
+        rows = self.conn.execute(
+            f"SELECT path, field, position, text FROM claims WHERE id IN "
+            f"(SELECT claim_id FROM buckets WHERE key IN ({', '.join('?' * len(keys))}))", keys)
+        matches = []
+        for path, field, position, stored in rows:
+            if path == exclude:
+                continue
+            similarity = jaccard(query_shingles, shingles(stored))
+            if similarity >= threshold:
+                matches.append(ClaimMatch(path, field, position, stored, similarity))
+        matches.sort(key=lambda match: (-match.similarity, match.path, match.field, match.position))
+        return matches[:limit]
+
+    def rebuild(self, files: Iterable[Path], load) -> int:
+        """Index every file in ``files`` using ``load(path) -> data``."""
+        self.conn.execute("DELETE FROM buckets")
+        self.conn.execute("DELETE FROM claims")
+        count = 0
+        for path in files:
+            data = load(str(path))
+            if not isinstance(data, dict):
+                continue
+            self.add(path.relative_to(self.root).as_posix(), submission_claims(data))
+            count += 1
+        self.flush()
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or rebuild the claim similarity index.")
+    parser.add_argument('command', choices=['query', 'check', 'rebuild'],
+                        help="query: claim texts; check: submission files; rebuild: from the organized tree")
+    parser.add_argument('values', nargs='*', help="claim texts (query) or submission files (check)")
+    parser.add_argument('--root', default='data/organized', help="organized submissions directory")
+    parser.add_argument('--index', default=None, help="index database (default: <root>/.claim_index.sqlite)")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="minimum Jaccard similarity (default: %(default)s)")
+    parser.add_argument('--limit', type=int, default=5, help="matches per claim (default: %(default)s)")
+    args = parser.parse_args()
+
+    index_path = args.index or os.path.join(args.root, '.claim_index.sqlite')
+    if args.command == 'rebuild':
+        from organize_by_username import iter_organized_files, load_data_file
+        with ClaimIndex(index_path, args.root) as index:
+            count = index.rebuild(iter_organized_files(Path(args.root)), load_data_file)
+            print(f"Indexed {len(index)} claim(s) of {count} submission(s) into {index_path}")
+        return 0
+
+    found = False
+    with ClaimIndex(index_path, args.root, readonly=True) as index:
+        if args.command == 'query':
+            claims = [(repr(value), value, None) for value in args.values]
+        else:
+            from data_loader import load_file
+            claims = []
+            for filepath in args.values:
+                data = load_file(filepath)
+                if isinstance(data, dict):
+                    # A file already in the corpus is not a duplicate of itself
+                    exclude = index.relative(filepath)
+                    claims.extend((f"{filepath} {field}[{position - 1}]", text, exclude)
+                                  for field, position, text in submission_claims(data))
+        for label, text, exclude in claims:
+            matches = index.query(text, args.threshold, args.limit, exclude)
+            found = found or bool(matches)
+            print(f"{label}: {', '.join(map(describe_match, matches)) if matches else 'no similar claims'}")
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Build and query a SQLite database of the organized corpus.
+
+Submissions, claims, instruction steps and non-reproducible claims are stored
+in normalized tables, with an FTS5 index over claim, context and instruction
+text. Builds are incremental: a file is re-ingested only when its size or
+mtime changed and its content hash differs from the last ingest.
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from organize_by_username import iter_organized_files, load_data_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    submission_id INTEGER
+);
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    username TEXT,
+    paper_title TEXT,
+    paper_pdf TEXT,
+    identifier TEXT,
+    claim_type TEXT,
+    code_url TEXT,
+    data_url TEXT
+);
+CREATE INDEX IF NOT EXISTS submissions_username ON submissions(username);
+CREATE INDEX IF NOT EXISTS submissions_claim_type ON submissions(claim_type);
+CREATE INDEX IF NOT EXISTS submissions_identifier ON submissions(identifier);
+CREATE TABLE IF NOT EXISTS claims (
+    id INTEGER PRIMARY KEY,
+    submission_id INTEGER NOT NULL REFERENCES submissions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    claim TEXT,
+    context TEXT
+);
+CREATE INDEX IF NOT EXISTS claims_submission ON claims(submission_id);
+CREATE TABLE IF NOT EXISTS instruction_steps (
+    claim_id INTEGER NOT NULL REFERENCES claims(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    step TEXT,
+    PRIMARY KEY (claim_id, position)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS non_reproducible_claims (
+    id INTEGER PRIMARY KEY,
+    submission_id INTEGER NOT NULL REFERENCES submissions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    claim TEXT,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS non_reproducible_submission ON non_reproducible_claims(submission_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS claims_fts USING fts5(claim, context, instructions);
+"""
+
+SUBMISSION_FIELDS = ('username', 'paper_title', 'paper_pdf', 'identifier', 'claim_type', 'code_url', 'data_url')
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def _sha256(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def fts_query(text: str) -> str:
+    """Quote each word of ``text`` so FTS5 reads it literally.
+
+    >>> print(fts_query('band-gap of 1.2 eV'))
+    "band-gap" "of" "1.2" "eV"
+    """
+    return ' '.join('"' + token.replace('"', '""') + '"' for token in text.split())
+
+
+class CorpusDB:
+    """Incrementally built SQLite view of ``data/organized``."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -- building ---------------------------------------------------------
+
+    def build(self, root: str) -> Dict[str, int]:
+        """Sync the database with the files under ``root``.
+
+        Returns counts of added, updated, removed, unchanged and unreadable
+        files.
+        """
+        root_path = Path(root)
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'errors': 0}
+        known = {
+            row['path']: row
+            for row in self.conn.execute("SELECT path, size, mtime_ns, sha256, submission_id FROM files")
+        }
+        with self.conn:
+            for filepath in iter_organized_files(root_path):
+                relative = filepath.relative_to(root_path).as_posix()
+                stat = filepath.stat()
+                previous = known.pop(relative, None)
+                if previous is not None and (previous['size'], previous['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                    stats['unchanged'] += 1
+                    continue
+
+                sha256 = _sha256(filepath)
+                if previous is not None and previous['sha256'] == sha256:
+                    self.conn.execute("UPDATE files SET size = ?, mtime_ns = ? WHERE path = ?",
+                                      (stat.st_size, stat.st_mtime_ns, relative))
+                    stats['unchanged'] += 1
+                    continue
+
+                if previous is not None:
+                    self._delete_submission(previous['submission_id'])
+                data = load_data_file(str(filepath))
+                submission_id = self._insert_submission(relative, data) if isinstance(data, dict) else None
+                if submission_id is None:
+                    stats['errors'] += 1
+                else:
+                    stats['updated' if previous is not None else 'added'] += 1
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO files (path, size, mtime_ns, sha256, submission_id) VALUES (?, ?, ?, ?, ?)",
+                    (relative, stat.st_size, stat.st_mtime_ns, sha256, submission_id))
+
+            # Anything left in ``known`` no longer exists on disk
+            for relative, row in known.items():
+                self._delete_submission(row['submission_id'])
+                self.conn.execute("DELETE FROM files WHERE path = ?", (relative,))
+                stats['removed'] += 1
+        return stats
+
+    def _delete_submission(self, submission_id: Optional[int]):
+        if submission_id is None:
+            return
+        self.conn.execute(
+            "DELETE FROM claims_fts WHERE rowid IN (SELECT id FROM claims WHERE submission_id = ?)",
+            (submission_id,))
+        self.conn.execute("DELETE FROM submissions WHERE id = ?", (submission_id,))
+
+    def _insert_submission(self, relative: str, data: Dict[str, Any]) -> int:
+        cursor = self.conn.execute(
+            f"INSERT INTO submissions (path, {', '.join(SUBMISSION_FIELDS)}) "
+            f"VALUES (?{', ?' * len(SUBMISSION_FIELDS)})",
+            (relative, *(_text(data.get(field)) for field in SUBMISSION_FIELDS)))
+        submission_id = cursor.lastrowid
+
+        claims = data.get('claims')
+        for position, claim in enumerate(claims if isinstance(claims, list) else [], 1):
+            if not isinstance(claim, dict):
+                continue
+            claim_text, context = _text(claim.get('claim')), _text(claim.get('context'))
+            claim_id = self.conn.execute(
+                "INSERT INTO claims (submission_id, position, claim, context) VALUES (?, ?, ?, ?)",
+                (submission_id, position, claim_text, context)).lastrowid
+            steps = claim.get('instruction')
+            steps = [_text(step) for step in steps] if isinstance(steps, list) else []
+            self.conn.executemany(
+                "INSERT INTO instruction_steps (claim_id, position, step) VALUES (?, ?, ?)",
+                [(claim_id, step_position, step) for step_position, step in enumerate(steps, 1)])
+            self.conn.execute(
+                "INSERT INTO claims_fts (rowid, claim, context, instructions) VALUES (?, ?, ?, ?)",
+                (claim_id, claim_text or '', context or '', '\n'.join(step or '' for step in steps)))
+
+        non_reproducible = data.get('non_reproducible_claims')
+        self.conn.executemany(
+            "INSERT INTO non_reproducible_claims (submission_id, position, claim, reason) VALUES (?, ?, ?, ?)",
+            [(submission_id, position, _text(claim.get('claim')), _text(claim.get('reason')))
+             for position, claim in enumerate(non_reproducible if isinstance(non_reproducible, list) else [], 1)
+             if isinstance(claim, dict)])
+        return submission_id
+
+    # -- querying ---------------------------------------------------------
+
+    def search_claims(self, query: str, limit: int = 20, raw: bool = False) -> List[Dict[str, Any]]:
+        """Full-text search over claims, context and instructions, best first.
+
+        Every whitespace-separated word of ``query`` must match, as typed:
+        ``band-gap`` or ``1.2`` match as phrases rather than FTS5 syntax.
+        With ``raw`` the query is passed to FTS5 unchanged (``OR``, ``NEAR``,
+        prefixes ``term*``), and malformed syntax raises ``sqlite3.OperationalError``.
+        """
+        if not raw:
+            query = fts_query(query)
+            if not query:
+                return []
+        rows = self.conn.execute(
+            """
+            SELECT s.path, s.username, s.paper_title, c.position, c.claim, c.context,
+                   snippet(claims_fts, -1, '[', ']', '…', 12) AS snippet
+            FROM claims_fts
+            JOIN claims c ON c.id = claims_fts.rowid
+            JOIN submissions s ON s.id = c.submission_id
+            WHERE claims_fts MATCH ?
+            ORDER BY bm25(claims_fts)
+            LIMIT ?
+            """, (query, limit))
+        return [dict(row) for row in rows]
+
+    def submissions(self, limit: int = None, **filters: Any) -> List[Dict[str, Any]]:
+        """Return submissions matching exact column filters, e.g. ``claim_type='pip_libraries'``."""
+        unknown = set(filters) - set(SUBMISSION_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown submission field(s): {', '.join(sorted(unknown))}")
+        where = ' AND '.join(f"{field} = ?" for field in filters) or '1'
+        sql = f"SELECT * FROM submissions WHERE {where} ORDER BY path"
+        params = list(filters.values())
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def claims(self, path: str) -> List[Dict[str, Any]]:
+        """Return the claims of one submission with their instruction steps."""
+        claims = []
+        for row in self.conn.execute(
+                "SELECT c.id, c.position, c.claim, c.context FROM claims c "
+                "JOIN submissions s ON s.id = c.submission_id WHERE s.path = ? ORDER BY c.position", (path,)):
+            claim = dict(row)
+            claim['instruction'] = [step for (step,) in self.conn.execute(
+                "SELECT step FROM instruction_steps WHERE claim_id = ? ORDER BY position", (claim.pop('id'),))]
+            claims.append(claim)
+        return claims
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or search the corpus database.")
+    parser.add_argument('--db', default='data/corpus.sqlite', help="database file (default: data/corpus.sqlite)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help="sync the database with an organized tree")
+    build.add_argument('root', nargs='?', default='data/organized')
+    search = commands.add_parser('search', help="full-text search over claims")
+    search.add_argument('query')
+    search.add_argument('--limit', type=int, default=20)
+    search.add_argument('--raw', action='store_true',
+                        help="pass the query to FTS5 as query syntax (OR, NEAR, prefix*)")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.db) or '.', exist_ok=True)
+    with CorpusDB(args.db) as db:
+        if args.command == 'build':
+            stats = db.build(args.root)
+            print(', '.join(f"{name}: {count}" for name, count in stats.items()))
+            return 1 if stats['errors'] else 0
+
+        try:
+            results = db.search_claims(args.query, args.limit, raw=args.raw)
+        except sqlite3.OperationalError as e:
+            print(f"❌ Invalid search query {args.query!r}: {e}", file=sys.stderr)
+            return 2
+        for result in results:
+            print(f"{result['path']} (claim {result['position']}): {result['snippet']}")
+        return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Compact in-memory model of the organized corpus.
+
+Loaded as nested dicts, every submission keeps its own copy of values that
+repeat across the corpus (usernames, claim types, repository URLs, claim
+contexts, instruction steps such as ``pip install -r requirements.txt``) plus
+a hash table per object. This model instead stores:
+
+* one ``Submission``, ``Claim`` or ``NonReproducibleClaim`` object with
+  ``__slots__`` per record, so fields cost a pointer each;
+* one copy of each repeated string, interned in a per-corpus table;
+* the instruction steps of all claims in a single flat ``array('I')`` of
+  ids into a table of distinct steps, where a claim only holds the start
+  and stop offset of its steps.
+
+Files are loaded one at a time and their dicts dropped right away, so the
+dict form of the whole corpus never exists. Access is through iterators;
+``to_dict()`` rebuilds the submitted form of one record when it is needed.
+"""
+
+import argparse
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from corpus_db import SUBMISSION_FIELDS
+from organize_by_username import iter_organized_files, load_data_file
+
+# Submission fields whose values commonly repeat across submissions
+INTERNED_FIELDS = ('username', 'claim_type', 'code_url')
+
+
+class Claim:
+    """A reproducible claim; its steps live in the corpus step array."""
+
+    __slots__ = ('corpus', 'text', 'context', 'start', 'stop')
+
+    def __init__(self, corpus: 'Corpus', text: Any, context: Any, start: int, stop: int):
+        self.corpus = corpus
+        self.text = text
+        self.context = context
+        self.start = start
+        self.stop = stop
+
+    def __len__(self) -> int:
+        """Number of instruction steps."""
+        return self.stop - self.start
+
+    def steps(self) -> Iterator[str]:
+        """Yield the instruction steps in order."""
+        table, ids = self.corpus.step_table, self.corpus.step_ids
+        return (table[ids[offset]] for offset in range(self.start, self.stop))
+
+    def to_dict(self) -> Dict[str, Any]:
+        claim = {'claim': self.text}
+        if self.context is not None:
+            claim['context'] = self.context
+        claim['instruction'] = list(self.steps())
+        return claim
+
+    def __repr__(self) -> str:
+        return f"Claim({self.text!r}, steps={len(self)})"
+
+
+class NonReproducibleClaim:
+    """A claim that cannot be reproduced, with the reason why."""
+
+    __slots__ = ('text', 'reason')
+
+    def __init__(self, text: Any, reason: Any):
+        self.text = text
+        self.reason = reason
+
+    def to_dict(self) -> Dict[str, Any]:
+        claim = {'claim': self.text}
+        if self.reason is not None:
+            claim['reason'] = self.reason
+        return claim
+
+    def __repr__(self) -> str:
+        return f"NonReproducibleClaim({self.text!r})"
+
+
+class Submission:
+    """One organized submission. Fields missing from the file are None."""
+
+    __slots__ = ('path',) + SUBMISSION_FIELDS + ('claims', 'non_reproducible_claims')
+
+    def __init__(self, path: str, fields: Dict[str, Any], claims: Tuple[Claim, ...],
+                 non_reproducible_claims: Tuple[NonReproducibleClaim, ...]):
+        self.path = path
+        for field in SUBMISSION_FIELDS:
+            setattr(self, field, fields.get(field))
+        self.claims = claims
+        self.non_reproducible_claims = non_reproducible_claims
+
+    def steps(self) -> Iterator[str]:
+        """Yield the instruction steps of every claim in order."""
+        for claim in self.claims:
+            yield from claim.steps()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the submission in its submitted shape (present fields only)."""
+        data = {field: getattr(self, field) for field in SUBMISSION_FIELDS
+                if getattr(self, field) is not None}
+        data['claims'] = [claim.to_dict() for claim in self.claims]
+        data['non_reproducible_claims'] = [claim.to_dict() for claim in self.non_reproducible_claims]
+        return data
+
+    def __repr__(self) -> str:
+        return f"Submission({self.path!r}, claims={len(self.claims)})"
+
+
+def _items(value: Any) -> List[Dict[str, Any]]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+class Corpus:
+    """Submissions held as compact records.
+
+    ``step_table`` lists each distinct instruction step once and
+    ``step_ids`` is the flat array of all claims' steps as indexes into it.
+    """
+
+    def __init__(self):
+        self.records: List[Submission] = []
+        self.strings: Dict[str, str] = {}
+        self.step_table: List[str] = []
+        self.step_ids = array('I')
+        self._step_numbers: Dict[str, int] = {}
+        self.errors = 0
+
+    @classmethod
+    def load(cls, root: str) -> 'Corpus':
+        """Load every organized file under ``root``; unreadable files count as ``errors``."""
+        corpus = cls()
+        root_path = Path(root)
+        for filepath in iter_organized_files(root_path):
+            data = load_data_file(str(filepath))
+            if isinstance(data, dict):
+                corpus.add(filepath.relative_to(root_path).as_posix(), data)
+            else:
+                corpus.errors += 1
+        return corpus
+
+    @classmethod
+    def from_records(cls, records: Iterable[Tuple[str, Dict[str, Any]]]) -> 'Corpus':
+        """Build a corpus from ``(path, data)`` pairs, e.g. a packed corpus scan."""
+        corpus = cls()
+        for path, data in records:
+            corpus.add(path, data)
+        return corpus
+
+    def intern(self, value: Any) -> Any:
+        """Return the corpus's copy of a string value; other values are returned as is."""
+        if isinstance(value, str):
+            return self.strings.setdefault(value, value)
+        return value
+
+    def _step_number(self, step: Any) -> int:
+        if not isinstance(step, str):
+            step = str(step)
+        number = self._step_numbers.get(step)
+        if number is None:
+            number = self._step_numbers[step] = len(self.step_table)
+            self.step_table.append(step)
+        return number
+
+    def add(self, path: str, data: Dict[str, Any]) -> Submission:
+        """Append one parsed submission and return its record."""
+        claims = []
+        for claim in _items(data.get('claims')):
+            start = len(self.step_ids)
+            steps = claim.get('instruction')
+            if isinstance(steps, list):
+                self.step_ids.extend(map(self._step_number, steps))
+            claims.append(Claim(self, claim.get('claim'), self.intern(claim.get('context')),
+                                start, len(self.step_ids)))
+        non_reproducible = tuple(
+            NonReproducibleClaim(self.intern(claim.get('claim')), self.intern(claim.get('reason')))
+            for claim in _items(data.get('non_reproducible_claims')))
+        fields = {field: data.get(field) for field in SUBMISSION_FIELDS}
+        for field in INTERNED_FIELDS:
+            fields[field] = self.intern(fields[field])
+        submission = Submission(path, fields, tuple(claims), non_reproducible)
+        self.records.append(submission)
+        return submission
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Submission]:
+        return iter(self.records)
+
+    def submissions(self, **filters: Any) -> Iterator[Submission]:
+        """Yield submissions matching exact field filters, e.g. ``claim_type='pip_libraries'``."""
+        unknown = set(filters) - set(SUBMISSION_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown submission field(s): {', '.join(sorted(unknown))}")
+        wanted = list(filters.items())
+        return (submission for submission in self.records
+                if all(getattr(submission, field) == value for field, value in wanted))
+
+    def claims(self, **filters: Any) -> Iterator[Tuple[Submission, Claim]]:
+        """Yield ``(submission, claim)`` for the claims of matching submissions."""
+        for submission in self.submissions(**filters):
+            for claim in submission.claims:
+                yield submission, claim
+
+    def common_steps(self, limit: Optional[int] = 10) -> List[Tuple[str, int]]:
+        """Return the most frequent instruction steps with their counts."""
+        counts = Counter(self.step_ids).most_common(limit)
+        return [(self.step_table[number], count) for number, count in counts]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'submissions': len(self.records),
+            'claims': sum(len(submission.claims) for submission in self.records),
+            'steps': len(self.step_ids),
+            'distinct_steps': len(self.step_table),
+            'interned_strings': len(self.strings),
+            'errors': self.errors,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load the organized corpus into compact records and summarize it.")
+    parser.add_argument('root', nargs='?', default='data/organized')
+    parser.add_argument('--steps', type=int, default=10, metavar='N', help="show the N most common steps")
+    args = parser.parse_args()
+
+    corpus = Corpus.load(args.root)
+    print(', '.join(f"{name}: {count}" for name, count in corpus.stats().items()))
+    for step, count in corpus.common_steps(args.steps):
+        print(f"{count:8d}  {step}")
+    return 1 if corpus.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+"""
+Pack the organized corpus into compressed segment files.
+
+Each submission becomes one gzip member holding a single JSON line
+``{"path": ..., "data": ...}``, appended to ``segment-NNNNN.jsonl.gz``. A
+concatenation of gzip members is itself a valid gzip stream, so a segment can
+be read with ``zcat`` or streamed front to back, and any one record can be
+decompressed on its own from its offset.
+
+The pack directory holds:
+
+* ``records.idx`` - one fixed-width entry per record: offset, length,
+  segment number and flags (superseded records are flagged, not removed);
+* ``users.idx`` and ``identifiers.idx`` - open-addressing hash tables from a
+  64-bit key hash to record numbers, memory-mapped by the reader so a lookup
+  touches a few slots regardless of corpus size;
+* ``pack.json`` - the manifest: the committed record count and, per packed
+  path, its size, mtime, content hash and record number.
+
+Packing is incremental: unchanged files are skipped, changed files are
+appended as a new record that supersedes the old one, and deleted files are
+flagged. Data past the committed record count (from an interrupted pack) is
+discarded on the next pack.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from identifier_index import normalize_identifier, submission_keys
+from organize_by_username import iter_organized_files, load_data_file
+
+# offset, length, segment, flags
+RECORD = struct.Struct('<QIIB3x')
+FLAG_SUPERSEDED = 1
+
+# magic, slot count, entry count; then slots of (key hash, record number)
+TABLE_HEADER = struct.Struct('<4sII')
+TABLE_MAGIC = b'CPH1'
+SLOT = struct.Struct('<QI')
+EMPTY = 0xFFFFFFFF
+MIN_SLOTS = 64
+
+SEGMENT_BYTES = 64 * 1024 * 1024
+
+
+def key_hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _segment_name(number: int) -> str:
+    return f"segment-{number:05d}.jsonl.gz"
+
+
+def _table_lookup(buf, key: str) -> Iterator[int]:
+    """Yield candidate record numbers for ``key`` from a serialized table."""
+    _, slots, _ = TABLE_HEADER.unpack_from(buf, 0)
+    wanted = key_hash(key)
+    slot = wanted % slots
+    while True:
+        stored, record = SLOT.unpack_from(buf, TABLE_HEADER.size + slot * SLOT.size)
+        if record == EMPTY:
+            return
+        if stored == wanted:
+            yield record
+        slot = (slot + 1) % slots
+
+
+class _TableWriter:
+    """In-memory open-addressing table kept at most half full."""
+
+    def __init__(self, slots: int = MIN_SLOTS):
+        self.slots = slots
+        self.count = 0
+        self.buf = bytearray(TABLE_HEADER.size + slots * SLOT.size)
+        for slot in range(slots):
+            SLOT.pack_into(self.buf, TABLE_HEADER.size + slot * SLOT.size, 0, EMPTY)
+
+    @classmethod
+    def load(cls, path: Path, records: int) -> '_TableWriter':
+        """Reload a table, dropping entries for records past ``records``."""
+        table = cls()
+        if path.exists():
+            data = path.read_bytes()
+            _, slots, _ = TABLE_HEADER.unpack_from(data, 0)
+            for slot in range(slots):
+                stored, record = SLOT.unpack_from(data, TABLE_HEADER.size + slot * SLOT.size)
+                if record != EMPTY and record < records:
+                    table.insert_hash(stored, record)
+        return table
+
+    def insert(self, key: str, record: int):
+        self.insert_hash(key_hash(key), record)
+
+    def insert_hash(self, stored: int, record: int):
+        if (self.count + 1) * 2 > self.slots:
+            self._grow()
+        slot = stored % self.slots
+        while SLOT.unpack_from(self.buf, TABLE_HEADER.size + slot * SLOT.size)[1] != EMPTY:
+            slot = (slot + 1) % self.slots
+        SLOT.pack_into(self.buf, TABLE_HEADER.size + slot * SLOT.size, stored, record)
+        self.count += 1
+
+    def _grow(self):
+        old = self.buf
+        old_slots = self.slots
+        self.__init__(old_slots * 2)
+        for slot in range(old_slots):
+            stored, record = SLOT.unpack_from(old, TABLE_HEADER.size + slot * SLOT.size)
+            if record != EMPTY:
+                self.insert_hash(stored, record)
+
+    def write(self, path: Path):
+        TABLE_HEADER.pack_into(self.buf, 0, TABLE_MAGIC, self.slots, self.count)
+        _write_atomic(path, bytes(self.buf))
+
+
+def _write_atomic(path: Path, content: bytes):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(content)
+    os.replace(tmp, path)
+
+
+def _user_of(relative: str) -> str:
+    return relative.split('/', 1)[0]
+
+
+class CorpusPacker:
+    """Append organized submissions to a pack directory."""
+
+    def __init__(self, pack_dir: str, segment_bytes: int = SEGMENT_BYTES):
+        self.pack_dir = Path(pack_dir)
+        self.pack_dir.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+        manifest_path = self.pack_dir / 'pack.json'
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'version': 1, 'records': 0, 'files': {}}
+        self.records = self.manifest['records']
+
+        self._superseded: List[int] = []
+
+        # Drop anything an interrupted pack wrote past the committed count
+        index_path = self.pack_dir / 'records.idx'
+        index_path.touch()
+        self._index = open(index_path, 'r+b')
+        self._index.truncate(self.records * RECORD.size)
+        self.users = _TableWriter.load(self.pack_dir / 'users.idx', self.records)
+        self.identifiers = _TableWriter.load(self.pack_dir / 'identifiers.idx', self.records)
+
+        self._segment_number, end = 0, 0
+        if self.records:
+            self._index.seek((self.records - 1) * RECORD.size)
+            offset, length, self._segment_number, _ = RECORD.unpack(self._index.read(RECORD.size))
+            end = offset + length
+        for stale in self.pack_dir.glob('segment-*.jsonl.gz'):
+            if int(stale.name[len('segment-'):-len('.jsonl.gz')]) > self._segment_number:
+                stale.unlink()
+        self._segment = open(self.pack_dir / _segment_name(self._segment_number), 'ab')
+        self._segment.truncate(end)
+        self._segment.seek(end)
+
+    def close(self):
+        self._index.close()
+        self._segment.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def append(self, relative: str, data: Dict[str, Any]) -> int:
+        """Append one submission and return its record number."""
+        line = json.dumps({'path': relative, 'data': data}, ensure_ascii=False, separators=(',', ':'))
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        member = compressor.compress(line.encode('utf-8') + b'\n') + compressor.flush()
+
+        offset = self._segment.tell()
+        if offset and offset + len(member) > self.segment_bytes:
+            self._segment.flush()
+            os.fsync(self._segment.fileno())
+            self._segment.close()
+            self._segment_number += 1
+            self._segment = open(self.pack_dir / _segment_name(self._segment_number), 'ab')
+            offset = self._segment.tell()
+        self._segment.write(member)
+
+        record = self.records
+        self._index.seek(0, os.SEEK_END)
+        self._index.write(RECORD.pack(offset, len(member), self._segment_number, 0))
+        self.records += 1
+        self.users.insert(_user_of(relative), record)
+        for key in submission_keys(data):
+            self.identifiers.insert(key, record)
+        return record
+
+    def supersede(self, record: int):
+        """Flag a record as replaced or deleted (applied on ``commit``)."""
+        self._superseded.append(record)
+
+    def pack(self, root: str) -> Dict[str, int]:
+        """Bring the pack in line with the files under ``root``.
+
+        Returns counts of added, updated, removed, unchanged and unreadable
+        files.
+        """
+        root_path = Path(root)
+        files = self.manifest['files']
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'errors': 0}
+        seen = set()
+        for filepath in iter_organized_files(root_path):
+            relative = filepath.relative_to(root_path).as_posix()
+            seen.add(relative)
+            stat = filepath.stat()
+            previous = files.get(relative)
+            if previous and (previous['size'], previous['mtime_ns']) == (stat.st_size, stat.st_mtime_ns):
+                stats['unchanged'] += 1
+                continue
+            content = filepath.read_bytes()
+            sha256 = hashlib.sha256(content).hexdigest()
+            if previous and previous['sha256'] == sha256:
+                previous.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                stats['unchanged'] += 1
+                continue
+
+            data = load_data_file(str(filepath))
+            if not isinstance(data, dict):
+                stats['errors'] += 1
+                continue
+            if previous:
+                self.supersede(previous['record'])
+            record = self.append(relative, data)
+            files[relative] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                               'sha256': sha256, 'record': record}
+            stats['updated' if previous else 'added'] += 1
+
+        for relative in [relative for relative in files if relative not in seen]:
+            self.supersede(files.pop(relative)['record'])
+            stats['removed'] += 1
+        self.commit()
+        return stats
+
+    def commit(self):
+        """Make everything appended so far visible to readers."""
+        self._segment.flush()
+        os.fsync(self._segment.fileno())
+        for record in self._superseded:
+            self._index.seek(record * RECORD.size)
+            offset, length, segment, flags = RECORD.unpack(self._index.read(RECORD.size))
+            self._index.seek(record * RECORD.size)
+            self._index.write(RECORD.pack(offset, length, segment, flags | FLAG_SUPERSEDED))
+        self._superseded.clear()
+        self._index.flush()
+        os.fsync(self._index.fileno())
+        self.users.write(self.pack_dir / 'users.idx')
+        self.identifiers.write(self.pack_dir / 'identifiers.idx')
+        self.manifest['records'] = self.records
+        _write_atomic(self.pack_dir / 'pack.json',
+                      json.dumps(self.manifest, separators=(',', ':')).encode('utf-8'))
+
+
+def _map(path: Path) -> Optional[mmap.mmap]:
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class PackedCorpus:
+    """Read-only view of a pack directory.
+
+    The record index, hash tables and segments are memory-mapped; records
+    are decompressed on demand.
+    """
+
+    def __init__(self, pack_dir: str):
+        self.pack_dir = Path(pack_dir)
+        with open(self.pack_dir / 'pack.json', 'r', encoding='utf-8') as f:
+            self.records = json.load(f)['records']
+        self._index = _map(self.pack_dir / 'records.idx')
+        self._users = _map(self.pack_dir / 'users.idx')
+        self._identifiers = _map(self.pack_dir / 'identifiers.idx')
+        self._segments: Dict[int, mmap.mmap] = {}
+
+    def close(self):
+        for mapped in [self._index, self._users, self._identifiers, *self._segments.values()]:
+            if mapped is not None:
+                mapped.close()
+        self._segments.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of live (not superseded) records."""
+        return sum(1 for number in range(self.records) if not self._entry(number)[3] & FLAG_SUPERSEDED)
+
+    def _entry(self, number: int):
+        return RECORD.unpack_from(self._index, number * RECORD.size)
+
+    def _segment(self, number: int) -> mmap.mmap:
+        mapped = self._segments.get(number)
+        if mapped is None:
+            mapped = self._segments[number] = _map(self.pack_dir / _segment_name(number))
+        return mapped
+
+    def record(self, number: int) -> Dict[str, Any]:
+        """Return record ``number`` as ``{'path': ..., 'data': ...}``."""
+        offset, length, segment, _ = self._entry(number)
+        member = self._segment(segment)[offset:offset + length]
+        return json.loads(zlib.decompress(member, 31))
+
+    def _live(self, candidates: Iterator[int]) -> Iterator[Dict[str, Any]]:
+        for number in sorted(set(candidates)):
+            if number < self.records and not self._entry(number)[3] & FLAG_SUPERSEDED:
+                yield self.record(number)
+
+    def by_user(self, username: str) -> List[Dict[str, Any]]:
+        """Return every live record in ``username``'s directory."""
+        return [record for record in self._live(_table_lookup(self._users, username))
+                if _user_of(record['path']) == username]
+
+    def by_identifier(self, value: str) -> List[Dict[str, Any]]:
+        """Return live records whose identifier or paper URL matches ``value``."""
+        key = normalize_identifier(value)
+        if not key:
+            return []
+        return [record for record in self._live(_table_lookup(self._identifiers, key))
+                if key in submission_keys(record['data'])]
+
+    def scan(self) -> Iterator[Dict[str, Any]]:
+        """Stream every live record in pack order, one segment at a time."""
+        number = 0
+        segment = None
+        stream = None
+        try:
+            while number < self.records:
+                _, _, record_segment, flags = self._entry(number)
+                if record_segment != segment:
+                    if stream is not None:
+                        stream.close()
+                    segment = record_segment
+                    stream = gzip.open(self.pack_dir / _segment_name(segment), 'rb')
+                line = stream.readline()
+                if not flags & FLAG_SUPERSEDED:
+                    yield json.loads(line)
+                number += 1
+        finally:
+            if stream is not None:
+                stream.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack or query the organized corpus.")
+    parser.add_argument('--pack-dir', default='data/packed', help="pack directory (default: data/packed)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    pack = commands.add_parser('pack', help="append new and changed submissions")
+    pack.add_argument('root', nargs='?', default='data/organized')
+    user = commands.add_parser('user', help="list a user's submissions")
+    user.add_argument('username')
+    identifier = commands.add_parser('identifier', help="find submissions by DOI, arXiv ID or URL")
+    identifier.add_argument('value')
+    args = parser.parse_args()
+
+    if args.command == 'pack':
+        with CorpusPacker(args.pack_dir) as packer:
+            stats = packer.pack(args.root)
+        print(', '.join(f"{name}: {count}" for name, count in stats.items()))
+        return 1 if stats['errors'] else 0
+
+    with PackedCorpus(args.pack_dir) as corpus:
+        if args.command == 'user':
+            records = corpus.by_user(args.username)
+        else:
+            records = corpus.by_identifier(args.value)
+    for record in records:
+        print(record['path'])
+    return 0 if records else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
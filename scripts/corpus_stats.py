@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Vectorized statistics over the organized corpus.
+
+Every organized file is one row of a set of NumPy column arrays: its user
+directory, claim type, number of claims and of non-reproducible claims, the
+host of its paper, code and data URLs, and the size, mtime and SHA-256 used
+to refresh it. Instruction step counts form a flat per-claim column together
+with the row each claim belongs to. Group-by summaries are ``np.unique`` and
+``np.bincount`` over whole columns, and histograms are ``np.bincount`` or
+``np.histogram``.
+
+The columns are kept in ``<root>/.corpus_stats.npz``. A refresh stats every
+file and parses only those whose size or mtime changed and whose content
+hash differs; the rows of deleted files are dropped. The JSON summary
+(``--output``) is read by the docs site, and ``--markdown`` renders it for
+the workflow's job summary.
+
+Requires NumPy.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import tempfile
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from organize_by_username import iter_organized_files, load_data_file
+
+STATE_NAME = '.corpus_stats.npz'
+STATE_VERSION = 1
+DEFAULT_OUTPUT = 'docs/corpus_stats.json'
+
+# URL fields whose host is a column (named ``<prefix>_host``)
+URL_FIELDS = {'paper': 'paper_pdf', 'code': 'code_url', 'data': 'data_url'}
+HOST_COLUMNS = tuple(f"{prefix}_host" for prefix in URL_FIELDS)
+STRING_COLUMNS = ('path', 'sha256', 'user', 'claim_type') + HOST_COLUMNS
+INTEGER_COLUMNS = ('size', 'mtime_ns', 'claims', 'non_reproducible')
+# Per-claim columns: the row of the claim's submission and its step count
+CLAIM_COLUMNS = ('claim_row', 'steps')
+RATIO_BINS = 10
+
+
+def url_host(value: Any) -> str:
+    """Return the lower-cased host of a URL without ``www.``, or '' if there is none.
+
+    >>> url_host('https://www.GitHub.com/org/repo')
+    'github.com'
+    """
+    if not isinstance(value, str):
+        return ''
+    try:
+        host = urlsplit(value.strip()).hostname or ''
+    except ValueError:
+        return ''
+    return host[4:] if host.startswith('www.') else host
+
+
+def _items(value: Any) -> List[Dict[str, Any]]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _sha256(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def _empty_columns() -> Dict[str, np.ndarray]:
+    columns = {name: np.array([], dtype=str) for name in STRING_COLUMNS}
+    columns.update((name, np.array([], dtype=np.int64)) for name in INTEGER_COLUMNS + CLAIM_COLUMNS)
+    return columns
+
+
+def _counts(values: np.ndarray) -> Dict[str, int]:
+    """Count each distinct non-empty value, most frequent first."""
+    values = values[values != '']
+    distinct, counts = np.unique(values, return_counts=True)
+    order = np.lexsort((distinct, -counts))
+    return {str(value): int(count) for value, count in zip(distinct[order], counts[order])}
+
+
+class CorpusStats:
+    """Column arrays of the organized corpus, refreshed incrementally."""
+
+    def __init__(self, state_path: Optional[str] = None):
+        self.state_path = state_path
+        self.columns = _empty_columns()
+        if state_path and os.path.exists(state_path):
+            with np.load(state_path, allow_pickle=False) as state:
+                if int(state['version']) == STATE_VERSION:
+                    self.columns = {name: state[name] for name in self.columns}
+
+    def __len__(self) -> int:
+        return len(self.columns['path'])
+
+    def refresh(self, root: str) -> Dict[str, int]:
+        """Sync the columns with the files under ``root``.
+
+        Returns counts of added, updated, removed, unchanged and unreadable
+        files.
+        """
+        root_path = Path(root)
+        old = self.columns
+        rows = {path: row for row, path in enumerate(old['path'].tolist())}
+        keep = np.zeros(len(rows), dtype=bool)
+        seen = 0
+        added: List[Dict[str, Any]] = []
+        added_steps: List[List[int]] = []
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'errors': 0}
+
+        for filepath in iter_organized_files(root_path):
+            relative = filepath.relative_to(root_path).as_posix()
+            stat = filepath.stat()
+            row = rows.get(relative)
+            if row is not None:
+                seen += 1
+                if (old['size'][row], old['mtime_ns'][row]) == (stat.st_size, stat.st_mtime_ns):
+                    keep[row] = True
+                    stats['unchanged'] += 1
+                    continue
+
+            sha256 = _sha256(filepath)
+            if row is not None and old['sha256'][row] == sha256:
+                old['size'][row], old['mtime_ns'][row] = stat.st_size, stat.st_mtime_ns
+                keep[row] = True
+                stats['unchanged'] += 1
+                continue
+
+            data = load_data_file(str(filepath))
+            if not isinstance(data, dict):
+                stats['errors'] += 1
+                continue
+            claims = _items(data.get('claims'))
+            added.append({
+                'path': relative, 'sha256': sha256, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                'user': relative.split('/', 1)[0],
+                'claim_type': data.get('claim_type') if isinstance(data.get('claim_type'), str) else '',
+                'claims': len(claims),
+                'non_reproducible': len(_items(data.get('non_reproducible_claims'))),
+                **{f"{prefix}_host": url_host(data.get(field)) for prefix, field in URL_FIELDS.items()},
+            })
+            added_steps.append([len(claim['instruction']) if isinstance(claim.get('instruction'), list) else 0
+                                for claim in claims])
+            stats['updated' if row is not None else 'added'] += 1
+        stats['removed'] = len(rows) - seen
+
+        # Drop replaced and deleted rows, renumbering the claims that stay
+        kept_claims = keep[old['claim_row']]
+        new_row = np.cumsum(keep) - 1
+        columns = {name: old[name][keep] for name in STRING_COLUMNS + INTEGER_COLUMNS}
+        columns['claim_row'] = new_row[old['claim_row'][kept_claims]]
+        columns['steps'] = old['steps'][kept_claims]
+
+        if added:
+            for names, dtype in ((STRING_COLUMNS, str), (INTEGER_COLUMNS, np.int64)):
+                for name in names:
+                    values = np.array([row[name] for row in added], dtype=dtype)
+                    columns[name] = np.concatenate([columns[name], values])
+            first = int(keep.sum())
+            columns['claim_row'] = np.concatenate([
+                columns['claim_row'],
+                np.repeat(np.arange(first, first + len(added)), [len(steps) for steps in added_steps])])
+            columns['steps'] = np.concatenate([
+                columns['steps'],
+                np.fromiter(chain.from_iterable(added_steps), dtype=np.int64)])
+        self.columns = columns
+        return stats
+
+    def save(self):
+        """Write the columns to ``state_path`` atomically."""
+        directory = os.path.dirname(self.state_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, version=np.array(STATE_VERSION), **self.columns)
+            os.replace(tmp, self.state_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def summary(self) -> Dict[str, Any]:
+        """Group-by summaries and histograms of the corpus as JSON-ready values."""
+        c = self.columns
+        rows = len(c['path'])
+        claims, non_reproducible = c['claims'], c['non_reproducible']
+        row_steps = np.bincount(c['claim_row'], weights=c['steps'], minlength=rows)
+
+        users, user_of_row = np.unique(c['user'], return_inverse=True)
+        per_user = {
+            name: np.bincount(user_of_row, weights=weights, minlength=len(users))
+            for name, weights in (('submissions', None), ('claims', claims),
+                                  ('non_reproducible_claims', non_reproducible), ('steps', row_steps))
+        }
+        order = np.lexsort((users, -per_user['submissions']))
+
+        total_claims = claims + non_reproducible
+        described = total_claims > 0
+        ratio = claims[described] / total_claims[described]
+        ratio_counts, ratio_edges = np.histogram(ratio, bins=RATIO_BINS, range=(0.0, 1.0))
+        all_claims = int(total_claims.sum())
+
+        return {
+            'totals': {
+                'submissions': rows,
+                'users': len(users),
+                'claims': int(claims.sum()),
+                'non_reproducible_claims': int(non_reproducible.sum()),
+                'steps': int(c['steps'].sum()),
+                'reproducible_share': round(float(claims.sum()) / all_claims, 4) if all_claims else None,
+            },
+            'users': [
+                {'username': str(users[i]), **{name: int(values[i]) for name, values in per_user.items()}}
+                for i in order
+            ],
+            'claim_types': _counts(c['claim_type']),
+            'hosts': {field: _counts(c[f"{prefix}_host"]) for prefix, field in URL_FIELDS.items()},
+            'histograms': {
+                # Index i holds the number of submissions (claims) with i claims (steps)
+                'claims_per_submission': np.bincount(claims).tolist(),
+                'steps_per_claim': np.bincount(c['steps']).tolist(),
+                'reproducible_share': {
+                    'edges': [round(float(edge), 2) for edge in ratio_edges],
+                    'counts': ratio_counts.tolist(),
+                },
+            },
+        }
+
+
+def render_markdown(summary: Dict[str, Any]) -> str:
+    """Render a summary as Markdown for a GitHub job summary."""
+    totals = summary['totals']
+    lines = [
+        "### 📈 Corpus Statistics",
+        "",
+        f"**{totals['submissions']}** submissions from **{totals['users']}** users with "
+        f"**{totals['claims']}** reproducible and **{totals['non_reproducible_claims']}** "
+        f"non-reproducible claims ({totals['steps']} instruction steps).",
+        "",
+        "### 📁 User Directories",
+        "",
+        "| User | Files | Claims | Non-reproducible |",
+        "| --- | ---: | ---: | ---: |",
+    ]
+    lines += [f"| {user['username']} | {user['submissions']} | {user['claims']} | "
+              f"{user['non_reproducible_claims']} |" for user in summary['users']]
+    if summary['claim_types']:
+        lines += ["", "**Claim types:** " + ', '.join(
+            f"{claim_type} ({count})" for claim_type, count in summary['claim_types'].items())]
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh corpus statistics and write a JSON summary.")
+    parser.add_argument('root', nargs='?', default='data/organized')
+    parser.add_argument('--state', help=f"column state file (default: <root>/{STATE_NAME})")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSON summary file (default: %(default)s)")
+    parser.add_argument('--markdown', action='store_true',
+                        help="print the summary as Markdown instead of the refresh counts")
+    args = parser.parse_args()
+
+    corpus = CorpusStats(args.state or os.path.join(args.root, STATE_NAME))
+    stats = corpus.refresh(args.root)
+    corpus.save()
+    summary = corpus.summary()
+    os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+        f.write('\n')
+
+    if args.markdown:
+        print(render_markdown(summary), end='')
+    else:
+        print(', '.join(f"{name}: {count}" for name, count in stats.items()))
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+JSON and YAML loading shared by the validator and the organizer.
+
+PyYAML is only imported when the first YAML document is parsed, so runs that
+touch nothing but ``.json`` files never pay for it. YAML is parsed with
+libyaml's ``CSafeLoader`` when PyYAML was built with it and with the
+pure-Python ``SafeLoader`` otherwise; both construct the same safe types.
+
+Parsing is bounded by ``ParseLimits``. The byte limit is checked before a
+file is read. JSON objects are checked by an ``object_hook`` as the
+decoder builds them. YAML is parsed once into a node graph, where an alias
+is the very node it refers to; the graph is walked before anything is
+constructed, counting nodes with aliases expanded, so an alias bomb is
+rejected without ever being built.
+"""
+
+import functools
+import io
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple, Type
+
+YAML_EXTENSIONS = ('.yaml', '.yml')
+
+# List-valued fields and the limit that caps their length
+LIST_LIMITS = {'claims': 'max_claims', 'non_reproducible_claims': 'max_claims', 'instruction': 'max_steps'}
+
+
+class ParseLimits(NamedTuple):
+    """Upper bounds enforced while a submission is parsed."""
+    max_bytes: int = 5 * 1024 * 1024
+    max_claims: int = 1000
+    max_steps: int = 500
+    max_string: int = 100000
+    max_yaml_nodes: int = 200000
+    max_yaml_aliases: int = 100
+
+
+DEFAULT_LIMITS = ParseLimits()
+
+# (loader class, YAMLError) once PyYAML has been imported
+_yaml: Optional[Tuple[Type, Type[Exception]]] = None
+
+
+class ParseError(ValueError):
+    """Content is not valid JSON or YAML.
+
+    ``format`` is ``'JSON'`` or ``'YAML'`` and ``str()`` is the parser's own
+    message, so callers can report it exactly as before.
+    """
+
+    def __init__(self, format: str, error: Exception):
+        super().__init__(str(error))
+        self.format = format
+        self.error = error
+
+
+class LimitError(ValueError):
+    """Content exceeds one of the ``ParseLimits``."""
+
+
+def check_size(size: int, limits: Optional[ParseLimits]):
+    if limits is not None and size > limits.max_bytes:
+        raise LimitError(f"file is {size} bytes (limit {limits.max_bytes})")
+
+
+def _string_error(length: int, limits: ParseLimits) -> LimitError:
+    return LimitError(f"a string of {length} characters (limit {limits.max_string})")
+
+
+def _can_exceed(length: int, limits: ParseLimits) -> bool:
+    """Whether a document of ``length`` characters can break a list or string limit.
+
+    A string is never longer than the document, and a list of ``n`` items
+    takes at least ``2n - 1`` characters, so small documents skip the checks.
+    """
+    return length > limits.max_string or length > 2 * min(limits.max_claims, limits.max_steps)
+
+
+def _check_list_strings(items: list, limits: ParseLimits):
+    """Check the strings in ``items`` and in lists nested in it.
+
+    Objects are skipped: the JSON object hook has already checked them.
+    """
+    max_string = limits.max_string
+    stack = [items]
+    while stack:
+        for item in stack.pop():
+            if item.__class__ is str:
+                if len(item) > max_string:
+                    raise _string_error(len(item), limits)
+            elif item.__class__ is list:
+                stack.append(item)
+
+
+@functools.lru_cache(maxsize=None)
+def _object_hook(limits: ParseLimits, check_strings: bool):
+    max_string = limits.max_string
+    list_limits = {key: getattr(limits, name) for key, name in LIST_LIMITS.items()}
+    
+    def check_lists(obj):
+        for key, limit in list_limits.items():
+            value = obj.get(key)
+            if value.__class__ is list and len(value) > limit:
+                raise LimitError(f"'{key}' has {len(value)} items (limit {limit})")
+        return obj
+    
+    def check_all(obj):
+        for key, value in obj.items():
+            if len(key) > max_string:
+                raise _string_error(len(key), limits)
+            if isinstance(value, str):
+                if len(value) > max_string:
+                    raise _string_error(len(value), limits)
+            elif isinstance(value, list):
+                limit = list_limits.get(key)
+                if limit is not None and len(value) > limit:
+                    raise LimitError(f"'{key}' has {len(value)} items (limit {limit})")
+                _check_list_strings(value, limits)
+        return obj
+    return check_all if check_strings else check_lists
+
+
+def _yaml_support() -> Tuple[Type, Type[Exception]]:
+    global _yaml
+    if _yaml is None:
+        import yaml
+        _yaml = (getattr(yaml, 'CSafeLoader', yaml.SafeLoader), yaml.YAMLError)
+    return _yaml
+
+
+def yaml_loader_name() -> str:
+    """Return the name of the YAML loader class in use (imports PyYAML)."""
+    return _yaml_support()[0].__name__
+
+
+def _check_yaml_nodes(root, limits: ParseLimits):
+    """Walk a composed YAML node graph and raise ``LimitError`` on the first excess.
+
+    An alias is the same node object as its anchor, so its expanded size is
+    taken from the anchor's subtree, counted once.
+    """
+    from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+    nodes = aliases = 0
+    # id(node) -> node count before the node was entered, and its expanded size once left
+    entered: Dict[int, int] = {}
+    sizes: Dict[int, int] = {}
+    # (node, key it is the value of, whether the node is being left)
+    stack = [(root, None, False)]
+    while stack:
+        node, key, leaving = stack.pop()
+        ident = id(node)
+        if leaving:
+            sizes[ident] = nodes - entered[ident]
+            continue
+        alias = ident in entered
+        if alias:
+            aliases += 1
+            if aliases > limits.max_yaml_aliases:
+                raise LimitError(f"more than {limits.max_yaml_aliases} YAML aliases")
+            # An alias inside its own anchor (a recursive structure) counts as one node
+            nodes += sizes.get(ident, 1)
+        else:
+            entered[ident] = nodes
+            nodes += 1
+        if nodes > limits.max_yaml_nodes:
+            raise LimitError(f"more than {limits.max_yaml_nodes} YAML nodes with aliases expanded")
+        if alias:
+            continue
+        
+        if isinstance(node, ScalarNode):
+            if len(node.value) > limits.max_string:
+                raise _string_error(len(node.value), limits)
+            sizes[ident] = 1
+            continue
+        stack.append((node, key, True))
+        if isinstance(node, SequenceNode):
+            limit_name = LIST_LIMITS.get(key)
+            if limit_name and len(node.value) > getattr(limits, limit_name):
+                raise LimitError(f"'{key}' has more than {getattr(limits, limit_name)} items")
+            stack.extend((item, None, False) for item in reversed(node.value))
+        elif isinstance(node, MappingNode):
+            for key_node, value_node in reversed(node.value):
+                value_key = key_node.value if isinstance(key_node, ScalarNode) else None
+                stack.append((value_node, value_key, False))
+                stack.append((key_node, None, False))
+
+
+def _yaml_input(text: str, name: Optional[str]):
+    """Return what the loader reads: ``text``, or a stream named ``name`` so marks say ``in "<name>"``."""
+    if name is None:
+        return text
+    stream = io.StringIO(text)
+    stream.name = name
+    return stream
+
+
+def loads_yaml(text: str, limits: Optional[ParseLimits] = DEFAULT_LIMITS, name: Optional[str] = None) -> Any:
+    """Parse one YAML document like ``yaml.safe_load``.
+
+    ``name`` is the file the text came from, used in error messages.
+    """
+    loader_class, yaml_error = _yaml_support()
+    # Without aliases every node takes at least one character
+    check = limits is not None and (_can_exceed(len(text), limits) or len(text) > limits.max_yaml_nodes
+                                    or '*' in text)
+    if check:
+        check_size(len(text), limits)
+    try:
+        loader = loader_class(_yaml_input(text, name))
+        try:
+            node = loader.get_single_node()
+            if node is None:
+                return None
+            if check:
+                _check_yaml_nodes(node, limits)
+            return loader.construct_document(node)
+        finally:
+            loader.dispose()
+    except yaml_error as e:
+        raise ParseError('YAML', e) from e
+
+
+def loads(text: str, file_ext: str, limits: Optional[ParseLimits] = DEFAULT_LIMITS,
+          name: Optional[str] = None) -> Any:
+    """Parse ``text`` as JSON for ``.json`` and as YAML otherwise.
+
+    Raises ``LimitError`` when ``limits`` (``None`` for none) are exceeded.
+    ``name`` is the file ``text`` was read from, for YAML error messages.
+    """
+    if file_ext == '.json':
+        try:
+            if limits is None or not _can_exceed(len(text), limits):
+                return json.loads(text)
+            check_size(len(text), limits)
+            check_strings = len(text) > limits.max_string
+            data = json.loads(text, object_hook=_object_hook(limits, check_strings))
+            if check_strings and not isinstance(data, dict):
+                # A top-level array or string is not seen by the object hook
+                _check_list_strings([data], limits)
+            return data
+        except json.JSONDecodeError as e:
+            raise ParseError('JSON', e) from e
+    return loads_yaml(text, limits, name)
+
+
+def load_file(filepath: str, limits: Optional[ParseLimits] = DEFAULT_LIMITS) -> Any:
+    """Load a ``.json``, ``.yaml`` or ``.yml`` file."""
+    file_ext = Path(filepath).suffix.lower()
+    if file_ext != '.json' and file_ext not in YAML_EXTENSIONS:
+        raise ValueError(f"Unsupported file type: {file_ext}")
+    with open(filepath, 'r', encoding='utf-8') as f:
+        if limits is not None:
+            check_size(os.fstat(f.fileno()).st_size, limits)
+        return loads(f.read(), file_ext, limits, filepath)
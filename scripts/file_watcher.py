@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Report changed files under a set of directory trees.
+
+On Linux the kernel's inotify API (called through ctypes, no extra package)
+reports changes as they happen, at the cost of one watch per directory. Where
+inotify is unavailable, or with ``polling=True``, the trees are rescanned
+every ``interval`` seconds and compared by modification time and size.
+
+Both watchers return changed paths from ``read``. A path may be a directory
+when its whole content needs rescanning: a directory created or moved in, or
+after the inotify event queue overflowed.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import time
+from typing import Dict, Iterable, Iterator, Optional, Set, Tuple
+
+# inotify event bits, from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Watch directory trees with inotify; raises ``OSError`` where unsupported."""
+
+    def __init__(self, roots: Iterable[str]):
+        name = ctypes.util.find_library('c')
+        libc = ctypes.CDLL(name, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.roots = [os.path.normpath(root) for root in roots]
+        self._directories: Dict[int, str] = {}
+        try:
+            for root in self.roots:
+                self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch_tree(self, top: str):
+        for directory, _, _ in os.walk(top):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), WATCH_MASK)
+            if wd < 0:
+                error = ctypes.get_errno()
+                if error == errno.ENOSPC:
+                    raise OSError(error, "inotify watch limit reached (fs.inotify.max_user_watches)")
+                continue
+            self._directories[wd] = directory
+
+    def read(self, timeout: Optional[float] = None) -> Set[str]:
+        """Wait up to ``timeout`` seconds (None: forever) and return the changed paths."""
+        if not select.select([self.fd], [], [], timeout)[0]:
+            return set()
+        try:
+            data = os.read(self.fd, 1 << 20)
+        except BlockingIOError:
+            return set()
+        changed = set()
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were dropped, so every tree has to be rescanned
+                changed.update(self.roots)
+                continue
+            directory = self._directories.get(wd)
+            if directory is None:
+                continue
+            if mask & IN_IGNORED:
+                del self._directories[wd]
+                continue
+            if not name:
+                continue
+            path = os.path.join(directory, os.fsdecode(name))
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._watch_tree(path)
+            changed.add(path)
+        return changed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher:
+    """Watch directory trees by rescanning them every ``interval`` seconds."""
+
+    def __init__(self, roots: Iterable[str], interval: float = 1.0):
+        self.roots = [os.path.normpath(root) for root in roots]
+        self.interval = interval
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        snapshot = {}
+        stack = list(self.roots)
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        else:
+                            stat = entry.stat()
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+                    except OSError:
+                        continue
+        return snapshot
+
+    def read(self, timeout: Optional[float] = None) -> Set[str]:
+        """Wait up to ``timeout`` seconds (None: until something changes) and return the changed paths."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = self.interval if deadline is None else min(self.interval, deadline - time.monotonic())
+            if wait > 0:
+                time.sleep(wait)
+            snapshot = self._scan()
+            changed = {path for path, state in snapshot.items() if self._snapshot.get(path) != state}
+            changed.update(path for path in self._snapshot if path not in snapshot)
+            self._snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+
+def open_watcher(roots: Iterable[str], polling: bool = False, interval: float = 1.0):
+    """Return an inotify watcher, or a polling one if requested or inotify is unavailable."""
+    roots = list(roots)
+    if not polling:
+        try:
+            return InotifyWatcher(roots)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(roots, interval)
+
+
+def debounced(watcher, delay: float = 0.2) -> Iterator[Set[str]]:
+    """Yield sets of changed paths, each once ``delay`` seconds pass without a change.
+
+    A burst of events (an editor's save, a ``git checkout``) becomes one set.
+    """
+    while True:
+        changed = watcher.read(None)
+        while changed:
+            more = watcher.read(delay)
+            if not more:
+                break
+            changed |= more
+        if changed:
+            yield changed
@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Normalized identifier index for duplicate-paper detection.
+
+DOIs, arXiv IDs and paper URLs are reduced to canonical keys such as
+``doi:10.1038/s41563-023-01234-5`` or ``arxiv:2301.12345``. Each key maps to
+the organized submission paths that carry it. The index is split into JSON
+shards by a hash prefix of the key, so a lookup loads one small shard no
+matter how large the corpus grows, and updates rewrite only touched shards.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+from urllib.parse import urlsplit
+
+_DOI = re.compile(r'(10\.\d{4,9}/\S+)', re.IGNORECASE)
+_ARXIV_NEW = re.compile(r'(?<![\d.])(\d{4}\.\d{4,5})(v\d+)?(?![\d])', re.IGNORECASE)
+_ARXIV_OLD = re.compile(r'([a-z\-]+(?:\.[a-z]{2})?/\d{7})(v\d+)?', re.IGNORECASE)
+_ARXIV_HOSTS = ('arxiv.org', 'export.arxiv.org')
+
+
+def _arxiv_key(text: str) -> Optional[str]:
+    match = _ARXIV_NEW.search(text) or _ARXIV_OLD.search(text)
+    return f"arxiv:{match.group(1).lower()}" if match else None
+
+
+def arxiv_version(value: Any) -> Optional[str]:
+    """Return the version suffix of an arXiv ID or URL, which keys leave out.
+
+    >>> arxiv_version('https://arxiv.org/abs/2301.12345v2')
+    'v2'
+    """
+    match = _ARXIV_NEW.search(str(value or '')) or _ARXIV_OLD.search(str(value or ''))
+    return match.group(2).lower() if match and match.group(2) else None
+
+
+def normalize_identifier(value: Any) -> Optional[str]:
+    """Return the canonical index key for a DOI, arXiv ID or URL.
+
+    >>> normalize_identifier('https://doi.org/10.1038/S41563-023-01234-5')
+    'doi:10.1038/s41563-023-01234-5'
+    >>> normalize_identifier('arXiv:2301.12345v2')
+    'arxiv:2301.12345'
+    """
+    text = str(value or '').strip()
+    if not text:
+        return None
+    lowered = text.lower()
+
+    doi = _DOI.search(text)
+    if doi and ('doi' in lowered or lowered.startswith('10.')):
+        return f"doi:{doi.group(1).rstrip('.').lower()}"
+
+    if lowered.startswith(('http://', 'https://', 'www.')):
+        parts = urlsplit(text if '://' in text else f"https://{text}")
+        host = parts.netloc.lower()
+        if host.startswith('www.'):
+            host = host[4:]
+        if host in _ARXIV_HOSTS:
+            key = _arxiv_key(parts.path)
+            if key:
+                return key
+        if doi:
+            return f"doi:{doi.group(1).rstrip('.').lower()}"
+        path = parts.path.rstrip('/')
+        return f"url:{host}{path}"
+
+    if lowered.startswith('arxiv:') or _ARXIV_NEW.fullmatch(lowered) or _ARXIV_OLD.fullmatch(lowered):
+        key = _arxiv_key(lowered)
+        if key:
+            return key
+
+    return f"id:{' '.join(lowered.split())}"
+
+
+def submission_keys(data: Dict[str, Any]) -> Set[str]:
+    """Return the index keys for a submission's identifier and paper URL."""
+    keys = set()
+    for field in ('identifier', 'paper_pdf'):
+        if data.get(field):
+            key = normalize_identifier(data[field])
+            if key:
+                keys.add(key)
+    return keys
+
+
+class IdentifierIndex:
+    """Sharded on-disk map from identifier key to organized submission paths.
+
+    Paths are stored relative to ``root`` (by default the directory holding
+    the index). Shards are loaded lazily and cached; ``flush`` atomically
+    rewrites only the shards changed since the last flush.
+    """
+
+    def __init__(self, index_dir: str, root: str = None, prefix_length: int = 2):
+        self.index_dir = Path(index_dir)
+        self.root = Path(root) if root else self.index_dir.parent
+        meta_path = self.index_dir / 'index.json'
+        if meta_path.exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                prefix_length = json.load(f)['prefix_length']
+        self.prefix_length = prefix_length
+        self._shards: Dict[str, Dict[str, List[str]]] = {}
+        self._dirty: Set[str] = set()
+
+    def exists(self) -> bool:
+        return (self.index_dir / 'index.json').exists()
+
+    def _shard_name(self, key: str) -> str:
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:self.prefix_length]
+
+    def _shard(self, name: str) -> Dict[str, List[str]]:
+        shard = self._shards.get(name)
+        if shard is None:
+            try:
+                with open(self.index_dir / f"{name}.json", 'r', encoding='utf-8') as f:
+                    shard = json.load(f)
+            except FileNotFoundError:
+                shard = {}
+            self._shards[name] = shard
+        return shard
+
+    def lookup(self, key: str) -> List[str]:
+        """Return the stored paths for ``key`` (relative to the root)."""
+        if not key:
+            return []
+        return list(self._shard(self._shard_name(key)).get(key, ()))
+
+    def add(self, key: str, path: str):
+        name = self._shard_name(key)
+        paths = self._shard(name).setdefault(key, [])
+        if path not in paths:
+            paths.append(path)
+            self._dirty.add(name)
+
+    def remove(self, key: str, path: str):
+        name = self._shard_name(key)
+        shard = self._shard(name)
+        if path in shard.get(key, ()):
+            shard[key].remove(path)
+            if not shard[key]:
+                del shard[key]
+            self._dirty.add(name)
+
+    def remove_paths(self, paths: Iterable[str]):
+        """Drop every key's reference to ``paths``, e.g. files deleted from the tree.
+
+        The keys of a deleted file are unknown, so this scans all shards.
+        """
+        paths = set(paths)
+        if not paths:
+            return
+        for shard_path in sorted(self.index_dir.glob('*.json')):
+            if shard_path.name == 'index.json':
+                continue
+            name = shard_path.stem
+            shard = self._shard(name)
+            for key in [key for key, stored in shard.items() if any(path in paths for path in stored)]:
+                shard[key] = [path for path in shard[key] if path not in paths]
+                if not shard[key]:
+                    del shard[key]
+                self._dirty.add(name)
+
+    def flush(self):
+        """Write changed shards and the index metadata."""
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        for name in sorted(self._dirty):
+            self._write_json(self.index_dir / f"{name}.json", self._shards[name])
+        self._dirty.clear()
+        if not self.exists():
+            self._write_json(self.index_dir / 'index.json', {'prefix_length': self.prefix_length})
+
+    def rename_paths(self, moves: Dict[str, str]):
+        """Replace every stored path ``old`` by ``moves[old]`` in all shards."""
+        for shard_path in sorted(self.index_dir.glob('*.json')):
+            if shard_path.name == 'index.json':
+                continue
+            name = shard_path.stem
+            for paths in self._shard(name).values():
+                if any(path in moves for path in paths):
+                    paths[:] = [moves.get(path, path) for path in paths]
+                    self._dirty.add(name)
+        self.flush()
+
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+        os.replace(tmp, path)
+
+    def rebuild(self, files: Iterable[Path], load) -> int:
+        """Index every file in ``files`` using ``load(path) -> data``."""
+        count = 0
+        for path in files:
+            data = load(str(path))
+            if not isinstance(data, dict):
+                continue
+            relative = path.relative_to(self.root).as_posix()
+            for key in submission_keys(data):
+                self.add(key, relative)
+            count += 1
+        self.flush()
+        return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query or rebuild the identifier index.")
+    parser.add_argument('command', choices=['lookup', 'rebuild'])
+    parser.add_argument('values', nargs='*', help="identifiers, DOIs or URLs to look up")
+    parser.add_argument('--root', default='data/organized', help="organized submissions directory")
+    parser.add_argument('--index', default=None, help="index directory (default: <root>/.identifier_index)")
+    args = parser.parse_args()
+
+    index_dir = args.index or os.path.join(args.root, '.identifier_index')
+    if args.command == 'rebuild':
+        from organize_by_username import iter_organized_files, load_data_file
+        if os.path.isdir(index_dir):
+            for shard in Path(index_dir).glob('*.json'):
+                shard.unlink()
+        index = IdentifierIndex(index_dir, args.root)
+        count = index.rebuild(iter_organized_files(Path(args.root)), load_data_file)
+        print(f"Indexed {count} submission(s) into {index_dir}")
+        return 0
+
+    index = IdentifierIndex(index_dir, args.root)
+    found = False
+    for value in args.values:
+        key = normalize_identifier(value)
+        paths = index.lookup(key)
+        found = found or bool(paths)
+        print(f"{value} -> {key}: {', '.join(paths) if paths else 'not found'}")
+    return 0 if found else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
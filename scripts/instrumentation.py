@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Opt-in per-phase timing and counters for the validation and organizer scripts.
+
+Call sites always go through the module-level ``current`` object. By default
+it is a no-op instance whose methods do nothing, so disabled instrumentation
+costs one attribute lookup and an empty call. ``enable()`` swaps in a
+recording ``Instrumentation`` that can be written out as a JSON report.
+"""
+
+import heapq
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Timer:
+    __slots__ = ('_owner', '_name', '_start')
+
+    def __init__(self, owner: 'Instrumentation', name: str):
+        self._owner = owner
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._owner.add_time(self._name, time.perf_counter() - self._start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class NullInstrumentation:
+    """Instrumentation that records nothing."""
+
+    enabled = False
+
+    def phase(self, name: str):
+        return _NULL_TIMER
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        pass
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def record_file(self, path: str, seconds: float):
+        pass
+
+    def drain(self) -> Optional[Dict[str, Any]]:
+        return None
+
+    def merge(self, snapshot: Optional[Dict[str, Any]]):
+        pass
+
+
+class Instrumentation(NullInstrumentation):
+    """Record wall time and calls per phase, counters and the slowest files."""
+
+    enabled = True
+
+    def __init__(self, slowest: int = 10):
+        self.slowest = slowest
+        self.started = time.perf_counter()
+        self._reset()
+
+    def _reset(self):
+        self.phases: Dict[str, List[float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.files: List[Tuple[float, str]] = []
+
+    def phase(self, name: str):
+        """Context manager timing one call of ``name``."""
+        return _Timer(self, name)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1):
+        entry = self.phases.get(name)
+        if entry is None:
+            self.phases[name] = [seconds, calls]
+        else:
+            entry[0] += seconds
+            entry[1] += calls
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def record_file(self, path: str, seconds: float):
+        item = (seconds, str(path))
+        if len(self.files) < self.slowest:
+            heapq.heappush(self.files, item)
+        elif item > self.files[0]:
+            heapq.heapreplace(self.files, item)
+
+    def drain(self) -> Dict[str, Any]:
+        """Return and clear what was recorded (used to ship worker stats)."""
+        snapshot = {'phases': self.phases, 'counters': self.counters, 'files': self.files}
+        self._reset()
+        return snapshot
+
+    def merge(self, snapshot: Optional[Dict[str, Any]]):
+        """Fold a ``drain()`` snapshot from another process into this one."""
+        if not snapshot:
+            return
+        for name, (seconds, calls) in snapshot['phases'].items():
+            self.add_time(name, seconds, calls)
+        for name, amount in snapshot['counters'].items():
+            self.count(name, amount)
+        for seconds, path in snapshot['files']:
+            self.record_file(path, seconds)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            'wall_seconds': round(time.perf_counter() - self.started, 6),
+            'phases': {
+                name: {'seconds': round(seconds, 6), 'calls': calls}
+                for name, (seconds, calls) in sorted(self.phases.items(), key=lambda item: -item[1][0])
+            },
+            'counters': dict(sorted(self.counters.items())),
+            'slowest_files': [
+                {'path': path, 'seconds': round(seconds, 6)}
+                for seconds, path in sorted(self.files, reverse=True)
+            ],
+        }
+
+    def write_report(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.report(), f, indent=2)
+
+
+current = NullInstrumentation()
+
+
+def enable(slowest: int = 10) -> Instrumentation:
+    """Start recording; returns the active instance."""
+    global current
+    current = Instrumentation(slowest)
+    return current
+
+
+def disable():
+    global current
+    current = NullInstrumentation()
+
+
+class profiled:
+    """Enable instrumentation and/or cProfile for the duration of a CLI run.
+
+    The JSON report is written to ``report_path`` and the cProfile dump (of
+    the main process only) to ``cprofile_path`` when the block exits.
+    """
+
+    def __init__(self, report_path: str = None, cprofile_path: str = None):
+        self.report_path = report_path
+        self.cprofile_path = cprofile_path
+        self._profiler = None
+
+    def __enter__(self):
+        if self.report_path:
+            enable()
+        if self.cprofile_path:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        return current
+
+    def __exit__(self, *exc):
+        if self._profiler is not None:
+            self._profiler.disable()
+            self._profiler.dump_stats(self.cprofile_path)
+        if self.report_path:
+            current.write_report(self.report_path)
+            disable()
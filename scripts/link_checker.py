@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Check that the URLs in submissions are reachable.
+
+All URLs of a batch are checked concurrently from one asyncio event loop.
+Requests run on a thread pool with ``http.client``; each host has its own
+pool of keep-alive connections and its own concurrency limit, so a batch
+with hundreds of GitHub links opens a few connections to github.com instead
+of hundreds. A ``HEAD`` that fails is retried as a ``GET``, since many
+servers do not implement ``HEAD``, and redirects are followed.
+
+Results are kept in a persistent JSON cache with a time to live, so a URL
+shared by many submissions (the same code repository, say) is fetched once
+per TTL. Only 404 and 410 count as a dead link: other HTTP errors (403 from
+bot blocking, 429 rate limits, 5xx outages) and network failures such as
+timeouts say nothing about the link itself, so they are never cached.
+"""
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+# Submission fields holding a URL
+URL_FIELDS = ('paper_pdf', 'code_url', 'data_url')
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+
+# Statuses that mean the link itself is gone
+DEAD_STATUSES = (404, 410)
+
+USER_AGENT = 'mat-data-link-checker/1.0'
+
+
+class LinkResult(NamedTuple):
+    """Outcome of checking one URL.
+
+    ``status`` is the final HTTP status after redirects, or None when the
+    server could not be reached, in which case ``error`` says why.
+    """
+    url: str
+    status: Optional[int]
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and self.status < 400
+
+    @property
+    def dead(self) -> bool:
+        return self.status in DEAD_STATUSES
+
+
+class LinkCache:
+    """Persistent map of URL to its last ``LinkResult``, stored as one JSON file.
+
+    Reachable URLs are trusted for ``ttl`` seconds, dead ones for
+    ``failure_ttl`` so a fixed link is noticed sooner. Other failures are
+    not stored.
+    """
+
+    def __init__(self, path: str, ttl: float = 7 * 24 * 3600, failure_ttl: float = 3600):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.failure_ttl = failure_ttl
+        self.hits = 0
+        self.misses = 0
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+        self.dirty = False
+
+    def get(self, url: str) -> Optional[LinkResult]:
+        entry = self.entries.get(url)
+        if entry is not None:
+            status, checked = entry
+            ttl = self.ttl if status < 400 else self.failure_ttl
+            if time.time() - checked <= ttl:
+                self.hits += 1
+                return LinkResult(url, status)
+        self.misses += 1
+        return None
+
+    def put(self, result: LinkResult):
+        if result.ok or result.dead:
+            self.entries[result.url] = [result.status, time.time()]
+            self.dirty = True
+
+    def save(self):
+        """Write the cache atomically, dropping expired entries."""
+        if not self.dirty:
+            return
+        now = time.time()
+        longest = max(self.ttl, self.failure_ttl)
+        entries = {url: entry for url, entry in self.entries.items() if now - entry[1] <= longest}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, sort_keys=True)
+            os.replace(tmp, self.path)
+        except OSError:
+            # A cache that cannot be written only costs speed, never correctness
+            return
+        self.dirty = False
+
+
+class _HostPool:
+    """Idle keep-alive connections and the concurrency limit of one host."""
+
+    def __init__(self, limit: int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.idle: List[http.client.HTTPConnection] = []
+
+
+class LinkChecker:
+    """Check many URLs concurrently.
+
+    ``concurrency`` caps requests in flight overall and ``per_host`` per
+    host; ``timeout`` applies to connecting and to each socket read.
+    """
+
+    def __init__(self, cache: Optional[LinkCache] = None, concurrency: int = 32, per_host: int = 4,
+                 timeout: float = 10.0, max_redirects: int = 5):
+        self.cache = cache
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.max_redirects = max_redirects
+        self.requests = 0
+        self.connections = 0
+
+    def check(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        """Check ``urls`` and return a result for each distinct URL."""
+        return asyncio.run(self.check_async(urls))
+
+    async def check_async(self, urls: Iterable[str]) -> Dict[str, LinkResult]:
+        results = {}
+        pending = []
+        for url in dict.fromkeys(urls):
+            cached = self.cache.get(url) if self.cache is not None else None
+            if cached is not None:
+                results[url] = cached
+            else:
+                pending.append(url)
+
+        if pending:
+            self._hosts: Dict[Tuple[str, str], _HostPool] = {}
+            self._slots = asyncio.Semaphore(self.concurrency)
+            with ThreadPoolExecutor(max_workers=self.concurrency) as self._executor:
+                try:
+                    checked = await asyncio.gather(*(self._check_url(url) for url in pending))
+                finally:
+                    for pool in self._hosts.values():
+                        for connection in pool.idle:
+                            connection.close()
+            for result in checked:
+                results[result.url] = result
+                if self.cache is not None:
+                    self.cache.put(result)
+        if self.cache is not None:
+            self.cache.save()
+        return results
+
+    async def _check_url(self, url: str) -> LinkResult:
+        target = url
+        try:
+            for _ in range(self.max_redirects + 1):
+                status, location = await self._fetch(target, 'HEAD')
+                if status >= 400:
+                    # Plenty of servers reject or mishandle HEAD
+                    status, location = await self._fetch(target, 'GET')
+                if status not in REDIRECT_STATUSES or not location:
+                    return LinkResult(url, status)
+                target = urljoin(target, location)
+            return LinkResult(url, None, f"more than {self.max_redirects} redirects")
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            return LinkResult(url, None, str(e) or type(e).__name__)
+
+    async def _fetch(self, url: str, method: str) -> Tuple[int, Optional[str]]:
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            raise ValueError(f"not an http(s) URL: {url}")
+        key = (parts.scheme, parts.netloc)
+        pool = self._hosts.get(key)
+        if pool is None:
+            pool = self._hosts[key] = _HostPool(self.per_host)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+
+        loop = asyncio.get_running_loop()
+        # Take the host slot first so tasks queued on a busy host hold no global slot
+        async with pool.semaphore, self._slots:
+            self.requests += 1
+            while pool.idle:
+                # A kept-alive connection may have been closed by the server meanwhile
+                connection = pool.idle.pop()
+                try:
+                    return await loop.run_in_executor(self._executor, self._request,
+                                                      pool, connection, method, path)
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    continue
+            connection = self._connect(parts.scheme, parts.netloc)
+            return await loop.run_in_executor(self._executor, self._request, pool, connection, method, path)
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        self.connections += 1
+        if scheme == 'https':
+            return http.client.HTTPSConnection(netloc, timeout=self.timeout)
+        return http.client.HTTPConnection(netloc, timeout=self.timeout)
+
+    def _request(self, pool: _HostPool, connection: http.client.HTTPConnection, method: str,
+                 path: str) -> Tuple[int, Optional[str]]:
+        """Send one request on a worker thread; return (status, Location)."""
+        try:
+            connection.request(method, path, headers={'User-Agent': USER_AGENT, 'Accept': '*/*'})
+            response = connection.getresponse()
+            status, location = response.status, response.getheader('Location')
+            if method == 'HEAD' and not response.will_close:
+                response.read()
+                # list.append is atomic, so the event loop may pop it concurrently
+                pool.idle.append(connection)
+            else:
+                # Never download a GET body just to keep the connection
+                response.close()
+                connection.close()
+            return status, location
+        except BaseException:
+            connection.close()
+            raise
+
+
+def submission_urls(data) -> List[Tuple[str, str]]:
+    """Return ``(field, url)`` for every URL field of a parsed submission."""
+    if not isinstance(data, dict):
+        return []
+    urls = []
+    for field in URL_FIELDS:
+        value = data.get(field)
+        if isinstance(value, str) and value.strip().startswith(('http://', 'https://')):
+            urls.append((field, value.strip()))
+    return urls
+
+
+def describe(result: LinkResult) -> str:
+    """Render a result as ``HTTP 404`` or the network error."""
+    return f"HTTP {result.status}" if result.status is not None else result.error
+
+
+def main():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from data_loader import load_file
+    from validate_submission import collect_submission_paths
+
+    parser = argparse.ArgumentParser(description="Check that the URLs in submissions are reachable.")
+    parser.add_argument('inputs', nargs='+', help="submission files, directories or '-' for a list on stdin")
+    parser.add_argument('--cache', default='.link_cache.json', help="TTL result cache (default: %(default)s)")
+    parser.add_argument('--timeout', type=float, default=10.0)
+    parser.add_argument('--per-host', type=int, default=4)
+    options = parser.parse_args()
+
+    urls = {}
+    for path in collect_submission_paths(options.inputs):
+        try:
+            data = load_file(path)
+        except Exception as e:
+            print(f"⚠️  {path}: {e}")
+            continue
+        for field, url in submission_urls(data):
+            urls.setdefault(url, []).append(f"{path}:{field}")
+
+    checker = LinkChecker(LinkCache(options.cache), per_host=options.per_host, timeout=options.timeout)
+    failed = unchecked = 0
+    for url, result in checker.check(urls).items():
+        if result.dead:
+            failed += 1
+            print(f"❌ {url} ({describe(result)}) in {', '.join(urls[url])}")
+        elif not result.ok:
+            unchecked += 1
+            print(f"⚠️  {url} could not be checked ({describe(result)}) in {', '.join(urls[url])}")
+    print(f"\n📊 {len(urls)} URLs checked, {failed} dead, {unchecked} could not be checked, "
+          f"{checker.requests} requests on {checker.connections} connections")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
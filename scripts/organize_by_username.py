@@ -3,139 +3,682 @@
 Organize submission files by username after merge.
 """
 
+import argparse
+import errno
 import json
-import yaml
 import os
 import shutil
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import canonical
+import instrumentation
+from data_loader import load_file
+from claim_index import ClaimIndex, submission_claims
+from identifier_index import IdentifierIndex, submission_keys
+from organize_journal import JournalWriter, OrganizeJournal, file_sha256
+from organized_layout import FLAT, Layout, load_layout
+from submission_schema import Issue
+from validate_submission import VALIDATOR_VERSION, SubmissionValidator
+
+# Example files that should always be preserved in the source directory
+PRESERVED_FILES = ('example_submission_in.json', 'we_also_accept_submission_in.yaml')
+
+
+def _load(filepath: str) -> Dict[str, Any]:
+    return load_file(filepath)
 
 
 def load_data_file(filepath: str) -> Dict[str, Any]:
     """Load JSON or YAML file and return data."""
-    file_ext = Path(filepath).suffix.lower()
-    
     try:
-        if file_ext == '.json':
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        elif file_ext in ['.yaml', '.yml']:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
-        else:
-            raise ValueError(f"Unsupported file type: {file_ext}")
+        return _load(filepath)
     except Exception as e:
         print(f"Error loading {filepath}: {e}")
         return None
 
 
-def organize_files(source_dir: str, target_dir: str):
-    """Organize files from source directory to target directory by username."""
-    source_path = Path(source_dir)
-    target_path = Path(target_dir)
-    
-    # Create target directory if it doesn't exist
-    target_path.mkdir(parents=True, exist_ok=True)
-    
-    # Track processed files
-    processed = 0
-    errors = 0
-    
-    # Process all JSON and YAML files in source directory
+class NameIndex:
+    """Per-run index of the file names present in each user directory.
+
+    Each directory is listed once, on first use. Afterwards every collision-free
+    name is resolved from memory: the next ``stem_<n>`` counter is remembered
+    per (directory, stem, suffix), so a user with thousands of same-named files
+    costs O(1) per file instead of one ``exists()`` stat per candidate name.
+    In a sharded layout each candidate name is looked up in its own shard
+    directory, so only the shards a run touches are listed.
+    """
+
+    def __init__(self):
+        self._names: Dict[Path, Set[str]] = {}
+        self._next_counter: Dict[Tuple[Path, str, str], int] = {}
+
+    def _names_in(self, directory: Path) -> Set[str]:
+        names = self._names.get(directory)
+        if names is None:
+            try:
+                names = {entry.name for entry in os.scandir(directory)}
+            except FileNotFoundError:
+                names = set()
+            self._names[directory] = names
+        return names
+
+    def reserve(self, directory: Path, filename: str, layout: Layout = FLAT) -> Path:
+        """Return a free path for ``filename`` in ``directory`` and mark it taken.
+
+        With a sharded ``layout``, ``directory`` is a user directory and the
+        path is in the shard of the chosen name.
+        """
+        name = filename
+        names = self._names_in(layout.directory(directory, name))
+        if name in names:
+            stem, suffix = Path(filename).stem, Path(filename).suffix
+            key = (directory, stem, suffix)
+            counter = self._next_counter.get(key, 1)
+            while True:
+                name = f"{stem}_{counter}{suffix}"
+                names = self._names_in(layout.directory(directory, name))
+                if name not in names:
+                    break
+                counter += 1
+            self._next_counter[key] = counter + 1
+        names.add(name)
+        return layout.directory(directory, name) / name
+
+    def release(self, path: Path):
+        """Forget a reserved path whose move failed."""
+        self._names_in(path.parent).discard(path.name)
+
+
+def move_file(source: Path, target: Path):
+    """Move a file with an atomic rename, copying only across filesystems."""
+    try:
+        os.rename(source, target)
+        return
+    except OSError as e:
+        if e.errno != errno.EXDEV:
+            raise
+    # Copy next to the target and rename into place so readers never see a
+    # partially written file, then drop the source.
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.', suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copy2(source, tmp)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    os.remove(source)
+
+
+def write_file(target: Path, content: bytes):
+    """Write ``content`` to ``target`` atomically."""
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, target)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def iter_submission_files(source_path: Path) -> Iterator[Path]:
+    """Yield submission files under ``source_path``, skipping preserved examples."""
     for filepath in source_path.rglob('*'):
         # Skip .gitkeep and example files
         if filepath.name == '.gitkeep':
             continue
         # Skip specific example files that should always be preserved
-        if filepath.name in ['example_submission_in.json', 'we_also_accept_submission_in.yaml']:
+        if filepath.name in PRESERVED_FILES:
             print(f"Skipping preserved example file: {filepath}")
             continue
         # Also skip any file with 'example_submission' in the name for backwards compatibility
         if 'example_submission' in filepath.stem.lower():
             print(f"Skipping example file: {filepath}")
             continue
-            
         if filepath.suffix.lower() in ['.json', '.yaml', '.yml']:
-            print(f"Processing: {filepath}")
-            
-            # Load data to extract username
-            data = load_data_file(str(filepath))
-            if not data:
-                errors += 1
-                continue
-            
-            # Extract username
-            username = data.get('username', '').strip()
-            if not username:
-                print(f"  ⚠️  No username found in {filepath}")
-                errors += 1
-                continue
-            
-            # Sanitize username for directory name
-            safe_username = "".join(c for c in username if c.isalnum() or c in '-_')
-            if not safe_username:
-                print(f"  ⚠️  Invalid username: {username}")
-                errors += 1
-                continue
-            
-            # Create user directory
-            user_dir = target_path / safe_username
-            user_dir.mkdir(exist_ok=True)
-            
+            yield filepath
+
+
+def iter_organized_files(target_path: Path) -> Iterator[Path]:
+    """Yield every organized submission file under ``target_path``.
+
+    Hidden entries (the journal and indexes kept next to the user
+    directories) are skipped.
+    """
+    for user_dir in sorted(target_path.iterdir()):
+        if not user_dir.is_dir() or user_dir.name.startswith('.'):
+            continue
+        for filepath in sorted(user_dir.rglob('*')):
+            if filepath.is_file() and not filepath.name.startswith('.'):
+                yield filepath
+
+
+class ResolvedFile(NamedTuple):
+    """A loaded submission and what organizing it needs."""
+    filepath: Path
+    # Sanitized username; None when the file cannot be organized
+    username: Optional[str]
+    keys: Set[str]
+    messages: List[str]
+    payload: Optional[bytes]
+    claims: list
+    # Validation failures of a rejected file (empty unless validating)
+    issues: list
+    # Deduplication hash of the canonical form (see ``canonical.encode``)
+    content_hash: Optional[str] = None
+
+
+def resolve_username(filepath: Path, canonical_json: bool = False,
+                     validator: Optional[SubmissionValidator] = None) -> ResolvedFile:
+    """Load a submission and return a ``ResolvedFile``.
+
+    ``username`` is None when the file cannot be organized; the reason is in
+    ``messages``. ``keys`` are the submission's identifier index keys and
+    ``claims`` its claim texts for the claim index. With ``canonical_json``,
+    ``payload`` is the submission serialized in canonical form and
+    ``content_hash`` its deduplication hash, otherwise both are None. With
+    a ``validator``, the file is validated while it is loaded (one read,
+    one parse) and an invalid file is rejected with its ``issues``. Nothing is printed, so this is safe to run in a worker.
+    """
+    messages = [f"Processing: {filepath}"]
+    instr = instrumentation.current
+    
+    def rejected(message: str, issues: list = ()) -> ResolvedFile:
+        messages.append(message)
+        return ResolvedFile(filepath, None, set(), messages, None, [], list(issues))
+    
+    if validator is not None:
+        # Reads, parses and checks the file; the parsed data is kept
+        is_valid = validator.validate_file(str(filepath))[0]
+        if not is_valid:
+            return rejected(f"  ❌ Invalid submission ({len(validator.errors)} error(s)):", validator.issues)
+        data = validator.data
+    else:
+        try:
+            start = time.perf_counter()
+            data = _load(str(filepath))
+            if instr.enabled:
+                elapsed = time.perf_counter() - start
+                instr.add_time('parse', elapsed)
+                instr.record_file(str(filepath), elapsed)
+                instr.count('bytes_read', filepath.stat().st_size)
+        except Exception as e:
+            return rejected(f"Error loading {filepath}: {e}")
+    
+    # Extract username
+    username = str(data.get('username') or '').strip() if isinstance(data, dict) else ''
+    if not username:
+        return rejected(f"  ⚠️  No username found in {filepath}")
+    
+    # Sanitize username for directory name
+    safe_username = "".join(c for c in username if c.isalnum() or c in '-_')
+    if not safe_username:
+        return rejected(f"  ⚠️  Invalid username: {username}")
+    
+    payload = content_hash = None
+    if canonical_json:
+        try:
+            payload, content_hash = canonical.encode(data)
+        except (TypeError, ValueError) as e:
+            return rejected(f"  ⚠️  Cannot convert {filepath} to canonical JSON: {e}")
+    
+    return ResolvedFile(filepath, safe_username, submission_keys(data), messages, payload,
+                        submission_claims(data), [], content_hash)
+
+
+def organize_user(target_dir: str, safe_username: str, filepaths: List[Path],
+                  hashes: List[str] = None, journal_path: str = None, payloads: List[bytes] = None,
+                  provenance_dir: str = None, layout: Layout = FLAT
+                  ) -> Tuple[int, int, List[str], List[Tuple[str, str]]]:
+    """Move one user's files into their directory.
+
+    Each user directory is owned by exactly one call, so names can be resolved
+    without locks. With ``journal_path`` every move is bracketed by journal
+    records keyed by the matching entry of ``hashes``. With ``payloads``, the
+    matching canonical JSON is written as ``<stem>.json`` instead of moving
+    the file, and the original is moved under ``provenance_dir`` (or deleted
+    without one). Files are placed in the shards of ``layout``. Returns
+    ``(processed, errors, messages, moved)`` where ``moved`` holds the
+    ``(sha256, relative_target, source)`` of each completed move.
+    """
+    processed = 0
+    errors = 0
+    messages = []
+    moved = []
+    instr = instrumentation.current
+    name_index = NameIndex()
+    writer = JournalWriter(journal_path) if journal_path else None
+    
+    # Create user directory
+    user_dir = Path(target_dir) / safe_username
+    user_dir.mkdir(exist_ok=True)
+    provenance_user_dir = None
+    if payloads and provenance_dir:
+        provenance_user_dir = Path(provenance_dir) / safe_username
+        provenance_user_dir.mkdir(parents=True, exist_ok=True)
+    
+    try:
+        for i, (filepath, sha256) in enumerate(zip(filepaths, hashes or [None] * len(filepaths))):
+            payload = payloads[i] if payloads else None
+            filename = filepath.name if payload is None else f"{filepath.stem}.json"
             # Generate unique filename if needed
-            target_file = user_dir / filepath.name
-            counter = 1
-            while target_file.exists():
-                stem = filepath.stem
-                suffix = filepath.suffix
-                target_file = user_dir / f"{stem}_{counter}{suffix}"
-                counter += 1
+            with instr.phase('name_probe'):
+                target_file = name_index.reserve(user_dir, filename, layout)
+            relative = layout.relative(safe_username, target_file.name)
+            if writer:
+                with instr.phase('journal'):
+                    writer.write('begin', sha256, relative, safe_username)
             
             # Move file
             try:
-                shutil.copy2(str(filepath), str(target_file))
-                os.remove(str(filepath))
-                print(f"  ✅ Moved to: {target_file}")
+                with instr.phase('move'):
+                    if layout.shard_width:
+                        target_file.parent.mkdir(exist_ok=True)
+                    if payload is None:
+                        move_file(filepath, target_file)
+                    else:
+                        write_file(target_file, payload)
+                        if provenance_user_dir is not None:
+                            # Named after the canonical file so the pair is easy to match up
+                            move_file(filepath, provenance_user_dir / f"{target_file.stem}{filepath.suffix}")
+                        else:
+                            os.remove(filepath)
+                messages.append(f"  ✅ Moved to: {target_file}")
                 processed += 1
             except Exception as e:
-                print(f"  ❌ Error moving file: {e}")
+                name_index.release(target_file)
+                messages.append(f"  ❌ Error moving file: {e}")
                 errors += 1
+                if writer:
+                    writer.write('abort', sha256)
+                continue
+            if writer:
+                with instr.phase('journal'):
+                    writer.write('done', sha256, relative, safe_username)
+            moved.append((sha256, relative, filepath))
+    finally:
+        if writer:
+            writer.close()
+    
+    return processed, errors, messages, moved
+
+
+def _organize_user_task(args):
+    return organize_user(*args)
+
+
+# Per-process validator for the fused validate-and-organize pipeline
+_worker_validator = None
+
+
+def _init_worker(instrument: bool, validate: bool = False, required_fields: List[str] = None):
+    global _worker_validator
+    if instrument:
+        # Start from a fresh recorder; a forked worker inherits the parent's
+        instrumentation.enable()
+    _worker_validator = SubmissionValidator(required_fields) if validate else None
+
+
+def _resolve_in_worker(args):
+    # Worker timings travel back with each result (None when disabled)
+    return resolve_username(*args, validator=_worker_validator), instrumentation.current.drain()
+
+
+def _organize_user_in_worker(args):
+    return organize_user(*args), instrumentation.current.drain()
+
+
+def _merge_timings(results):
+    for result, timings in results:
+        instrumentation.current.merge(timings)
+        yield result
+
+
+def _open_journal(journal_path: str, target_path: Path) -> Tuple[OrganizeJournal, Set[str]]:
+    """Open the journal; also returns the hashes of interrupted moves it completed."""
+    journal = OrganizeJournal(journal_path)
+    if not journal.exists():
+        print(f"Creating organize journal: {journal_path}")
+        journal.bootstrap(target_path)
+        return journal, set()
+    return journal, journal.recover(target_path)
+
+
+def _open_identifier_index(index_dir: str, target_path: Path) -> IdentifierIndex:
+    index = IdentifierIndex(index_dir, str(target_path))
+    if not index.exists():
+        print(f"Creating identifier index: {index_dir}")
+        index.rebuild(iter_organized_files(target_path), load_data_file)
+    return index
+
+
+def _open_claim_index(index_path: str, target_path: Path) -> ClaimIndex:
+    index = ClaimIndex(index_path, str(target_path))
+    if not index.exists():
+        print(f"Creating claim index: {index_path}")
+        index.rebuild(iter_organized_files(target_path), load_data_file)
+    return index
+
+
+def quarantine_file(filepath: Path, quarantine_path: Path, issues: list, name_index: NameIndex) -> Path:
+    """Move a rejected submission into ``quarantine_path`` with a ``<name>.issues.json`` report."""
+    quarantine_path.mkdir(parents=True, exist_ok=True)
+    target = name_index.reserve(quarantine_path, filepath.name)
+    report = {
+        'source': filepath.as_posix(),
+        'validator_version': VALIDATOR_VERSION,
+        'quarantined_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'errors': [issue._asdict() for issue in issues if issue.severity == 'error'],
+        'warnings': [issue._asdict() for issue in issues if issue.severity != 'error'],
+    }
+    write_file(target.with_name(f"{target.name}.issues.json"),
+               json.dumps(report, indent=2, ensure_ascii=False).encode('utf-8') + b'\n')
+    move_file(filepath, target)
+    return target
+
+
+def organize_files(source_dir: str, target_dir: str, jobs: int = 1, journal_path: str = None,
+                   identifier_index_dir: str = None, canonical_json: bool = False,
+                   provenance_dir: str = None, claim_index_path: str = None, validate: bool = False,
+                   required_fields: List[str] = None, quarantine_dir: str = None):
+    """Organize files from source directory to target directory by username.
+
+    Parsing runs on ``jobs`` worker processes; the parsed files are then
+    partitioned by sanitized username and each user's directory is handled
+    by exactly one worker. With ``journal_path``, content already organized
+    is skipped (so an interrupted run can simply be repeated; the skipped
+    input is left in place or moved to ``quarantine_dir``) and per-user
+    counts come from the journal instead of re-listing the whole tree. With
+    ``identifier_index_dir``, the identifier index is updated for every file
+    moved, and with ``claim_index_path`` the claim similarity index. With
+    ``canonical_json``, files are stored as canonical JSON (see
+    ``canonical.py``), deduplicated by the hash of that form, and the
+    originals are kept under ``provenance_dir`` when it is given. Files go
+    where the tree's layout (``organized_layout.py``) puts them.
+
+    With ``validate``, every file is validated against ``required_fields``
+    and the schema from the same single parse that organizing uses, and an
+    invalid file is never moved into the tree: it stays in place, or is
+    moved to ``quarantine_dir`` next to a report of its issues. Rejected
+    files count as errors.
+    """
+    source_path = Path(source_dir)
+    target_path = Path(target_dir)
+    instr = instrumentation.current
+    
+    # Create target directory if it doesn't exist
+    target_path.mkdir(parents=True, exist_ok=True)
+    layout = load_layout(target_path)
+    with instr.phase('journal_open'):
+        journal, resumed = _open_journal(journal_path, target_path) if journal_path else (None, set())
+    with instr.phase('index_open'):
+        identifier_index = _open_identifier_index(identifier_index_dir, target_path) if identifier_index_dir else None
+        claim_index = _open_claim_index(claim_index_path, target_path) if claim_index_path else None
+    
+    # Track processed files
+    processed = 0
+    errors = 0
+    skipped = 0
+    rejected = 0
+    quarantine_names = NameIndex()
+    
+    hashes: Dict[Path, str] = {}
+    queued: Dict[str, Path] = {}
+    # Journal targets found deleted from the tree
+    removed: List[str] = []
+    
+    def is_duplicate(filepath: Path, sha256: str) -> bool:
+        organized = journal.lookup(sha256)
+        while organized and not (target_path / organized).exists():
+            # Deleted from the tree since it was organized
+            journal.remove([organized])
+            removed.append(organized)
+            organized = journal.lookup(sha256)
+        duplicate_of = organized or queued.get(sha256)
+        if duplicate_of and sha256 in resumed:
+            # The source of a move that was interrupted after copying it
+            resumed.discard(sha256)
+            print(f"Completing interrupted move: {filepath} -> {duplicate_of}")
+            os.remove(filepath)
+            return True
+        if duplicate_of:
+            nonlocal skipped
+            skipped += 1
+            # Contributor input is never deleted: set it aside, or leave it in place
+            if quarantine_dir:
+                issue = Issue('file.duplicate', '', None, f"Same content as {duplicate_of}", 'warning')
+                with instr.phase('quarantine'):
+                    target = quarantine_file(filepath, Path(quarantine_dir), [issue], quarantine_names)
+                print(f"Skipping already organized file: {filepath} (same content as {duplicate_of}), "
+                      f"moved to {target}")
+            else:
+                print(f"Skipping already organized file: {filepath} (same content as {duplicate_of}), "
+                      f"left in place")
+            return True
+        hashes[filepath] = sha256
+        queued[sha256] = filepath
+        return False
+    
+    def drop_from_indexes(targets: List[str]):
+        if identifier_index is not None and targets:
+            with instr.phase('index'):
+                identifier_index.remove_paths(targets)
+        if claim_index is not None and targets:
+            with instr.phase('claim_index'):
+                for target in targets:
+                    claim_index.remove(target)
+    
+    # Process all JSON and YAML files in source directory. Canonical content
+    # is only known after parsing, so it is hashed and deduplicated then.
+    filepaths = []
+    walk_start = time.perf_counter()
+    for filepath in iter_submission_files(source_path):
+        instr.count('files')
+        if journal is not None and not canonical_json:
+            with instr.phase('hash'):
+                sha256 = file_sha256(filepath)
+            if is_duplicate(filepath, sha256):
+                continue
+        filepaths.append(filepath)
+    # Includes hashing, which is also reported on its own
+    instr.add_time('walk', time.perf_counter() - walk_start)
+    
+    executor = None
+    if jobs > 1 and filepaths:
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                       initargs=(instr.enabled, validate, required_fields))
+    try:
+        # Load data to extract usernames
+        if executor is not None:
+            chunksize = max(1, min(256, len(filepaths) // (jobs * 4)))
+            resolve_args = [(filepath, canonical_json) for filepath in filepaths]
+            resolved = _merge_timings(executor.map(_resolve_in_worker, resolve_args, chunksize=chunksize))
+        else:
+            validator = SubmissionValidator(required_fields) if validate else None
+            resolved = (resolve_username(filepath, canonical_json, validator) for filepath in filepaths)
+        
+        by_user: Dict[str, List[Path]] = {}
+        keys: Dict[Path, Set[str]] = {}
+        claims: Dict[Path, list] = {}
+        payloads: Dict[Path, bytes] = {}
+        for (filepath, safe_username, file_keys, messages, payload, file_claims, issues,
+             content_hash) in resolved:
+            print('\n'.join(messages))
+            if issues:
+                for issue in issues:
+                    print(f"    - {issue.message}")
+                rejected += 1
+                if quarantine_dir:
+                    with instr.phase('quarantine'):
+                        target = quarantine_file(filepath, Path(quarantine_dir), issues, quarantine_names)
+                    print(f"  🚫 Quarantined to: {target}")
+            if safe_username is None:
+                errors += 1
+                continue
+            if payload is not None:
+                if journal is not None and is_duplicate(filepath, content_hash):
+                    continue
+                payloads[filepath] = payload
+            by_user.setdefault(safe_username, []).append(filepath)
+            keys[filepath] = file_keys
+            claims[filepath] = file_claims
+        
+        # Before moving, as a new file may take the name of a deleted one
+        drop_from_indexes(removed)
+        
+        # Move files, one task per user directory
+        tasks = [
+            (str(target_path), user, paths,
+             [hashes[p] for p in paths] if journal else None,
+             journal_path,
+             [payloads[p] for p in paths] if canonical_json else None,
+             provenance_dir,
+             layout)
+            for user, paths in by_user.items()
+        ]
+        if executor is not None:
+            results = _merge_timings(executor.map(_organize_user_in_worker, tasks))
+        else:
+            results = map(_organize_user_task, tasks)
+        
+        for (_, user, *_), (user_processed, user_errors, messages, moved) in zip(tasks, results):
+            if messages:
+                print('\n'.join(messages))
+            processed += user_processed
+            errors += user_errors
+            if journal is not None:
+                with instr.phase('journal'):
+                    journal.record(('done', sha256, relative, user) for sha256, relative, _ in moved)
+            if identifier_index is not None:
+                with instr.phase('index'):
+                    for _, relative, source in moved:
+                        for key in keys[source]:
+                            identifier_index.add(key, relative)
+            if claim_index is not None:
+                with instr.phase('claim_index'):
+                    for _, relative, source in moved:
+                        claim_index.add(relative, claims[source])
+        
+        if journal is not None and journal.needs_compaction():
+            with instr.phase('journal'):
+                dropped = journal.compact(target_path)
+            drop_from_indexes(dropped)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if identifier_index is not None:
+            with instr.phase('index'):
+                identifier_index.flush()
+        if claim_index is not None:
+            with instr.phase('claim_index'):
+                claim_index.flush()
+                claim_index.close()
     
     # Summary
     print(f"\n📊 Summary:")
     print(f"  - Files processed: {processed}")
     print(f"  - Errors: {errors}")
+    if skipped:
+        where = f"moved to {quarantine_dir}" if quarantine_dir else "left in place"
+        print(f"  - Already organized: {skipped} ({where})")
+    if rejected:
+        where = f" (quarantined in {quarantine_dir})" if quarantine_dir else ''
+        print(f"  - Rejected as invalid: {rejected}{where}")
     
     # List created user directories
-    user_dirs = [d for d in target_path.iterdir() if d.is_dir()]
-    if user_dirs:
+    with instr.phase('summary'):
+        if journal is not None:
+            user_counts = journal.user_counts
+        else:
+            user_counts = {}
+            for filepath in iter_organized_files(target_path):
+                user = filepath.relative_to(target_path).parts[0]
+                user_counts[user] = user_counts.get(user, 0) + 1
+    if user_counts:
         print(f"\n📁 User directories created:")
-        for user_dir in sorted(user_dirs):
-            file_count = len(list(user_dir.glob('*')))
-            print(f"  - {user_dir.name}: {file_count} file(s)")
+        for user in sorted(user_counts):
+            print(f"  - {user}: {user_counts[user]} file(s)")
     
     return processed, errors
 
 
-def main():
-    if len(sys.argv) < 3:
-        print("Usage: python organize_by_username.py <source_dir> <target_dir>")
-        print("Example: python organize_by_username.py submissions/ data/organized/")
-        sys.exit(1)
+def build_parser(description: str = "Organize submission files by username after merge.",
+                 epilog: str = "Example: python organize_by_username.py submissions/ data/organized/"
+                 ) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description, epilog=epilog)
+    parser.add_argument('source_dir')
+    parser.add_argument('target_dir')
+    parser.add_argument('--jobs', '-j', type=int, default=1,
+                        help="worker processes for parsing and moving (default: 1)")
+    parser.add_argument('--journal', default=None,
+                        help="state journal (default: <target_dir>/.organize_journal.jsonl)")
+    parser.add_argument('--no-journal', action='store_true',
+                        help="re-list the target tree instead of keeping a journal")
+    parser.add_argument('--identifier-index', default=None,
+                        help="identifier index to update (default: <target_dir>/.identifier_index)")
+    parser.add_argument('--no-identifier-index', action='store_true',
+                        help="do not maintain the identifier index")
+    parser.add_argument('--claim-index', nargs='?', const='', default=None, metavar='PATH',
+                        help="create and update a claim similarity index "
+                             "(default: <target_dir>/.claim_index.sqlite); "
+                             "an index that already exists there is updated without this flag")
+    parser.add_argument('--no-claim-index', action='store_true',
+                        help="do not update the claim similarity index even if it exists")
+    parser.add_argument('--canonical', action='store_true',
+                        help="store submissions as canonical, key-sorted compact JSON")
+    parser.add_argument('--provenance', default=None, metavar='DIR',
+                        help="with --canonical, keep the original files here "
+                             "(e.g. <target_dir>/.provenance; default: discard them)")
+    parser.add_argument('--timing-report', default=None, metavar='PATH',
+                        help="write per-phase timings, counters and slowest files as JSON")
+    parser.add_argument('--cprofile', default=None, metavar='PATH',
+                        help="write a cProfile dump of the run")
+    parser.set_defaults(validate=False, required=None, quarantine=None)
+    return parser
+
+
+def run(parser: argparse.ArgumentParser) -> int:
+    """Parse the command line and organize; returns the exit code."""
+    args = parser.parse_args()
+    if args.provenance and not args.canonical:
+        parser.error("--provenance requires --canonical")
     
-    source_dir = sys.argv[1]
-    target_dir = sys.argv[2]
+    journal_path = None
+    if not args.no_journal:
+        journal_path = args.journal or os.path.join(args.target_dir, '.organize_journal.jsonl')
+    identifier_index_dir = None
+    if not args.no_identifier_index:
+        identifier_index_dir = args.identifier_index or os.path.join(args.target_dir, '.identifier_index')
+    claim_index_path = None
+    if not args.no_claim_index:
+        default_claim_index = os.path.join(args.target_dir, '.claim_index.sqlite')
+        if args.claim_index is not None:
+            claim_index_path = args.claim_index or default_claim_index
+        elif os.path.exists(default_claim_index):
+            claim_index_path = default_claim_index
     
-    if not os.path.exists(source_dir):
-        print(f"Error: Source directory '{source_dir}' does not exist")
-        sys.exit(1)
+    if not os.path.exists(args.source_dir):
+        print(f"Error: Source directory '{args.source_dir}' does not exist")
+        return 1
     
-    processed, errors = organize_files(source_dir, target_dir)
+    with instrumentation.profiled(args.timing_report, args.cprofile):
+        processed, errors = organize_files(args.source_dir, args.target_dir, args.jobs, journal_path,
+                                           identifier_index_dir, args.canonical, args.provenance,
+                                           claim_index_path, args.validate, args.required, args.quarantine)
     
     # Exit with error code if there were any errors
-    sys.exit(1 if errors > 0 else 0)
+    return 1 if errors > 0 else 0
+
+
+def main():
+    sys.exit(run(build_parser()))
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
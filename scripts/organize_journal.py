@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Append-only journal of organized submissions.
+
+Every move is bracketed by a ``begin`` and a ``done`` record, one JSON object
+per line, and a ``remove`` record drops a file that is gone. Replaying the
+journal gives the content hash of every organized file, per-user file counts,
+and any moves that were interrupted, so a run only has to look at new inputs
+and never has to re-list ``data/organized/``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+def file_sha256(path: Path) -> str:
+    """Return the hex SHA-256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class JournalWriter:
+    """Append records to a journal file.
+
+    Each record is written with a single ``os.write`` on an ``O_APPEND``
+    descriptor, so several worker processes can share one journal.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def write(self, op: str, sha256: Optional[str], target: str = None, user: str = None):
+        record = {'op': op, 'sha256': sha256}
+        if target is not None:
+            record['target'] = target
+        if user is not None:
+            record['user'] = user
+        os.write(self._fd, (json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+
+    def close(self):
+        os.close(self._fd)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class OrganizeJournal:
+    """In-memory state replayed from a journal file."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        # target path relative to the organized root -> (content hash, user)
+        self.entries: Dict[str, Tuple[str, str]] = {}
+        # content hash -> a target with that content
+        self.targets: Dict[str, str] = {}
+        self.pending: Dict[str, Tuple[str, str]] = {}
+        self.user_counts: Dict[str, int] = {}
+        self.records = 0
+        if self.path.exists():
+            self._replay()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def _replay(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # A torn final line from an interrupted write
+                    continue
+                self.records += 1
+                self._apply(record['op'], record.get('sha256'), record.get('target'), record.get('user'))
+
+    def _apply(self, op: str, sha256: Optional[str], target: Optional[str], user: Optional[str]):
+        if op == 'begin':
+            self.pending[sha256] = (target, user)
+        elif op == 'done':
+            self.pending.pop(sha256, None)
+            self._drop(target)
+            self.entries[target] = (sha256, user)
+            self.targets[sha256] = target
+            self.user_counts[user] = self.user_counts.get(user, 0) + 1
+        elif op == 'abort':
+            self.pending.pop(sha256, None)
+        elif op == 'remove':
+            self._drop(target)
+
+    def _drop(self, target: str):
+        entry = self.entries.pop(target, None)
+        if entry is None:
+            return
+        sha256, user = entry
+        self.user_counts[user] -= 1
+        if not self.user_counts[user]:
+            del self.user_counts[user]
+        if self.targets.get(sha256) == target:
+            del self.targets[sha256]
+            # Another file may hold the same content (rare, so a scan is fine)
+            for other, (other_sha256, _) in self.entries.items():
+                if other_sha256 == sha256:
+                    self.targets[sha256] = other
+                    break
+
+    def lookup(self, sha256: str) -> Optional[str]:
+        """Return an organized path recorded for this content, if any."""
+        return self.targets.get(sha256)
+
+    def record(self, records: Iterable[Tuple[str, str, str, str]]):
+        """Apply ``(op, sha256, target, user)`` records written by workers."""
+        for op, sha256, target, user in records:
+            self.records += 1
+            self._apply(op, sha256, target, user)
+
+    def recover(self, root: Path) -> Set[str]:
+        """Resolve moves left pending by an interrupted run.
+
+        A move is a rename, so a pending target that exists was completed and
+        one that does not exist never happened; its source is still in place
+        and will be picked up again as a new input. Returns the content
+        hashes of the completed moves: a cross-device move may have died
+        after its copy, leaving a source that is safe to remove.
+        """
+        completed = set()
+        if not self.pending:
+            return completed
+        with JournalWriter(str(self.path)) as writer:
+            for sha256, (target, user) in list(self.pending.items()):
+                op = 'done' if (root / target).exists() else 'abort'
+                writer.write(op, sha256, target, user)
+                self.records += 1
+                self._apply(op, sha256, target, user)
+                if op == 'done':
+                    completed.add(sha256)
+        return completed
+
+    def remove(self, targets: Iterable[str]):
+        """Record that the files at ``targets`` no longer exist."""
+        with JournalWriter(str(self.path)) as writer:
+            for target in targets:
+                if target in self.entries:
+                    writer.write('remove', None, target)
+                    self.records += 1
+                    self._apply('remove', None, target, None)
+
+    def bootstrap(self, root: Path):
+        """Seed an empty journal from an already organized tree (one full scan)."""
+        with JournalWriter(str(self.path)) as writer:
+            for user_dir in sorted(root.iterdir()):
+                if not user_dir.is_dir() or user_dir.name.startswith('.'):
+                    continue
+                for path in sorted(user_dir.rglob('*')):
+                    if not path.is_file():
+                        continue
+                    sha256 = file_sha256(path)
+                    target = path.relative_to(root).as_posix()
+                    writer.write('done', sha256, target, user_dir.name)
+                    self.records += 1
+                    self._apply('done', sha256, target, user_dir.name)
+
+    def rename_targets(self, moves: Dict[str, str]):
+        """Point records at files moved from ``old`` to ``moves[old]`` and compact the journal."""
+        self.entries = {moves.get(target, target): entry for target, entry in self.entries.items()}
+        self.targets = {sha256: moves.get(target, target) for sha256, target in self.targets.items()}
+        self.compact()
+
+    def compact(self, root: Optional[Path] = None) -> List[str]:
+        """Rewrite the journal as one ``done`` record per organized file.
+
+        With ``root``, files that no longer exist under it are dropped, so
+        the counts are recounted against the tree. Returns the dropped
+        targets.
+        """
+        dropped = []
+        if root is not None:
+            dropped = [target for target in self.entries if not (root / target).is_file()]
+            for target in dropped:
+                self._drop(target)
+        fd, tmp = tempfile.mkstemp(dir=self.path.parent, prefix='.journal', suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for target, (sha256, user) in self.entries.items():
+                f.write(json.dumps({'op': 'done', 'sha256': sha256, 'target': target, 'user': user},
+                                   ensure_ascii=False) + '\n')
+        os.replace(tmp, self.path)
+        self.records = len(self.entries)
+        return dropped
+
+    def needs_compaction(self) -> bool:
+        return self.records > 2 * len(self.entries) + 1000
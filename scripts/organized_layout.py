@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Storage layout of the organized tree.
+
+``data/organized`` is flat by default: ``<user>/<file>``. For users with
+tens of thousands of files it can be sharded as ``<user>/<prefix>/<file>``,
+where ``prefix`` is the first ``shard_width`` hex digits of the CRC-32 of
+the file name, a fan-out of 16, 256, 4096 or 65536 directories per user.
+The shard depends only on the name, so names stay unique per user and a
+file is found without listing anything.
+
+The layout is recorded in ``<root>/.layout.json``. The organizer follows
+it, ``OrganizedTree`` resolves paths for readers, and ``migrate`` re-shards
+an existing tree in place, rewriting the paths stored in the journal and
+indexes. Moves are planned on disk before any file is renamed, so an
+interrupted migration is finished by running it again.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import zlib
+from pathlib import Path, PurePosixPath
+from typing import Dict, Iterator, NamedTuple, Optional
+
+LAYOUT_FILE = '.layout.json'
+MIGRATION_FILE = '.layout_migration.json'
+MAX_SHARD_WIDTH = 4
+
+
+class Layout(NamedTuple):
+    """Where a user's files go: flat (``shard_width`` 0) or in hash-prefix directories."""
+    shard_width: int = 0
+
+    def shard(self, filename: str) -> str:
+        """Return the shard directory name of ``filename`` ('' when flat)."""
+        return f"{zlib.crc32(filename.encode('utf-8')):08x}"[:self.shard_width]
+
+    def directory(self, user_dir: Path, filename: str) -> Path:
+        """Return the directory ``filename`` belongs in under ``user_dir``."""
+        return user_dir / self.shard(filename) if self.shard_width else user_dir
+
+    def relative(self, username: str, filename: str) -> str:
+        """Return the path of a user's file relative to the organized root."""
+        if self.shard_width:
+            return f"{username}/{self.shard(filename)}/{filename}"
+        return f"{username}/{filename}"
+
+
+FLAT = Layout()
+
+
+def load_layout(root) -> Layout:
+    """Return the layout recorded for ``root`` (flat when none is)."""
+    try:
+        with open(Path(root) / LAYOUT_FILE, 'r', encoding='utf-8') as f:
+            return Layout(json.load(f)['shard_width'])
+    except FileNotFoundError:
+        return FLAT
+
+
+def save_layout(root, layout: Layout):
+    if not 0 <= layout.shard_width <= MAX_SHARD_WIDTH:
+        raise ValueError(f"shard width must be between 0 and {MAX_SHARD_WIDTH}, got {layout.shard_width}")
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=root_path, prefix='.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(layout._asdict(), f)
+        f.write('\n')
+    os.replace(tmp, root_path / LAYOUT_FILE)
+
+
+class OrganizedTree:
+    """Read access to an organized tree that hides its layout."""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.layout = load_layout(self.root)
+
+    def path(self, username: str, filename: str) -> Path:
+        """Return where ``username``'s file ``filename`` is stored (whether or not it exists)."""
+        return self.layout.directory(self.root / username, filename) / filename
+
+    def resolve(self, reference: str) -> Optional[Path]:
+        """Return the file a ``<user>/<file>`` reference names, or None if it does not exist.
+
+        References written under another layout (``<user>/<shard>/<file>``)
+        resolve too, so stored paths survive a migration.
+        """
+        parts = PurePosixPath(reference).parts
+        if len(parts) < 2:
+            return None
+        path = self.path(parts[0], parts[-1])
+        return path if path.is_file() else None
+
+    def users(self) -> Iterator[str]:
+        for entry in sorted(os.scandir(self.root), key=lambda entry: entry.name):
+            if entry.is_dir() and not entry.name.startswith('.'):
+                yield entry.name
+
+    def files(self, username: str = None) -> Iterator[Path]:
+        """Yield the files of one user, or of every user, in name order per user."""
+        for user in [username] if username else self.users():
+            user_dir = self.root / user
+            if user_dir.is_dir():
+                yield from sorted((path for path in user_dir.rglob('*')
+                                   if path.is_file() and not path.name.startswith('.')),
+                                  key=lambda path: path.name)
+
+
+def migrate(root: str, layout: Layout, journal_path: str = None, identifier_index_dir: str = None,
+            claim_index_path: str = None) -> Dict[str, int]:
+    """Move every file under ``root`` to where ``layout`` puts it.
+
+    The new layout is recorded first, so files organized meanwhile already
+    land in their final place. Files keep their names unless two files of a
+    user share one (only possible in hand-made trees), in which case the
+    later one gets the organizer's ``stem_<n>`` name. All moves are planned
+    and written to ``<root>/.layout_migration.json`` before any file is
+    renamed; the plan is removed once the journal and indexes given are
+    rewritten to the new paths, and a run that finds one left behind
+    finishes it first. A planned move whose target is taken by another
+    file stays in the plan and raises ``FileExistsError``. Emptied
+    directories are removed. Returns counts of moved, renamed and
+    unchanged files.
+    """
+    from organize_by_username import NameIndex
+
+    root_path = Path(root)
+    plan_path = root_path / MIGRATION_FILE
+    try:
+        with open(plan_path, 'r', encoding='utf-8') as f:
+            _finish_moves(root_path, json.load(f), plan_path, journal_path, identifier_index_dir,
+                          claim_index_path)
+    except FileNotFoundError:
+        pass
+
+    save_layout(root_path, layout)
+    names = NameIndex()
+    moves: Dict[str, str] = {}
+    stats = {'moved': 0, 'renamed': 0, 'unchanged': 0}
+    tree = OrganizedTree(root)
+    users = list(tree.users())
+    for user in users:
+        user_dir = root_path / user
+        for path in tree.files(user):
+            if path.parent == layout.directory(user_dir, path.name):
+                stats['unchanged'] += 1
+                continue
+            target = names.reserve(user_dir, path.name, layout)
+            moves[path.relative_to(root_path).as_posix()] = target.relative_to(root_path).as_posix()
+            stats['moved'] += 1
+            if target.name != path.name:
+                stats['renamed'] += 1
+
+    if moves:
+        _write_plan(plan_path, moves)
+        _finish_moves(root_path, moves, plan_path, journal_path, identifier_index_dir, claim_index_path)
+
+    for user in users:
+        # Deepest first, so emptied parents are removed after their children
+        for directory in sorted((p for p in (root_path / user).rglob('*') if p.is_dir()),
+                                key=lambda p: len(p.parts), reverse=True):
+            try:
+                directory.rmdir()
+            except OSError:
+                pass
+    return stats
+
+
+def _write_plan(plan_path: Path, moves: Dict[str, str]):
+    fd, tmp = tempfile.mkstemp(dir=plan_path.parent, prefix='.', suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(moves, f, ensure_ascii=False)
+    os.replace(tmp, plan_path)
+
+
+def _finish_moves(root_path: Path, moves: Dict[str, str], plan_path: Path, journal_path: Optional[str],
+                  identifier_index_dir: Optional[str], claim_index_path: Optional[str]):
+    """Rename the files of a migration plan that are not moved yet, rewrite stored paths, drop the plan.
+
+    A move whose target already holds another file is not made: the moves
+    done are rewritten, the conflicting ones stay in the plan and
+    ``FileExistsError`` names them, so the next run retries them once the
+    targets are cleared.
+    """
+    done: Dict[str, str] = {}
+    conflicts: Dict[str, str] = {}
+    for old, new in moves.items():
+        source, target = root_path / old, root_path / new
+        if source.is_file():
+            if target.exists():
+                conflicts[old] = new
+                continue
+            target.parent.mkdir(exist_ok=True)
+            os.rename(source, target)
+        done[old] = new
+    _rewrite_paths(done, journal_path, identifier_index_dir, claim_index_path)
+    if conflicts:
+        _write_plan(plan_path, conflicts)
+        raise FileExistsError(f"{len(conflicts)} planned move(s) left in {plan_path}, their targets exist: "
+                              + ', '.join(f"{old} -> {new}" for old, new in conflicts.items()))
+    os.remove(plan_path)
+
+
+def _rewrite_paths(moves: Dict[str, str], journal_path: Optional[str], identifier_index_dir: Optional[str],
+                   claim_index_path: Optional[str]):
+    from claim_index import ClaimIndex
+    from identifier_index import IdentifierIndex
+    from organize_journal import OrganizeJournal
+
+    if journal_path and os.path.exists(journal_path):
+        OrganizeJournal(journal_path).rename_targets(moves)
+    if identifier_index_dir:
+        index = IdentifierIndex(identifier_index_dir)
+        if index.exists():
+            index.rename_paths(moves)
+    if claim_index_path and os.path.exists(claim_index_path):
+        with ClaimIndex(claim_index_path) as index:
+            index.rename_paths(moves)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show, resolve or migrate the layout of the organized tree.")
+    parser.add_argument('--root', default='data/organized', help="organized submissions directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('show', help="print the current layout")
+    resolve = commands.add_parser('resolve', help="print the stored path of <user>/<file> references")
+    resolve.add_argument('references', nargs='+')
+    migrate_parser = commands.add_parser('migrate', help="re-shard the tree in place")
+    migrate_parser.add_argument('--shard-width', type=int, required=True,
+                                help=f"hex digits of the shard prefix, 0 (flat) to {MAX_SHARD_WIDTH}; "
+                                     "the fan-out is 16 to the power of this")
+    args = parser.parse_args()
+
+    if args.command == 'show':
+        layout = load_layout(args.root)
+        print(f"shard width {layout.shard_width}" + (" (flat)" if not layout.shard_width else
+                                                     f" ({16 ** layout.shard_width} directories per user)"))
+        return 0
+
+    if args.command == 'resolve':
+        tree = OrganizedTree(args.root)
+        found = 0
+        for reference in args.references:
+            path = tree.resolve(reference)
+            print(path if path else f"{reference}: not found")
+            found += path is not None
+        return 0 if found == len(args.references) else 1
+
+    if not 0 <= args.shard_width <= MAX_SHARD_WIDTH:
+        parser.error(f"--shard-width must be between 0 and {MAX_SHARD_WIDTH}")
+    try:
+        stats = migrate(args.root, Layout(args.shard_width),
+                        journal_path=os.path.join(args.root, '.organize_journal.jsonl'),
+                        identifier_index_dir=os.path.join(args.root, '.identifier_index'),
+                        claim_index_path=os.path.join(args.root, '.claim_index.sqlite'))
+    except FileExistsError as e:
+        print(f"❌ Migration not finished: {e}", file=sys.stderr)
+        return 1
+    print(', '.join(f"{name}: {count}" for name, count in stats.items()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+#!/usr/bin/env python3
+"""
+Build static browse and search shards of the organized corpus for the docs site.
+
+The site cannot download every submission, so this writes ``docs/corpus/``:
+
+* ``manifest.json`` - counts, page size and tokenizer settings; the only
+  file the page loads up front, and its size does not grow with the corpus;
+* ``pages/NNNNN.json.gz`` - the listing, ``page_size`` entries per page
+  (path, user, title, identifier, claim type, claim counts, links), indexed
+  by document id;
+* ``index/XX.json.gz`` - an inverted index over paper titles, identifiers
+  and claim text mapping each term to the ids of the documents containing
+  it, sharded by the first hex digits of the term's 32-bit FNV-1a hash, so
+  a query fetches one shard per term.
+
+Ids are assigned append-only: an updated document keeps its id and a
+removed one leaves a ``null`` in its page, so a change rewrites only the
+pages and shards it touches. When more than a quarter of the ids are holes
+the ids are renumbered and everything is rewritten. Shards are gzipped with
+a fixed timestamp, so unchanged output is byte-identical.
+
+Builds are incremental. The ids are read back from the pages, a file is
+parsed only when its content hash differs from the one recorded in its
+entry, and a stat cache in ``<root>/.site_index_cache.json`` saves hashing
+files whose size and mtime did not change.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from organize_by_username import iter_organized_files, load_data_file
+
+FORMAT_VERSION = 1
+DEFAULT_OUTPUT = 'docs/corpus'
+CACHE_NAME = '.site_index_cache.json'
+PAGE_SIZE = 100
+PREFIX_LENGTH = 2
+COMPACT_RATIO = 0.25
+MIN_TERM_LENGTH = 2
+STOPWORDS = ('a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is', 'it', 'of',
+             'on', 'or', 'that', 'the', 'this', 'to', 'with')
+
+# Letters and digits; the site splits queries with the same rule (/[\p{L}\p{N}]+/gu)
+_TERM = re.compile(r'[^\W_]+')
+_STOPWORDS = frozenset(STOPWORDS)
+
+
+@lru_cache(maxsize=1 << 16)
+def term_hash(term: str) -> int:
+    """32-bit FNV-1a hash of the UTF-8 bytes of ``term``.
+
+    >>> f"{term_hash('bandgap'):08x}"
+    '11c2ee52'
+    """
+    value = 0x811c9dc5
+    for byte in term.encode('utf-8'):
+        value = ((value ^ byte) * 0x01000193) & 0xffffffff
+    return value
+
+
+def shard_of(term: str, prefix_length: int = PREFIX_LENGTH) -> str:
+    return f"{term_hash(term):08x}"[:prefix_length]
+
+
+def tokenize(text: Any) -> Set[str]:
+    """Return the distinct searchable terms of ``text``.
+
+    >>> sorted(tokenize("The Band-gap of MAPbI3"))
+    ['band', 'gap', 'mapbi3']
+    """
+    if not isinstance(text, str):
+        return set()
+    return {term for term in _TERM.findall(text.lower())
+            if len(term) >= MIN_TERM_LENGTH and term not in _STOPWORDS}
+
+
+def _items(value: Any) -> List[Dict[str, Any]]:
+    return [item for item in value if isinstance(item, dict)] if isinstance(value, list) else []
+
+
+def _text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return value.strip() if isinstance(value, str) else str(value)
+
+
+def document_terms(data: Dict[str, Any]) -> Set[str]:
+    """Terms of a submission's title, identifier and claim texts."""
+    terms = tokenize(data.get('paper_title')) | tokenize(data.get('identifier'))
+    for field in ('claims', 'non_reproducible_claims'):
+        for claim in _items(data.get(field)):
+            terms |= tokenize(claim.get('claim'))
+    return terms
+
+
+def listing_entry(path: str, data: Dict[str, Any], content_hash: str) -> Dict[str, Any]:
+    return {
+        'path': path,
+        'user': path.split('/', 1)[0],
+        'title': _text(data.get('paper_title')),
+        'identifier': _text(data.get('identifier')),
+        'claim_type': _text(data.get('claim_type')),
+        'claims': len(_items(data.get('claims'))),
+        'non_reproducible': len(_items(data.get('non_reproducible_claims'))),
+        'paper_pdf': _text(data.get('paper_pdf')),
+        'code_url': _text(data.get('code_url')),
+        'hash': content_hash,
+    }
+
+
+def _content_hash(path: Path) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _read_gzip_json(path: Path) -> Any:
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_atomic(path: Path, content: bytes):
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _gzip_json(data: Any) -> bytes:
+    text = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+    return gzip.compress(text.encode('utf-8'), mtime=0)
+
+
+class SiteIndex:
+    """The browse pages and term shards in ``out_dir``, loaded for an incremental build."""
+
+    def __init__(self, out_dir: str, page_size: int = PAGE_SIZE, prefix_length: int = PREFIX_LENGTH):
+        self.out_dir = Path(out_dir)
+        self.page_size = page_size
+        self.prefix_length = prefix_length
+        # Document id -> listing entry, None for a removed document
+        self.entries: List[Optional[Dict[str, Any]]] = []
+        # Term -> ascending document ids
+        self.postings: Dict[str, List[int]] = {}
+        manifest_path = self.out_dir / 'manifest.json'
+        if manifest_path.exists():
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            if manifest.get('version') == FORMAT_VERSION:
+                self.page_size = manifest['page_size']
+                self.prefix_length = manifest['prefix_length']
+                self._load(manifest['pages'])
+
+    def _page_path(self, number: int) -> Path:
+        return self.out_dir / 'pages' / f"{number:05d}.json.gz"
+
+    def _shard_path(self, shard: str) -> Path:
+        return self.out_dir / 'index' / f"{shard}.json.gz"
+
+    def _load(self, pages: int):
+        for number in range(pages):
+            self.entries.extend(_read_gzip_json(self._page_path(number)))
+        for path in sorted((self.out_dir / 'index').glob('*.json.gz')):
+            self.postings.update(_read_gzip_json(path))
+
+    def build(self, root: str, cache_path: Optional[str] = None) -> Dict[str, int]:
+        """Bring the shards in line with the files under ``root``.
+
+        Returns counts of added, updated, removed, unchanged and unreadable
+        files and of the pages and index shards written.
+        """
+        root_path = Path(root)
+        cache_path = Path(cache_path) if cache_path else root_path / CACHE_NAME
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (FileNotFoundError, ValueError):
+            cache = {}
+        new_cache = {}
+        ids = {entry['path']: doc_id for doc_id, entry in enumerate(self.entries) if entry}
+        stats = {'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0, 'errors': 0}
+        # Documents whose old postings must go, and the terms of new versions
+        stale: Set[int] = set()
+        new_terms: Dict[int, Set[str]] = {}
+
+        for filepath in iter_organized_files(root_path):
+            relative = filepath.relative_to(root_path).as_posix()
+            stat = filepath.stat()
+            doc_id = ids.pop(relative, None)
+            entry = self.entries[doc_id] if doc_id is not None else None
+            cached = cache.get(relative)
+            if cached and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+                content_hash = cached[2]
+            else:
+                content_hash = _content_hash(filepath)
+            new_cache[relative] = [stat.st_size, stat.st_mtime_ns, content_hash]
+            if entry is not None and entry['hash'] == content_hash:
+                stats['unchanged'] += 1
+                continue
+
+            data = load_data_file(str(filepath))
+            if not isinstance(data, dict):
+                stats['errors'] += 1
+                # Not cached, so it is retried; an indexed version stays listed meanwhile
+                new_cache.pop(relative)
+                continue
+            if doc_id is None:
+                doc_id = len(self.entries)
+                self.entries.append(None)
+                stats['added'] += 1
+            else:
+                stale.add(doc_id)
+                stats['updated'] += 1
+            self.entries[doc_id] = listing_entry(relative, data, content_hash)
+            new_terms[doc_id] = document_terms(data)
+
+        # Whatever is left in ``ids`` no longer exists on disk
+        for doc_id in ids.values():
+            self.entries[doc_id] = None
+            stale.add(doc_id)
+            stats['removed'] += 1
+
+        dirty_pages = {doc_id // self.page_size for doc_id in stale | set(new_terms)}
+        dirty_shards = self._update_postings(stale, new_terms)
+        holes = sum(1 for entry in self.entries if entry is None)
+        if holes > COMPACT_RATIO * len(self.entries):
+            self._renumber()
+            dirty_pages = set(range(self._pages()))
+            dirty_shards = {shard_of(term, self.prefix_length) for term in self.postings}
+            dirty_shards |= {path.name.split('.')[0] for path in (self.out_dir / 'index').glob('*.json.gz')}
+
+        stats['pages_written'] = self._write_pages(dirty_pages)
+        stats['shards_written'] = self._write_shards(dirty_shards)
+        self._write_manifest()
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        _write_atomic(cache_path, json.dumps(new_cache, separators=(',', ':')).encode('utf-8'))
+        return stats
+
+    def _update_postings(self, stale: Set[int], new_terms: Dict[int, Set[str]]) -> Set[str]:
+        """Drop ``stale`` ids from every posting list, add ``new_terms``; return the shards changed."""
+        dirty = set()
+        if stale:
+            for term, doc_ids in list(self.postings.items()):
+                if not stale.isdisjoint(doc_ids):
+                    kept = [doc_id for doc_id in doc_ids if doc_id not in stale]
+                    if kept:
+                        self.postings[term] = kept
+                    else:
+                        del self.postings[term]
+                    dirty.add(shard_of(term, self.prefix_length))
+        for doc_id in sorted(new_terms):
+            for term in new_terms[doc_id]:
+                doc_ids = self.postings.setdefault(term, [])
+                doc_ids.append(doc_id)
+                if len(doc_ids) > 1 and doc_ids[-2] > doc_id:
+                    doc_ids.sort()
+                dirty.add(shard_of(term, self.prefix_length))
+        return dirty
+
+    def _renumber(self):
+        mapping = {}
+        entries = []
+        for doc_id, entry in enumerate(self.entries):
+            if entry is not None:
+                mapping[doc_id] = len(entries)
+                entries.append(entry)
+        self.entries = entries
+        self.postings = {term: [mapping[doc_id] for doc_id in doc_ids]
+                         for term, doc_ids in self.postings.items()}
+
+    def _pages(self) -> int:
+        return -(-len(self.entries) // self.page_size)
+
+    def _write_pages(self, numbers: Iterable[int]) -> int:
+        (self.out_dir / 'pages').mkdir(parents=True, exist_ok=True)
+        pages = self._pages()
+        written = 0
+        for number in sorted(numbers):
+            if number < pages:
+                start = number * self.page_size
+                _write_atomic(self._page_path(number), _gzip_json(self.entries[start:start + self.page_size]))
+                written += 1
+        # Pages past the end after renumbering
+        for path in (self.out_dir / 'pages').glob('*.json.gz'):
+            if int(path.name.split('.')[0]) >= pages:
+                path.unlink()
+        return written
+
+    def _write_shards(self, shards: Iterable[str]) -> int:
+        (self.out_dir / 'index').mkdir(parents=True, exist_ok=True)
+        by_shard: Dict[str, Dict[str, List[int]]] = {shard: {} for shard in shards}
+        if by_shard:
+            for term, doc_ids in self.postings.items():
+                shard = by_shard.get(shard_of(term, self.prefix_length))
+                if shard is not None:
+                    shard[term] = doc_ids
+        for shard, postings in by_shard.items():
+            path = self._shard_path(shard)
+            if postings:
+                _write_atomic(path, _gzip_json(postings))
+            elif path.exists():
+                path.unlink()
+        return len(by_shard)
+
+    def _write_manifest(self):
+        manifest = {
+            'version': FORMAT_VERSION,
+            'documents': sum(1 for entry in self.entries if entry is not None),
+            'ids': len(self.entries),
+            'pages': self._pages(),
+            'page_size': self.page_size,
+            'prefix_length': self.prefix_length,
+            'hash': 'fnv1a32',
+            'min_term_length': MIN_TERM_LENGTH,
+            'stopwords': list(STOPWORDS),
+        }
+        _write_atomic(self.out_dir / 'manifest.json', (json.dumps(manifest, indent=2) + '\n').encode('utf-8'))
+
+    def search(self, query: str) -> List[Dict[str, Any]]:
+        """Entries containing every term of ``query``, newest first (what the site does)."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        matches = set.intersection(*(set(self.postings.get(term, ())) for term in terms))
+        return [self.entries[doc_id] for doc_id in sorted(matches, reverse=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the docs site's browse and search shards.")
+    parser.add_argument('root', nargs='?', default='data/organized')
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="output directory (default: %(default)s)")
+    parser.add_argument('--cache', default=None, help=f"stat cache (default: <root>/{CACHE_NAME})")
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE,
+                        help="entries per listing page for a new index (default: %(default)s)")
+    args = parser.parse_args()
+
+    index = SiteIndex(args.output, page_size=args.page_size)
+    stats = index.build(args.root, args.cache)
+    print(', '.join(f"{name}: {count}" for name, count in stats.items()))
+    return 1 if stats['errors'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
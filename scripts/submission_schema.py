@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Declarative rules for materials science paper submissions.
+
+The schema is plain data: an ordered list of field specs, each holding a chain
+of rules. ``compile_schema`` turns every field spec into the source of one
+straight-line Python function once at import time, so validating a submission
+is a single pass over a flat list of functions that coerces each field at most
+once and never re-interprets the rule definitions.
+
+Field spec keys:
+    field       -- key looked up in the submission (or in a list item)
+    coerce      -- 'text' applies ``str(value).strip()`` once before the rules
+    skip_falsy  -- skip the rules entirely when the raw value is falsy
+    if_missing  -- rule run (against the whole object) when the key is absent
+    rules       -- evaluated in order; the first failing rule stops the chain
+
+Rule keys:
+    check       -- rule kind, see ``_CONDITIONS`` and ``_STRUCTURAL``
+    code        -- stable identifier of the failure, e.g. 'claim.step_empty'
+    message     -- reported on failure; ``{index}``/``{step}`` are 1-based
+    severity    -- 'error' (default) or 'warning'
+
+The generated source of each check is kept as its ``source`` attribute and
+registered with ``linecache`` under ``<schema:FIELD>``, so tracebacks, pdb
+and profilers show the generated lines. ``python scripts/submission_schema.py
+[FIELD ...]`` prints it.
+
+Failures are reported as ``Issue`` records. An error sink of type
+``FailFast`` raises ``StopValidation`` on the first error, which ends the
+run without evaluating the remaining rules.
+"""
+
+import linecache
+import sys
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Issue(NamedTuple):
+    """One validation failure.
+
+    ``path`` locates the value in the submission with 0-based list indexes
+    (``claims[2].instruction[0]``) while ``claim`` is the 1-based item number
+    used in ``message`` (``Claim 3 ...``), or None outside any list item.
+    """
+    code: str
+    path: str
+    claim: Optional[int]
+    message: str
+    severity: str = 'error'
+
+    def __str__(self) -> str:
+        return self.message
+
+
+class StopValidation(Exception):
+    """Raised by a ``FailFast`` sink once the first error is recorded."""
+
+
+class FailFast(list):
+    """Error list that stops validation at the first error it receives."""
+    __slots__ = ()
+
+    def append(self, issue: Issue):
+        super().append(issue)
+        raise StopValidation
+
+
+CLAIM_SCHEMA = [
+    {
+        'field': 'claim',
+        'coerce': 'text',
+        'if_missing': {'check': 'fail', 'code': 'claim.empty',
+                       'message': "Claim {index} must have a non-empty 'claim' field"},
+        'rules': [
+            {'check': 'not_empty', 'code': 'claim.empty',
+             'message': "Claim {index} must have a non-empty 'claim' field"},
+        ],
+    },
+    {
+        'field': 'context',
+        'rules': [
+            {'check': 'non_empty_string', 'severity': 'warning', 'code': 'claim.context_empty',
+             'message': "Claim {index} context should be a non-empty string if provided"},
+        ],
+    },
+    {
+        'field': 'instruction',
+        'if_missing': {'check': 'fail', 'code': 'claim.instruction_missing',
+                       'message': "Claim {index} must have an 'instruction' field"},
+        'rules': [
+            {'check': 'list', 'code': 'claim.instruction_type',
+             'message': "Claim {index} 'instruction' field must be a list of strings"},
+            {'check': 'not_empty', 'code': 'claim.instruction_empty',
+             'message': "Claim {index} 'instruction' list cannot be empty"},
+            {'check': 'each_non_empty_string', 'code': 'claim.step_empty',
+             'message': "Claim {index} instruction step {step} must be a non-empty string"},
+        ],
+    },
+]
+
+NON_REPRODUCIBLE_CLAIM_SCHEMA = [
+    {
+        'field': 'claim',
+        'coerce': 'text',
+        'if_missing': {'check': 'fail', 'code': 'non_reproducible_claim.empty',
+                       'message': "Non-reproducible claim {index} must have a non-empty 'claim' field"},
+        'rules': [
+            {'check': 'not_empty', 'code': 'non_reproducible_claim.empty',
+             'message': "Non-reproducible claim {index} must have a non-empty 'claim' field"},
+        ],
+    },
+    {
+        # Reason is optional but recommended
+        'field': 'reason',
+        'if_missing': {'check': 'fail', 'severity': 'warning',
+                       'code': 'non_reproducible_claim.reason_missing',
+                       'message': "Non-reproducible claim {index} should include a 'reason' field "
+                                  "explaining why it cannot be reproduced"},
+        'rules': [
+            {'check': 'non_empty_string', 'severity': 'warning',
+             'code': 'non_reproducible_claim.reason_empty',
+             'message': "Non-reproducible claim {index} reason should be a non-empty string if provided"},
+        ],
+    },
+]
+
+SUBMISSION_SCHEMA = [
+    {
+        'field': 'username',
+        'coerce': 'text',
+        'rules': [
+            {'check': 'not_empty', 'code': 'username.empty', 'message': "Username cannot be empty"},
+            {'check': 'identifier_chars', 'extra': '-_', 'code': 'username.chars',
+             'message': "Username can only contain letters, numbers, hyphens, and underscores"},
+            # GitHub username limit
+            {'check': 'max_length', 'limit': 39, 'code': 'username.too_long',
+             'message': "Username is too long (max 39 characters)"},
+        ],
+    },
+    {
+        'field': 'claim_type',
+        'coerce': 'text',
+        # If claim_type is missing, assume it requires code_url for backward compatibility
+        'if_missing': {'check': 'requires', 'field': 'code_url', 'code': 'code_url.missing',
+                       'message': "code_url is required (or specify claim_type as 'pip_libraries' "
+                                  "if using standard libraries)"},
+        'rules': [
+            {'check': 'one_of', 'values': ('custom_code', 'pip_libraries'), 'code': 'claim_type.invalid',
+             'message': "claim_type must be either 'custom_code' or 'pip_libraries'"},
+            {'check': 'requires_when', 'value': 'custom_code', 'field': 'code_url',
+             'code': 'code_url.missing',
+             'message': "code_url is required for custom_code claim type"},
+        ],
+    },
+    {
+        'field': 'paper_title',
+        'rules': [
+            {'check': 'non_empty_string', 'code': 'paper_title.empty',
+             'message': "Paper title must be a non-empty string"},
+        ],
+    },
+    *[
+        {
+            'field': field,
+            'coerce': 'text',
+            'skip_falsy': True,
+            'rules': [
+                {'check': 'url', 'code': f"{field}.url",
+                 'message': f"{field} must be a valid URL starting with http:// or https://"},
+            ],
+        }
+        for field in ('paper_pdf', 'code_url', 'data_url')
+    ],
+    {
+        # e.g. arXiv ID or DOI
+        'field': 'identifier',
+        'coerce': 'text',
+        'rules': [
+            {'check': 'not_empty', 'code': 'identifier.empty', 'message': "Identifier cannot be empty"},
+        ],
+    },
+    {
+        'field': 'claims',
+        'rules': [
+            {'check': 'list', 'code': 'claims.type', 'message': "Claims must be a list"},
+            {'check': 'not_empty', 'code': 'claims.empty', 'message': "At least one claim is required"},
+            {'check': 'items', 'schema': CLAIM_SCHEMA, 'code': 'claim.type',
+             'message': "Claim {index} must be a dictionary"},
+        ],
+    },
+    {
+        'field': 'non_reproducible_claims',
+        'rules': [
+            {'check': 'list', 'code': 'non_reproducible_claims.type',
+             'message': "Non-reproducible claims must be a list"},
+            {'check': 'items', 'schema': NON_REPRODUCIBLE_CLAIM_SCHEMA, 'code': 'non_reproducible_claim.type',
+             'message': "Non-reproducible claim {index} must be a dictionary"},
+        ],
+    },
+]
+
+# A compiled check receives (data, errors, warnings) and appends issues
+Check = Callable[[Dict[str, Any], List[Issue], List[Issue]], None]
+
+# Pass conditions for chain rules; {value} is the (coerced) field value,
+# {obj} the object holding it and {const} the rule's precomputed constant.
+_CONDITIONS = {
+    'fail': 'False',
+    'not_empty': '{value}',
+    'non_empty_string': 'isinstance({value}, str) and {value}.strip()',
+    'identifier_chars': '{value}.translate({const}).isalnum()',
+    'max_length': 'len({value}) <= {const}',
+    'one_of': '{value} in {const}',
+    'requires': '{obj}.get({const})',
+    'requires_when': '{value} != {const}[0] or {obj}.get({const}[1])',
+    'url': "{value}.startswith(('http://', 'https://'))",
+    'list': 'isinstance({value}, list)',
+}
+
+_CONSTANTS = {
+    'identifier_chars': lambda rule: str.maketrans('', '', rule['extra']),
+    'max_length': lambda rule: rule['limit'],
+    'one_of': lambda rule: frozenset(rule['values']),
+    'requires': lambda rule: rule['field'],
+    'requires_when': lambda rule: (rule['value'], rule['field']),
+}
+
+# Rules that walk a list instead of testing a condition; they end a chain
+_STRUCTURAL = ('items', 'each_non_empty_string')
+
+
+class _Emitter:
+    """Generate the source of one check function from a field spec."""
+
+    def __init__(self, namespace: Dict[str, Any]):
+        self.namespace = namespace
+        self.namespace['_Issue'] = Issue
+        self.lines = []
+        # Names of the generated list position variables
+        self.positions = set()
+
+    def const(self, value: Any) -> str:
+        name = f"_C{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, depth: int, line: str):
+        self.lines.append('    ' * depth + line)
+
+    def report(self, depth: int, rule: Dict[str, Any], index: str, path: List[str], step: str = None):
+        """Emit the append of an ``Issue``.
+
+        ``path`` holds literal path parts and, for list items, the names of
+        their 1-based position variables; the path is only built on failure.
+        """
+        if 'code' not in rule:
+            raise ValueError(f"Schema rule without a code: {rule!r}")
+        message = self.const(rule['message'])
+        if '{' in rule['message']:
+            args = f"index={index}" + (f", step={step}" if step else '')
+            message = f"{message}.format({args})"
+        if rule['check'] in ('requires', 'requires_when'):
+            # The missing value is the required field, not the one being checked
+            path = path[:-1] + [f".{rule['field']}" if len(path) > 1 else rule['field']]
+        template = ''.join('[%d]' if part in self.positions else part for part in path)
+        positions = [f"{part} - 1" for part in path if part in self.positions]
+        path_source = repr(template) + (f" % ({', '.join(positions)},)" if positions else '')
+        severity = rule.get('severity', 'error')
+        sink = 'warnings' if severity == 'warning' else 'errors'
+        self.emit(depth, f"{sink}.append(_Issue({rule['code']!r}, {path_source}, {index}, "
+                         f"{message}, {severity!r}))")
+
+    def condition(self, rule: Dict[str, Any], value: str, obj: str) -> str:
+        try:
+            template = _CONDITIONS[rule['check']]
+        except KeyError:
+            raise ValueError(f"Unknown schema check: {rule['check']!r}") from None
+        const = self.const(_CONSTANTS[rule['check']](rule)) if rule['check'] in _CONSTANTS else None
+        return template.format(value=value, obj=obj, const=const)
+
+    def field(self, depth: int, spec: Dict[str, Any], obj: str, index: str, level: int,
+              path: List[str]):
+        name = spec['field']
+        path = path + [f".{name}" if path else name]
+        value = f"v{level}"
+        self.emit(depth, f"if {name!r} in {obj}:")
+        self.emit(depth + 1, f"{value} = {obj}[{name!r}]")
+        body = depth + 1
+        if spec.get('skip_falsy'):
+            self.emit(body, f"if {value}:")
+            body += 1
+        if spec.get('coerce') == 'text':
+            self.emit(body, f"{value} = str({value}).strip()")
+        elif spec.get('coerce') is not None:
+            raise ValueError(f"Unknown coercion: {spec['coerce']!r}")
+        self.chain(body, spec.get('rules', []), value, obj, index, level, path)
+        if 'if_missing' in spec:
+            self.emit(depth, "else:")
+            if spec['if_missing']['check'] == 'fail':
+                self.report(depth + 1, spec['if_missing'], index, path)
+            else:
+                self.chain(depth + 1, [spec['if_missing']], 'None', obj, index, level, path)
+
+    def chain(self, depth: int, rules: List[Dict[str, Any]], value: str, obj: str, index: str, level: int,
+              path: List[str]):
+        """Emit an if/elif chain; the first failing rule stops the chain."""
+        if not rules:
+            self.emit(depth, "pass")
+            return
+        structural = rules[-1] if rules[-1]['check'] in _STRUCTURAL else None
+        conditions = rules[:-1] if structural else rules
+        if any(rule['check'] in _STRUCTURAL for rule in conditions):
+            raise ValueError("List rules must be the last rule of a field")
+
+        for position, rule in enumerate(conditions):
+            keyword = 'if' if position == 0 else 'elif'
+            self.emit(depth, f"{keyword} not ({self.condition(rule, value, obj)}):")
+            self.report(depth + 1, rule, index, path)
+        if structural is None:
+            return
+        if conditions:
+            self.emit(depth, "else:")
+            depth += 1
+
+        item = f"item{level}"
+        position = f"i{level}"
+        self.positions.add(position)
+        path = path + [position]
+        self.emit(depth, f"for {position}, {item} in enumerate({value}, 1):")
+        if structural['check'] == 'each_non_empty_string':
+            self.emit(depth + 1, f"if not isinstance({item}, str) or not {item}.strip():")
+            self.report(depth + 2, structural, index, path, step=position)
+            return
+        self.emit(depth + 1, f"if not isinstance({item}, dict):")
+        self.report(depth + 2, structural, position, path)
+        self.emit(depth + 2, "continue")
+        for spec in structural['schema']:
+            self.field(depth + 1, spec, item, position, level + 1, path)
+
+
+def _compile_field(spec: Dict[str, Any]) -> Check:
+    namespace = {}
+    emitter = _Emitter(namespace)
+    function = f"check_{spec['field']}"
+    emitter.emit(0, f"def {function}(data, errors, warnings):")
+    emitter.field(1, spec, 'data', 'None', 0, [])
+    source = '\n'.join(emitter.lines) + '\n'
+    filename = f"<schema:{spec['field']}>"
+    # Let tracebacks and debuggers show the generated lines
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    exec(compile(source, filename, 'exec'), namespace)
+    check = namespace[function]
+    check.source = source
+    return check
+
+
+def compile_schema(schema: List[Dict[str, Any]]) -> List[Check]:
+    """Compile a declarative schema into a flat list of field check functions."""
+    return [_compile_field(spec) for spec in schema]
+
+
+def run_checks(checks: List[Check], data: Dict[str, Any], errors: List[Issue], warnings: List[Issue]):
+    """Run compiled checks over ``data`` in one pass, appending issues."""
+    for check in checks:
+        check(data, errors, warnings)
+
+
+SUBMISSION_CHECKS = compile_schema(SUBMISSION_SCHEMA)
+
+
+def main():
+    """Print the generated source of the submission checks, optionally only for the given fields."""
+    fields = sys.argv[1:]
+    for check in SUBMISSION_CHECKS:
+        if not fields or check.__name__[len('check_'):] in fields:
+            print(check.source)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,200 +3,775 @@
 Validate submission files for crowdsourcing data collection.
 """
 
+import argparse
+import contextlib
 import json
-import yaml
 import sys
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
+
+import instrumentation
+from data_loader import DEFAULT_LIMITS, LimitError, ParseError, ParseLimits, check_size, load_file, loads
+from identifier_index import IdentifierIndex, submission_keys
+from submission_schema import SUBMISSION_CHECKS, FailFast, Issue, StopValidation, run_checks
+from validation_cache import ValidationCache
+
+SUBMISSION_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+# Bump whenever a rule or message changes so cached results are invalidated
+VALIDATOR_VERSION = '5'
 
 
 class SubmissionValidator:
-    def __init__(self, required_fields: List[str] = None):
+    """Validate submissions against the required fields and the schema.
+
+    Failures are collected as ``Issue`` records in ``errors`` and
+    ``warnings``; ``validate_file`` and ``validate_data`` return them rendered
+    to message strings. With ``fail_fast`` validation stops at the first
+    error, so only that error and the warnings found before it are reported.
+    With a ``claim_index``, claims similar to ones already in the corpus are
+    reported as warnings. After ``validate_file``, ``data`` holds the parsed
+    submission, so callers need not parse it again (None when the file could
+    not be parsed or its result came from the cache).
+    """
+
+    def __init__(self, required_fields: List[str] = None, cache: Optional[ValidationCache] = None,
+                 identifier_index: Optional[IdentifierIndex] = None, reject_duplicates: bool = False,
+                 limits: Optional[ParseLimits] = DEFAULT_LIMITS, fail_fast: bool = False,
+                 claim_index: Optional['ClaimIndex'] = None):
         # Default required fields for materials science papers
         self.required_fields = required_fields or [
             'username', 'paper_title', 'paper_pdf', 'identifier', 'claim_type', 'claims'
         ]
-        self.errors = []
+        self.cache = cache
+        self.identifier_index = identifier_index
+        self.reject_duplicates = reject_duplicates
+        self.limits = limits
+        self.fail_fast = fail_fast
+        self.claim_index = claim_index
+        self.errors: List[Issue] = []
+        self.warnings: List[Issue] = []
+        self.identifier_keys = []
+        self.claims = []
+        self.data = None
+    
+    @property
+    def issues(self) -> List[Issue]:
+        """Errors and warnings of the last validation as ``Issue`` records."""
+        return self.errors + self.warnings
+    
+    def _reset(self):
+        self.errors = FailFast() if self.fail_fast else []
         self.warnings = []
+        self.identifier_keys = []
+        self.claims = []
+        self.data = None
+    
+    def _error(self, code: str, message: str, path: str = ''):
+        self.errors.append(Issue(code, path, None, message))
+    
+    def _result(self) -> Tuple[bool, List[str], List[str]]:
+        return (len(self.errors) == 0, [issue.message for issue in self.errors],
+                [issue.message for issue in self.warnings])
     
     def validate_file(self, filepath: str) -> Tuple[bool, List[str], List[str]]:
         """Validate a single submission file."""
-        self.errors = []
-        self.warnings = []
+        instr = instrumentation.current
+        if not instr.enabled:
+            return self._validate_file(filepath, instr)
         
+        start = time.perf_counter()
+        try:
+            return self._validate_file(filepath, instr)
+        finally:
+            elapsed = time.perf_counter() - start
+            instr.add_time('validate_file', elapsed)
+            instr.record_file(filepath, elapsed)
+    
+    def _validate_file(self, filepath: str, instr) -> Tuple[bool, List[str], List[str]]:
+        self._reset()
+        try:
+            self._check_file(filepath, instr)
+        except StopValidation:
+            pass
+        return self._result()
+    
+    def _check_file(self, filepath: str, instr):
         if not os.path.exists(filepath):
-            self.errors.append(f"File not found: {filepath}")
-            return False, self.errors, self.warnings
+            self._error('file.not_found', f"File not found: {filepath}")
+            return
         
         # Check file extension
         file_ext = Path(filepath).suffix.lower()
-        if file_ext not in ['.json', '.yaml', '.yml']:
-            self.errors.append(f"Invalid file extension: {file_ext}. Must be .json, .yaml, or .yml")
-            return False, self.errors, self.warnings
+        if file_ext not in SUBMISSION_EXTENSIONS:
+            self._error('file.extension',
+                        f"Invalid file extension: {file_ext}. Must be .json, .yaml, or .yml")
+            return
+        
+        try:
+            with instr.phase('read'), open(filepath, 'rb') as f:
+                # Oversized files are rejected before a single byte is read
+                check_size(os.fstat(f.fileno()).st_size, self.limits)
+                raw = f.read()
+        except LimitError as e:
+            self._error('file.too_large', f"Submission too large: {e}")
+            return
+        except Exception as e:
+            self._error('file.unreadable', f"Error reading file: {e}")
+            return
+        instr.count('bytes_read', len(raw))
+        
+        # Unchanged content validated by the same rules needs no parsing at all
+        cache_key = None
+        entry = None
+        if self.cache is not None:
+            with instr.phase('cache_lookup'):
+                salt = (f"{VALIDATOR_VERSION}:{file_ext}:{','.join(self.required_fields)}:{self.limits}"
+                        f":{self.fail_fast}:{self.claim_index is not None}")
+                cache_key = self.cache.key(raw, salt)
+                entry = self.cache.get(cache_key)
+        
+        if entry is not None:
+            instr.count('cache_hits')
+            self.errors = [Issue(*issue) for issue in entry['errors']]
+            self.warnings = [Issue(*issue) for issue in entry['warnings']]
+            self.identifier_keys = entry['identifier_keys']
+            self.claims = entry['claims']
+        else:
+            try:
+                self._validate_content(raw, file_ext, instr, filepath)
+            except StopValidation:
+                # The first error is the whole fail-fast result, so it is cached too
+                pass
+            # YAML parse errors name the file, so they are not reused for other files
+            if cache_key is not None and not any(issue.code == 'parse.yaml' for issue in self.errors):
+                with instr.phase('cache_store'):
+                    self.cache.put(cache_key, {'errors': self.errors, 'warnings': self.warnings,
+                                               'identifier_keys': self.identifier_keys,
+                                               'claims': self.claims})
+        if self.fail_fast and self.errors:
+            return
         
+        # The corpus changes independently of the file, so this is never cached
+        if self.identifier_index is not None:
+            with instr.phase('duplicates'):
+                self._check_duplicates(filepath)
+        if self.claim_index is not None:
+            with instr.phase('similar_claims'):
+                self._check_similar_claims(filepath)
+    
+    def _validate_content(self, raw: bytes, file_ext: str, instr=None, name: Optional[str] = None):
+        """Parse raw file content and run every rule against it.
+
+        ``name`` is the file the content came from, for parse error messages.
+        """
+        instr = instr or instrumentation.current
         # Load and validate content
         try:
-            if file_ext == '.json':
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            else:
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-        except json.JSONDecodeError as e:
-            self.errors.append(f"Invalid JSON format: {e}")
-            return False, self.errors, self.warnings
-        except yaml.YAMLError as e:
-            self.errors.append(f"Invalid YAML format: {e}")
-            return False, self.errors, self.warnings
+            with instr.phase('parse'):
+                data = loads(raw.decode('utf-8'), file_ext, self.limits, name)
+        except LimitError as e:
+            self._error('file.too_large', f"Submission too large: {e}")
+            return
+        except ParseError as e:
+            self._error(f"parse.{e.format.lower()}", f"Invalid {e.format} format: {e}")
+            return
         except Exception as e:
-            self.errors.append(f"Error reading file: {e}")
-            return False, self.errors, self.warnings
+            self._error('file.unreadable', f"Error reading file: {e}")
+            return
         
+        self.data = data
+        with instr.phase('rules'):
+            self._check_data(data)
+    
+    def validate_data(self, data: Any) -> Tuple[bool, List[str], List[str]]:
+        """Validate an already parsed submission (e.g. one JSON Lines record)."""
+        self._reset()
+        try:
+            self._check_data(data)
+            if self.identifier_index is not None:
+                self._check_duplicates()
+            if self.claim_index is not None:
+                self._check_similar_claims()
+        except StopValidation:
+            pass
+        return self._result()
+    
+    def _check_data(self, data: Any):
         # Validate required fields
         if not isinstance(data, dict):
-            self.errors.append("Data must be a JSON/YAML object (dictionary)")
-            return False, self.errors, self.warnings
+            self._error('data.type', "Data must be a JSON/YAML object (dictionary)")
+            return
         
         for field in self.required_fields:
             if field not in data:
-                self.errors.append(f"Required field missing: '{field}'")
+                self._error('field.missing', f"Required field missing: '{field}'", field)
             elif data[field] is None or (isinstance(data[field], str) and not data[field].strip()):
-                self.errors.append(f"Required field '{field}' cannot be empty")
+                self._error('field.empty', f"Required field '{field}' cannot be empty", field)
         
         # Additional validations
         self._validate_data_structure(data)
-        
-        return len(self.errors) == 0, self.errors, self.warnings
+        # Keys feed the duplicate check, now or from a cached result later
+        if self.identifier_index is not None or self.cache is not None:
+            self.identifier_keys = sorted(submission_keys(data))
+        if self.claim_index is not None:
+            from claim_index import submission_claims
+            self.claims = submission_claims(data)
+    
+    def _check_duplicates(self, filepath: Optional[str] = None):
+        """Report papers that already exist in the organized corpus.
+
+        ``filepath`` is the submission's own file, which never counts as a
+        duplicate of itself. Indexed files deleted from the tree since the
+        organizer last ran do not count either.
+        """
+        if self.identifier_index is None or not self.identifier_keys:
+            return
+        own_path = Path(filepath).resolve() if filepath else None
+        existing = []
+        for key in self.identifier_keys:
+            for stored in self.identifier_index.lookup(key):
+                path = self.identifier_index.root / stored
+                if stored not in existing and path.resolve() != own_path and path.exists():
+                    existing.append(stored)
+        if existing:
+            severity = 'error' if self.reject_duplicates else 'warning'
+            issue = Issue('paper.duplicate', '', None,
+                          f"Paper already exists in the corpus: {', '.join(existing)}", severity)
+            (self.errors if self.reject_duplicates else self.warnings).append(issue)
+    
+    def _check_similar_claims(self, filepath: Optional[str] = None):
+        """Warn about claims that nearly repeat claims of other submissions in the corpus."""
+        if self.claim_index is None or not self.claims:
+            return
+        from claim_index import describe_match
+        own_path = self.claim_index.relative(filepath) if filepath else None
+        for field, position, text in self.claims:
+            matches = self.claim_index.query(text, limit=3, exclude=own_path)
+            if not matches:
+                continue
+            label = 'Claim' if field == 'claims' else 'Non-reproducible claim'
+            similar = ', '.join(map(describe_match, matches))
+            self.warnings.append(Issue('claim.near_duplicate', f"{field}[{position - 1}].claim", position,
+                                       f"{label} {position} is similar to existing claims: {similar}",
+                                       'warning'))
     
     def _validate_data_structure(self, data: Dict[str, Any]):
         """Validate materials science paper data structure."""
-        # Validate username format
-        if 'username' in data:
-            username = str(data['username']).strip()
-            if not username:
-                self.errors.append("Username cannot be empty")
-            elif not username.replace('-', '').replace('_', '').isalnum():
-                self.errors.append("Username can only contain letters, numbers, hyphens, and underscores")
-            elif len(username) > 39:  # GitHub username limit
-                self.errors.append("Username is too long (max 39 characters)")
-        
-        # Validate claim_type
-        if 'claim_type' in data:
-            claim_type = str(data['claim_type']).strip()
-            if claim_type not in ['custom_code', 'pip_libraries']:
-                self.errors.append("claim_type must be either 'custom_code' or 'pip_libraries'")
-            
-            # Check code_url requirement based on claim_type
-            if claim_type == 'custom_code' and not data.get('code_url'):
-                self.errors.append("code_url is required for custom_code claim type")
+        run_checks(SUBMISSION_CHECKS, data, self.errors, self.warnings)
+
+
+def collect_submission_paths(inputs: Iterable[str]) -> List[str]:
+    """Expand files and directories into a sorted list of submission paths.
+
+    A single ``-`` reads newline-separated paths from stdin, which lets the
+    workflow pipe a changed-file list straight into batch mode.
+    """
+    paths = []
+    for item in inputs:
+        if item == '-':
+            paths.extend(line.strip() for line in sys.stdin if line.strip())
+        elif os.path.isdir(item):
+            paths.extend(
+                str(p) for p in sorted(Path(item).rglob('*'))
+                if p.is_file() and p.suffix.lower() in SUBMISSION_EXTENSIONS
+            )
         else:
-            # If claim_type is missing, assume it requires code_url for backward compatibility
-            if not data.get('code_url'):
-                self.errors.append("code_url is required (or specify claim_type as 'pip_libraries' if using standard libraries)")
-        
-        # Validate paper_title
-        if 'paper_title' in data:
-            if not isinstance(data['paper_title'], str) or not data['paper_title'].strip():
-                self.errors.append("Paper title must be a non-empty string")
-        
-        # Validate URLs
-        url_fields = ['paper_pdf', 'code_url', 'data_url']
-        for field in url_fields:
-            if field in data and data[field]:
-                url = str(data[field]).strip()
-                if not url.startswith(('http://', 'https://')):
-                    self.errors.append(f"{field} must be a valid URL starting with http:// or https://")
-        
-        # Validate identifier (e.g., arxiv ID)
-        if 'identifier' in data:
-            identifier = str(data['identifier']).strip()
-            if not identifier:
-                self.errors.append("Identifier cannot be empty")
-        
-        # Validate claims structure
-        if 'claims' in data:
-            if not isinstance(data['claims'], list):
-                self.errors.append("Claims must be a list")
-            elif not data['claims']:
-                self.errors.append("At least one claim is required")
+            paths.append(item)
+    return paths
+
+
+# Each pool worker keeps one validator for its whole lifetime so the rule
+# setup is paid once per process instead of once per file.
+_worker_validator = None
+
+
+def open_claim_index(path: Optional[str]) -> Optional['ClaimIndex']:
+    """Open the claim similarity index at ``path`` read-only (None without a path)."""
+    if not path:
+        return None
+    # sqlite3 is only imported when claims are compared
+    from claim_index import ClaimIndex
+    return ClaimIndex(path, readonly=True)
+
+
+def _init_worker(required_fields: Optional[List[str]], cache_dir: Optional[str] = None,
+                 identifier_index_dir: Optional[str] = None, reject_duplicates: bool = False,
+                 limits: Optional[ParseLimits] = DEFAULT_LIMITS, fail_fast: bool = False,
+                 claim_index_path: Optional[str] = None, instrument: bool = False):
+    global _worker_validator
+    if instrument:
+        # Start from a fresh recorder; a forked worker inherits the parent's
+        instrumentation.enable()
+    cache = ValidationCache(cache_dir) if cache_dir else None
+    index = IdentifierIndex(identifier_index_dir) if identifier_index_dir else None
+    _worker_validator = SubmissionValidator(required_fields, cache, index, reject_duplicates, limits,
+                                            fail_fast, open_claim_index(claim_index_path))
+
+
+def _validate_one(filepath: str) -> Tuple[str, bool, List[Issue], List[Issue]]:
+    is_valid = _worker_validator.validate_file(filepath)[0]
+    return filepath, is_valid, list(_worker_validator.errors), _worker_validator.warnings
+
+
+def _validate_in_worker(filepath: str):
+    # Ship the worker's timings back with each result (None when disabled)
+    return _validate_one(filepath), instrumentation.current.drain()
+
+
+def validate_paths(paths: List[str], required_fields: List[str] = None,
+                   jobs: int = None, cache_dir: str = None, identifier_index_dir: str = None,
+                   reject_duplicates: bool = False, limits: Optional[ParseLimits] = DEFAULT_LIMITS,
+                   fail_fast: bool = False, structured: bool = False,
+                   claim_index_path: str = None) -> List[Tuple[str, bool, list, list]]:
+    """Validate many files, fanning them out over a process pool.
+
+    Returns ``(filepath, is_valid, errors, warnings)`` tuples in input order,
+    with message strings or, when ``structured``, ``Issue`` records.
+    ``jobs=1`` (or a single path) validates in-process without a pool.
+    ``cache_dir`` enables the shared content-hash result cache and
+    ``identifier_index_dir`` the duplicate-paper check, ``claim_index_path``
+    the similar-claim check. ``fail_fast`` stops each file at its first error.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    initargs = (required_fields, cache_dir, identifier_index_dir, reject_duplicates, limits, fail_fast,
+                claim_index_path)
+    if jobs == 1 or len(paths) <= 1:
+        _init_worker(*initargs)
+        return _render([_validate_one(p) for p in paths], structured)
+
+    # Large chunks keep IPC overhead low; the cap keeps the tail balanced.
+    chunksize = max(1, min(64, len(paths) // (jobs * 4)))
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=initargs + (instrumentation.current.enabled,)) as executor:
+        for result, timings in executor.map(_validate_in_worker, paths, chunksize=chunksize):
+            instrumentation.current.merge(timings)
+            results.append(result)
+    return _render(results, structured)
+
+
+def _render(results: list, structured: bool) -> list:
+    if structured:
+        return results
+    return [(filepath, is_valid, [issue.message for issue in errors], [issue.message for issue in warnings])
+            for filepath, is_valid, errors, warnings in results]
+
+
+def check_links(results: list, checker: 'LinkChecker',
+                limits: Optional[ParseLimits] = DEFAULT_LIMITS) -> list:
+    """Check the URLs of the valid files among structured ``validate_paths`` results.
+
+    Every distinct URL of the batch is fetched once, concurrently. A 404 or
+    410 makes the file invalid; any other HTTP error (bot blocking, rate
+    limits, server errors) or an unreachable server (timeout, DNS) is only a
+    warning, since that may be the server or network rather than the link.
+    """
+    from link_checker import describe, submission_urls
+    urls = {}
+    for filepath, is_valid, _, _ in results:
+        if is_valid:
+            try:
+                urls[filepath] = submission_urls(load_file(filepath, limits))
+            except Exception:
+                continue
+    checked = checker.check(url for pairs in urls.values() for _, url in pairs)
+
+    linked = []
+    for filepath, is_valid, errors, warnings in results:
+        errors, warnings = list(errors), list(warnings)
+        for field, url in urls.get(filepath, ()):
+            result = checked[url]
+            if result.dead:
+                errors.append(Issue('link.dead', field, None,
+                                    f"{field} is unreachable: {url} ({describe(result)})"))
+            elif not result.ok:
+                warnings.append(Issue('link.unchecked', field, None,
+                                      f"{field} could not be checked: {url} ({describe(result)})", 'warning'))
+        linked.append((filepath, not errors, errors, warnings))
+    return linked
+
+
+def print_report(errors: List[Union[str, Issue]], warnings: List[Union[str, Issue]]):
+    """Print the errors and warnings for a single file, as message strings or ``Issue`` records."""
+    if errors:
+        print("VALIDATION ERRORS:")
+        for error in errors:
+            print(f"  ❌ {error}")
+    
+    if warnings:
+        print("\nWARNINGS:")
+        for warning in warnings:
+            print(f"  ⚠️  {warning}")
+
+
+def iter_jsonl(stream: BinaryIO, max_bytes: int = None) -> Iterator[Tuple[int, Optional[bytes]]]:
+    """Yield ``(line_number, line)`` for every non-blank line of a JSON Lines stream.
+
+    Lines longer than ``max_bytes`` are skipped over in bounded chunks and
+    yielded as ``None``.
+    """
+    if max_bytes is None:
+        for number, line in enumerate(stream, 1):
+            if line.strip():
+                yield number, line
+        return
+    
+    number = 0
+    while True:
+        line = stream.readline(max_bytes + 1)
+        if not line:
+            return
+        number += 1
+        if len(line) > max_bytes and not line.endswith(b'\n'):
+            while line and not line.endswith(b'\n'):
+                line = stream.readline(1 << 20)
+            yield number, None
+        elif line.strip():
+            yield number, line
+
+
+def validate_jsonl(stream: BinaryIO, validator: SubmissionValidator
+                   ) -> Iterator[Tuple[int, bytes, bool, List[str], List[str]]]:
+    """Validate a JSON Lines stream one record at a time.
+
+    Yields ``(line_number, line, is_valid, errors, warnings)``; only the
+    current record is held in memory, so feeds of any size stream through.
+    ``line`` is None for a record over the validator's byte limit.
+    """
+    limits = validator.limits
+    for number, line in iter_jsonl(stream, limits.max_bytes if limits else None):
+        if line is None:
+            yield number, None, False, [f"Submission too large: line is over {limits.max_bytes} bytes"], []
+            continue
+        try:
+            data = loads(line, '.json', limits)
+        except LimitError as e:
+            yield number, line, False, [f"Submission too large: {e}"], []
+            continue
+        except ValueError as e:
+            yield number, line, False, [f"Invalid JSON format: {e}"], []
+            continue
+        is_valid, errors, warnings = validator.validate_data(data)
+        yield number, line, is_valid, errors, warnings
+
+
+def run_jsonl(inputs: List[str], required_fields: List[str] = None, identifier_index_dir: str = None,
+              reject_duplicates: bool = False, valid_out: str = None, invalid_out: str = None,
+              limits: Optional[ParseLimits] = DEFAULT_LIMITS, fail_fast: bool = False,
+              claim_index_path: str = None) -> int:
+    """Validate JSON Lines feeds (``-`` for stdin), optionally splitting the records."""
+    index = IdentifierIndex(identifier_index_dir) if identifier_index_dir else None
+    validator = SubmissionValidator(required_fields, identifier_index=index,
+                                    reject_duplicates=reject_duplicates, limits=limits, fail_fast=fail_fast,
+                                    claim_index=open_claim_index(claim_index_path))
+    outputs = {True: valid_out, False: invalid_out}
+    with contextlib.ExitStack() as stack:
+        sinks = {ok: stack.enter_context(open(path, 'wb')) for ok, path in outputs.items() if path}
+        total = failed = 0
+        for source in inputs:
+            if source == '-':
+                name, stream = '<stdin>', sys.stdin.buffer
             else:
-                for i, claim in enumerate(data['claims']):
-                    if not isinstance(claim, dict):
-                        self.errors.append(f"Claim {i+1} must be a dictionary")
-                    else:
-                        if 'claim' not in claim or not str(claim['claim']).strip():
-                            self.errors.append(f"Claim {i+1} must have a non-empty 'claim' field")
-                        
-                        # Validate optional context field
-                        if 'context' in claim:
-                            if not isinstance(claim['context'], str) or not claim['context'].strip():
-                                self.warnings.append(f"Claim {i+1} context should be a non-empty string if provided")
-                        
-                        if 'instruction' not in claim:
-                            self.errors.append(f"Claim {i+1} must have an 'instruction' field")
-                        elif not isinstance(claim['instruction'], list):
-                            self.errors.append(f"Claim {i+1} 'instruction' field must be a list of strings")
-                        elif not claim['instruction']:
-                            self.errors.append(f"Claim {i+1} 'instruction' list cannot be empty")
-                        else:
-                            for j, step in enumerate(claim['instruction']):
-                                if not isinstance(step, str) or not step.strip():
-                                    self.errors.append(f"Claim {i+1} instruction step {j+1} must be a non-empty string")
+                name, stream = source, stack.enter_context(open(source, 'rb', buffering=1 << 20))
+            for number, line, is_valid, errors, warnings in validate_jsonl(stream, validator):
+                total += 1
+                sink = sinks.get(is_valid)
+                if sink is not None and line is not None:
+                    sink.write(line if line.endswith(b'\n') else line + b'\n')
+                if is_valid and not warnings:
+                    continue
+                print(f"\n{'✅' if is_valid else '❌'} {name}:{number}")
+                print_report(errors, warnings)
+                if not is_valid:
+                    failed += 1
+    
+    print(f"\n📊 Summary:")
+    print(f"  - Records validated: {total}")
+    print(f"  - Passed: {total - failed}")
+    print(f"  - Failed: {failed}")
+    
+    if failed or not total:
+        print("\n❌ Validation failed!")
+        return 1
+    print("\n✅ Validation passed!")
+    return 0
+
+
+def run_batch(inputs: List[str], required_fields: List[str] = None, jobs: int = None,
+              cache_dir: str = None, identifier_index_dir: str = None,
+              reject_duplicates: bool = False, limits: Optional[ParseLimits] = DEFAULT_LIMITS,
+              fail_fast: bool = False, link_checker: Optional['LinkChecker'] = None,
+              claim_index_path: str = None) -> int:
+    """Validate every submission in ``inputs`` and print one aggregated report."""
+    paths = collect_submission_paths(inputs)
+    if not paths:
+        print("❌ No submission files to validate")
+        return 1
+    
+    results = validate_paths(paths, required_fields, jobs, cache_dir, identifier_index_dir,
+                             reject_duplicates, limits, fail_fast, structured=True,
+                             claim_index_path=claim_index_path)
+    if cache_dir:
+        ValidationCache(cache_dir).prune()
+    if link_checker is not None:
+        results = check_links(results, link_checker, limits)
+    failed = 0
+    for filepath, is_valid, errors, warnings in results:
+        if is_valid and not warnings:
+            continue
+        print(f"\n{'✅' if is_valid else '❌'} {filepath}")
+        print_report(errors, warnings)
+        if not is_valid:
+            failed += 1
+    
+    print(f"\n📊 Summary:")
+    print(f"  - Files validated: {len(results)}")
+    print(f"  - Passed: {len(results) - failed}")
+    print(f"  - Failed: {failed}")
+    
+    if failed:
+        print("\n❌ Validation failed!")
+        return 1
+    print("\n✅ Validation passed!")
+    return 0
+
+
+class WatchSession:
+    """Validation results of watched directory trees, kept current file by file.
+
+    ``start`` validates every file over a process pool; ``update`` then
+    re-validates only the changed paths in this process with one warm
+    validator, and every other file keeps its result.
+    """
+
+    def __init__(self, inputs: List[str], required_fields: List[str] = None, jobs: int = None,
+                 cache_dir: str = None, identifier_index_dir: str = None, reject_duplicates: bool = False,
+                 limits: Optional[ParseLimits] = DEFAULT_LIMITS, fail_fast: bool = False,
+                 claim_index_path: str = None):
+        self.inputs = [os.path.normpath(item) for item in inputs]
+        self.jobs = jobs
+        self.options = (required_fields, cache_dir, identifier_index_dir, reject_duplicates, limits,
+                        fail_fast, claim_index_path)
+        cache = ValidationCache(cache_dir) if cache_dir else None
+        index = IdentifierIndex(identifier_index_dir) if identifier_index_dir else None
+        self.validator = SubmissionValidator(required_fields, cache, index, reject_duplicates, limits,
+                                             fail_fast, open_claim_index(claim_index_path))
+        self.results: Dict[str, Tuple[bool, List[str], List[str]]] = {}
+    
+    @property
+    def failed(self) -> int:
+        return sum(1 for is_valid, _, _ in self.results.values() if not is_valid)
+    
+    def start(self) -> List[Tuple[str, bool, List[str], List[str]]]:
+        """Validate every file of the watched trees."""
+        paths = [os.path.normpath(p) for p in collect_submission_paths(self.inputs)]
+        (required_fields, cache_dir, identifier_index_dir, reject_duplicates, limits, fail_fast,
+         claim_index_path) = self.options
+        results = validate_paths(paths, required_fields, self.jobs, cache_dir, identifier_index_dir,
+                                 reject_duplicates, limits, fail_fast, claim_index_path=claim_index_path)
+        for filepath, is_valid, errors, warnings in results:
+            self.results[filepath] = (is_valid, errors, warnings)
+        return results
+    
+    def update(self, changed: Iterable[str]) -> List[Tuple[str, Optional[tuple]]]:
+        """Apply a set of changed paths; return ``(path, result)`` per affected file.
+
+        ``result`` is None for a file that was removed. A changed directory
+        is rescanned as a whole.
+        """
+        targets = set()
+        removed = set()
+        for path in map(os.path.normpath, changed):
+            if os.path.isdir(path):
+                current = {os.path.normpath(p) for p in collect_submission_paths([path])}
+                prefix = path + os.sep
+                removed.update(p for p in self.results if p.startswith(prefix) and p not in current)
+                targets |= current
+            elif Path(path).suffix.lower() in SUBMISSION_EXTENSIONS:
+                (targets if os.path.isfile(path) else removed).add(path)
         
-        # Validate non-reproducible claims (optional)
-        if 'non_reproducible_claims' in data:
-            if not isinstance(data['non_reproducible_claims'], list):
-                self.errors.append("Non-reproducible claims must be a list")
-            else:
-                for i, claim in enumerate(data['non_reproducible_claims']):
-                    if not isinstance(claim, dict):
-                        self.errors.append(f"Non-reproducible claim {i+1} must be a dictionary")
-                    else:
-                        if 'claim' not in claim or not str(claim['claim']).strip():
-                            self.errors.append(f"Non-reproducible claim {i+1} must have a non-empty 'claim' field")
-                        
-                        # Reason is optional but recommended
-                        if 'reason' in claim:
-                            if not isinstance(claim['reason'], str) or not claim['reason'].strip():
-                                self.warnings.append(f"Non-reproducible claim {i+1} reason should be a non-empty string if provided")
-                        else:
-                            self.warnings.append(f"Non-reproducible claim {i+1} should include a 'reason' field explaining why it cannot be reproduced")
+        updates = []
+        for path in sorted(removed):
+            if self.results.pop(path, None) is not None:
+                updates.append((path, None))
+        for path in sorted(targets):
+            is_valid, errors, warnings = self.validator.validate_file(path)
+            self.results[path] = (is_valid, errors, warnings)
+            updates.append((path, self.results[path]))
+        return updates
+    
+    def print_summary(self, checked: int, elapsed: float):
+        failed = self.failed
+        print(f"📊 {len(self.results)} files: {len(self.results) - failed} passed, {failed} failed "
+              f"(checked {checked} in {elapsed * 1000:.1f} ms)")
+
+
+def run_watch(inputs: List[str], required_fields: List[str] = None, jobs: int = None,
+              cache_dir: str = None, identifier_index_dir: str = None, reject_duplicates: bool = False,
+              limits: Optional[ParseLimits] = DEFAULT_LIMITS, fail_fast: bool = False,
+              polling: bool = False, debounce: float = 0.2, claim_index_path: str = None) -> int:
+    """Validate the trees in ``inputs``, then re-validate changed files until interrupted."""
+    from file_watcher import InotifyWatcher, debounced, open_watcher
+    missing = [item for item in inputs if not os.path.isdir(item)]
+    if missing:
+        print(f"❌ --watch needs directories: {', '.join(missing)}")
+        return 1
+    
+    session = WatchSession(inputs, required_fields, jobs, cache_dir, identifier_index_dir,
+                           reject_duplicates, limits, fail_fast, claim_index_path)
+    # Watch before the first pass so edits made during it are not lost
+    watcher = open_watcher(session.inputs, polling)
+    try:
+        start = time.perf_counter()
+        results = session.start()
+        for filepath, is_valid, errors, warnings in results:
+            if not is_valid or warnings:
+                print(f"\n{'✅' if is_valid else '❌'} {filepath}")
+                print_report(errors, warnings)
+        print()
+        session.print_summary(len(results), time.perf_counter() - start)
+        mode = 'inotify' if isinstance(watcher, InotifyWatcher) else 'polling'
+        print(f"👀 Watching {', '.join(session.inputs)} ({mode}); press Ctrl-C to stop")
+        
+        for changed in debounced(watcher, debounce):
+            start = time.perf_counter()
+            updates = session.update(changed)
+            elapsed = time.perf_counter() - start
+            if not updates:
+                continue
+            print(f"\n[{time.strftime('%H:%M:%S')}] {len(updates)} changed")
+            for filepath, result in updates:
+                if result is None:
+                    print(f"🗑️  {filepath} removed")
+                    continue
+                is_valid, errors, warnings = result
+                print(f"{'✅' if is_valid else '❌'} {filepath}")
+                if errors or warnings:
+                    print_report(errors, warnings)
+            session.print_summary(len(updates), elapsed)
+    except KeyboardInterrupt:
+        print()
+    finally:
+        watcher.close()
+    return 1 if session.failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Validate submission files for crowdsourcing data collection.",
+        usage="%(prog)s <file_path> [required_field1] [required_field2] ...\n"
+              "       %(prog)s --batch [--jobs N] [--required FIELD ...] <path|dir|-> ...\n"
+              "       %(prog)s --jsonl [--valid-out PATH] [--invalid-out PATH] <feed.jsonl|-> ...\n"
+              "       %(prog)s --watch [--poll] [--cache-dir DIR] [dir ...]",
+    )
+    parser.add_argument('args', nargs='*', help=argparse.SUPPRESS)
+    parser.add_argument('--batch', action='store_true',
+                        help="validate many files/directories (or '-' for a list on stdin)")
+    parser.add_argument('--jsonl', action='store_true',
+                        help="validate JSON Lines feeds, one submission per line ('-' for stdin)")
+    parser.add_argument('--watch', action='store_true',
+                        help="validate directories (default: submissions), then re-validate changed files")
+    parser.add_argument('--poll', action='store_true',
+                        help="with --watch, poll for changes instead of using inotify")
+    parser.add_argument('--debounce', type=float, default=0.2, metavar='SECONDS',
+                        help="with --watch, wait for this long without changes before validating")
+    parser.add_argument('--valid-out', default=None, metavar='PATH',
+                        help="with --jsonl, write the valid records here")
+    parser.add_argument('--invalid-out', default=None, metavar='PATH',
+                        help="with --jsonl, write the invalid records here")
+    parser.add_argument('--jobs', '-j', type=int, default=None,
+                        help="worker processes for --batch (default: CPU count)")
+    parser.add_argument('--required', nargs='+', metavar='FIELD', default=None,
+                        help="required fields for --batch/--jsonl (default: built-in list)")
+    parser.add_argument('--cache-dir', default=None,
+                        help="reuse results for unchanged files from this cache directory")
+    parser.add_argument('--identifier-index', default=None, metavar='DIR',
+                        help="warn when the paper already exists in this identifier index")
+    parser.add_argument('--reject-duplicates', action='store_true',
+                        help="report papers already in the identifier index as errors")
+    parser.add_argument('--claim-index', default=None, metavar='PATH',
+                        help="warn about claims similar to ones in this claim index")
+    parser.add_argument('--fail-fast', action='store_true',
+                        help="stop validating each submission at its first error")
+    parser.add_argument('--check-links', action='store_true',
+                        help="check that the URLs of valid files are reachable (not with --jsonl)")
+    parser.add_argument('--link-cache', default='.link_cache.json', metavar='PATH',
+                        help="TTL cache of link check results (default: %(default)s)")
+    limits = parser.add_argument_group('size limits', "inputs over any limit are rejected while being parsed")
+    for name, default in DEFAULT_LIMITS._asdict().items():
+        limits.add_argument(f"--{name.replace('_', '-')}", type=int, default=default, metavar='N',
+                            help=f"(default: {default})")
+    parser.add_argument('--timing-report', default=None, metavar='PATH',
+                        help="write per-phase timings, counters and slowest files as JSON")
+    parser.add_argument('--cprofile', default=None, metavar='PATH',
+                        help="write a cProfile dump of the run")
+    return parser
 
 
 def main():
-    if len(sys.argv) < 2:
+    parser = build_parser()
+    options = parser.parse_args()
+    with instrumentation.profiled(options.timing_report, options.cprofile):
+        exit_code = run(options)
+    sys.exit(exit_code)
+
+
+def run(options: argparse.Namespace) -> int:
+    limits = ParseLimits(**{name: getattr(options, name) for name in ParseLimits._fields})
+    checker = None
+    if options.check_links:
+        # asyncio and http.client are only imported when links are checked
+        from link_checker import LinkCache, LinkChecker
+        checker = LinkChecker(LinkCache(options.link_cache))
+    if options.jsonl:
+        return run_jsonl(options.args or ['-'], options.required, options.identifier_index,
+                         options.reject_duplicates, options.valid_out, options.invalid_out, limits,
+                         options.fail_fast, options.claim_index)
+    
+    if options.watch:
+        return run_watch(options.args or ['submissions'], options.required, options.jobs, options.cache_dir,
+                         options.identifier_index, options.reject_duplicates, limits, options.fail_fast,
+                         options.poll, options.debounce, options.claim_index)
+    
+    if options.batch:
+        return run_batch(options.args or ['-'], options.required, options.jobs, options.cache_dir,
+                         options.identifier_index, options.reject_duplicates, limits, options.fail_fast,
+                         checker, options.claim_index)
+    
+    if not options.args:
         print("Usage: python validate_submission.py <file_path> [required_field1] [required_field2] ...")
-        sys.exit(1)
+        return 1
     
-    filepath = sys.argv[1]
+    filepath = options.args[0]
     
     # Override with command line arguments if provided
     required_fields = None
-    if len(sys.argv) > 2:
-        required_fields = sys.argv[2:]
+    if len(options.args) > 1:
+        required_fields = options.args[1:]
     
-    validator = SubmissionValidator(required_fields)
+    cache = ValidationCache(options.cache_dir) if options.cache_dir else None
+    index = IdentifierIndex(options.identifier_index) if options.identifier_index else None
+    validator = SubmissionValidator(required_fields, cache, index, options.reject_duplicates, limits,
+                                    options.fail_fast, open_claim_index(options.claim_index))
     is_valid, errors, warnings = validator.validate_file(filepath)
+    if checker is not None:
+        [(_, is_valid, errors, warnings)] = check_links(
+            [(filepath, is_valid, validator.errors, validator.warnings)], checker, limits)
     
     # Print results
-    if errors:
-        print("VALIDATION ERRORS:")
-        for error in errors:
-            print(f"  ❌ {error}")
-    
-    if warnings:
-        print("\nWARNINGS:")
-        for warning in warnings:
-            print(f"  ⚠️  {warning}")
+    print_report(errors, warnings)
     
     if is_valid:
         print("\n✅ Validation passed!")
-        sys.exit(0)
+        return 0
     else:
         print("\n❌ Validation failed!")
-        sys.exit(1)
+        return 1
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
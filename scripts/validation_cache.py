@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk cache of validation results keyed by file content hash.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+
+class ValidationCache:
+    """Store validation results under ``<cache_dir>/<key[:2]>/<key>.json``.
+
+    Entries are written atomically, so several worker processes can share one
+    cache directory. Hits refresh the entry's mtime, which ``prune`` uses to
+    evict the least recently used entries by age and by total size.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024,
+                 max_age: float = 30 * 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(content: bytes, salt: str = '') -> str:
+        """Return the cache key for file content plus a validator/schema salt."""
+        digest = hashlib.sha256(salt.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for ``key`` or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Store ``entry`` for ``key``, replacing any previous value."""
+        path = self._entry_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError:
+            # A cache that cannot be written only costs speed, never correctness
+            pass
+
+    def prune(self) -> int:
+        """Evict entries older than ``max_age``, then the oldest until under ``max_bytes``."""
+        if not self.cache_dir.is_dir():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.cache_dir.glob('*/*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                removed += self._remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            removed += self._remove(path)
+            total -= size
+        return removed
+
+    @staticmethod
+    def _remove(path: Path) -> int:
+        try:
+            path.unlink()
+            return 1
+        except OSError:
+            return 0
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Local HTTP/JSON validation service.
+
+Keeps the validator, its compiled schema and the identifier index loaded in
+one long-running process, so checking a submission costs a request instead
+of a fresh interpreter. It listens on localhost only and answers CORS
+requests, which lets the ``docs/`` submission form run the real rules.
+
+Endpoints:
+    GET  /health    -- ``{"status": "ok", "validator_version": ...}``
+    POST /validate  -- body is one submission (a JSON object) or a JSON array
+                       of submissions; ``Content-Type: application/yaml``
+                       sends one YAML document instead. ``?fail_fast=1``
+                       stops each submission at its first error.
+
+A single submission is answered with ``{"valid": ..., "errors": [...],
+"warnings": [...]}``, where each issue is an object with ``code``, ``path``,
+``claim``, ``message`` and ``severity``; a batch with ``{"results": [...]}``
+in input order.
+"""
+
+import argparse
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from data_loader import DEFAULT_LIMITS, LimitError, ParseError, ParseLimits, loads
+from identifier_index import IdentifierIndex
+from validate_submission import VALIDATOR_VERSION, SubmissionValidator
+
+DEFAULT_PORT = 8765
+
+# Upper bounds on one batch request
+MAX_BATCH = 1000
+MAX_BODY = 64 * 1024 * 1024
+
+YAML_CONTENT_TYPES = ('application/yaml', 'application/x-yaml', 'text/yaml', 'text/x-yaml')
+
+
+class ValidationServer(ThreadingHTTPServer):
+    """Threaded server holding the settings shared by every request.
+
+    Each request builds its own ``SubmissionValidator``, which only holds
+    per-run state; the compiled schema and the identifier index (read-only
+    here) are shared by all threads.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], required_fields: Optional[List[str]] = None,
+                 identifier_index: Optional[IdentifierIndex] = None, reject_duplicates: bool = False,
+                 limits: Optional[ParseLimits] = DEFAULT_LIMITS, allow_origin: str = '*',
+                 verbose: bool = False):
+        super().__init__(address, ValidationHandler)
+        self.required_fields = required_fields
+        self.identifier_index = identifier_index
+        self.reject_duplicates = reject_duplicates
+        self.limits = limits
+        self.allow_origin = allow_origin
+        self.verbose = verbose
+
+    def validator(self, fail_fast: bool = False) -> SubmissionValidator:
+        return SubmissionValidator(self.required_fields, identifier_index=self.identifier_index,
+                                   reject_duplicates=self.reject_duplicates, limits=self.limits,
+                                   fail_fast=fail_fast)
+
+
+def validate_one(validator: SubmissionValidator, data: Any) -> Dict[str, Any]:
+    """Validate parsed data and return the JSON-ready structured result."""
+    is_valid = validator.validate_data(data)[0]
+    return {
+        'valid': is_valid,
+        'errors': [issue._asdict() for issue in validator.errors],
+        'warnings': [issue._asdict() for issue in validator.warnings],
+    }
+
+
+class ValidationHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are separate writes; with Nagle a keep-alive client
+    # would wait for a delayed ACK (~40 ms) on every response
+    disable_nagle_algorithm = True
+    server: ValidationServer
+
+    def _send_json(self, status: int, payload: Any):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self._cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _cors_headers(self):
+        self.send_header('Access-Control-Allow-Origin', self.server.allow_origin)
+        self.send_header('Vary', 'Origin')
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self._cors_headers()
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        # Lets pages served from the internet reach this loopback service
+        self.send_header('Access-Control-Allow-Private-Network', 'true')
+        self.send_header('Access-Control-Max-Age', '600')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_GET(self):
+        if urlsplit(self.path).path == '/health':
+            self._send_json(200, {'status': 'ok', 'validator_version': VALIDATOR_VERSION})
+        else:
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        url = urlsplit(self.path)
+        if url.path != '/validate':
+            self._send_json(404, {'error': f"Unknown path: {self.path}"})
+            return
+        limits = self.server.limits
+        length = int(self.headers.get('Content-Length') or 0)
+        max_body = max(limits.max_bytes, MAX_BODY) if limits is not None else None
+        if max_body is not None and length > max_body:
+            self.close_connection = True
+            self._send_json(413, {'error': f"Request body is {length} bytes (limit {max_body})"})
+            return
+        text = self.rfile.read(length).decode('utf-8', errors='replace')
+        fail_fast = parse_qs(url.query).get('fail_fast', ['0'])[0] not in ('0', 'false', '')
+
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        file_ext = '.yaml' if content_type in YAML_CONTENT_TYPES else '.json'
+        batch = file_ext == '.json' and text.lstrip().startswith('[')
+        if batch and limits is not None:
+            limits = limits._replace(max_bytes=max_body)
+        try:
+            data = loads(text, file_ext, limits)
+        except LimitError as e:
+            self._send_json(413, {'error': f"Submission too large: {e}"})
+            return
+        except ParseError as e:
+            self._send_json(400, {'error': f"Invalid {e.format} format: {e}"})
+            return
+
+        validator = self.server.validator(fail_fast)
+        if not batch:
+            self._send_json(200, validate_one(validator, data))
+        elif len(data) > MAX_BATCH:
+            self._send_json(413, {'error': f"Batch of {len(data)} submissions (limit {MAX_BATCH})"})
+        else:
+            self._send_json(200, {'results': [validate_one(validator, item) for item in data]})
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            sys.stderr.write(f"{time.strftime('%H:%M:%S')} {format % args}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve submission validation over local HTTP/JSON.")
+    parser.add_argument('--host', default='127.0.0.1', help="address to bind (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="port (default: %(default)s)")
+    parser.add_argument('--required', nargs='+', metavar='FIELD', default=None,
+                        help="required fields (default: built-in list)")
+    parser.add_argument('--identifier-index', default=None, metavar='DIR',
+                        help="warn when the paper already exists in this identifier index")
+    parser.add_argument('--reject-duplicates', action='store_true',
+                        help="report papers already in the identifier index as errors")
+    parser.add_argument('--allow-origin', default='*',
+                        help="value of Access-Control-Allow-Origin (default: %(default)s)")
+    parser.add_argument('--verbose', action='store_true', help="log every request to stderr")
+    options = parser.parse_args()
+
+    index = IdentifierIndex(options.identifier_index) if options.identifier_index else None
+    server = ValidationServer((options.host, options.port), options.required, index,
+                              options.reject_duplicates, allow_origin=options.allow_origin,
+                              verbose=options.verbose)
+    print(f"Validating on http://{options.host}:{server.server_address[1]}/validate (Ctrl-C to stop)",
+          flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
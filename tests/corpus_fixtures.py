@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Submission factories shared by the corpus tests.
+"""
+
+import json
+from pathlib import Path
+
+NON_REPRODUCIBLE_CLAIM = {'claim': 'Needs a lab', 'reason': 'Physical synthesis'}
+
+
+def make_submission(username, name, claims=(), claim_type='custom_code', steps=None, context=None,
+                    non_reproducible=1, **fields):
+    """Return a submission of username, titled and identified after the file name.
+
+    ``claims`` holds the claim texts, or a number of ``Claim <i>`` claims.
+    Each claim's instruction is ``steps`` (a list, or a number of ``step <i>``
+    lines), by default installing requirements and running ``<i>.py``.
+    ``fields`` add or replace top-level fields.
+    """
+    if isinstance(claims, int):
+        claims = [f'Claim {i}' for i in range(claims)]
+    if isinstance(steps, int):
+        steps = [f'step {s}' for s in range(steps)]
+    data = {
+        'username': username,
+        'paper_title': f'Paper {name}',
+        'identifier': f'10.1234/{Path(name).stem}',
+        'claim_type': claim_type,
+        'claims': [dict({'claim': text}, **({'context': context} if context else {}),
+                        instruction=list(steps) if steps is not None
+                        else ['pip install -r requirements.txt', f'python {i}.py'])
+                   for i, text in enumerate(claims)],
+        'non_reproducible_claims': [dict(NON_REPRODUCIBLE_CLAIM) for _ in range(non_reproducible)]
+    }
+    data.update(fields)
+    return data
+
+
+def write_organized(root, username, name, claims=(), **kwargs):
+    """Write ``make_submission(username, name, claims, **kwargs)`` to ``root/username/name``."""
+    path = Path(root, username, name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(make_submission(username, name, claims, **kwargs)))
+    return path
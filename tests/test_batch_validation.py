@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test batch validation across many files and worker processes.
+"""
+
+import contextlib
+import io
+import json
+import tempfile
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from validate_submission import collect_submission_paths, run_jsonl, validate_paths
+
+
+VALID_SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'pip_libraries',
+    'claims': [
+        {
+            'claim': 'Test claim',
+            'instruction': ['pip install numpy', 'python script.py']
+        }
+    ]
+}
+
+
+def write_batch(directory, valid=3, invalid=2):
+    """Write a mix of valid and invalid submissions into directory."""
+    for i in range(valid):
+        with open(os.path.join(directory, f'valid_{i}.json'), 'w') as f:
+            json.dump(VALID_SUBMISSION, f)
+    for i in range(invalid):
+        with open(os.path.join(directory, f'invalid_{i}.json'), 'w') as f:
+            json.dump(dict(VALID_SUBMISSION, claims=[]), f)
+    # Non-submission files in a directory are ignored
+    with open(os.path.join(directory, 'notes.txt'), 'w') as f:
+        f.write('not a submission')
+
+
+def test_collect_paths_from_directory():
+    """Test that directories expand to their JSON/YAML files only."""
+    with tempfile.TemporaryDirectory() as tmp:
+        write_batch(tmp)
+        paths = collect_submission_paths([tmp])
+    
+    assert len(paths) == 5
+    assert all(p.endswith('.json') for p in paths)
+    print("✅ Collect paths from directory test passed")
+
+
+def test_batch_results_in_order():
+    """Test serial and pooled batch validation give identical ordered results."""
+    with tempfile.TemporaryDirectory() as tmp:
+        write_batch(tmp)
+        paths = collect_submission_paths([tmp])
+        serial = validate_paths(paths, jobs=1)
+        pooled = validate_paths(paths, jobs=2)
+    
+    assert serial == pooled
+    assert [r[0] for r in pooled] == paths
+    assert sum(1 for r in pooled if r[1]) == 3
+    assert all("at least one claim" in r[2][0].lower() for r in pooled if not r[1])
+    print("✅ Batch results in order test passed")
+
+
+def test_batch_missing_file():
+    """Test that a missing path is reported as a failure, not a crash."""
+    results = validate_paths(['does_not_exist.json'], jobs=1)
+    
+    assert not results[0][1]
+    assert any("File not found" in e for e in results[0][2])
+    print("✅ Batch missing file test passed")
+
+
+def test_jsonl_stream():
+    """Test JSON Lines validation with line numbers and split outputs."""
+    lines = [
+        json.dumps(VALID_SUBMISSION),
+        '',
+        '{"username": ',
+        json.dumps(dict(VALID_SUBMISSION, claims=[])),
+        json.dumps(['not', 'an', 'object']),
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        feed = os.path.join(temp_dir, 'feed.jsonl')
+        valid_out, invalid_out = os.path.join(temp_dir, 'valid.jsonl'), os.path.join(temp_dir, 'invalid.jsonl')
+        with open(feed, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = run_jsonl([feed], valid_out=valid_out, invalid_out=invalid_out)
+        with open(valid_out) as f:
+            valid = f.read().splitlines()
+        with open(invalid_out) as f:
+            invalid = f.read().splitlines()
+    
+    report = output.getvalue()
+    assert exit_code == 1
+    assert valid == [lines[0]]
+    assert invalid == [lines[2], lines[3], lines[4]]
+    assert f"❌ {feed}:3" in report and "Invalid JSON format" in report
+    assert f"❌ {feed}:4" in report and f"❌ {feed}:5" in report
+    assert "Records validated: 4" in report
+    print("✅ JSONL stream test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running batch validation tests...\n")
+    
+    tests = [
+        test_collect_paths_from_directory,
+        test_batch_results_in_order,
+        test_batch_missing_file,
+        test_jsonl_stream
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
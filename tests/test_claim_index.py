@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Test the MinHash/LSH claim index and near-duplicate claim warnings.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from claim_index import ClaimIndex, jaccard, shingles, signature
+from organize_by_username import build_parser, organize_files, run
+from organize_journal import OrganizeJournal
+from validate_submission import SubmissionValidator, open_claim_index
+
+
+CLAIM = "Thin films of MAPbI3 show a bandgap of 1.55 eV after annealing at 100 C for ten minutes."
+REWORDED = "Thin films of MAPbI3 show a band gap of 1.56 eV after annealing at 100 C for ten minutes."
+UNRELATED = "The catalyst converts CO2 to methanol with 40% selectivity at 250 degrees Celsius."
+
+SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'pip_libraries',
+    'claims': [{'claim': CLAIM, 'instruction': ['Step 1']}],
+    'non_reproducible_claims': [{'claim': UNRELATED, 'reason': 'Needs a reactor'}]
+}
+
+
+def test_signature_estimates_similarity():
+    """Test that signatures agree on about as many bins as the shingle sets overlap."""
+    a, b, c = shingles(CLAIM), shingles(REWORDED), shingles(UNRELATED)
+    assert 0.6 < jaccard(a, b) < 0.9 and jaccard(a, c) < 0.1
+
+    def agreement(x, y):
+        return sum(p == q for p, q in zip(signature(x), signature(y))) / len(signature(x))
+    
+    assert abs(agreement(a, b) - jaccard(a, b)) < 0.2
+    assert agreement(a, c) < 0.1
+    # Short texts leave bins empty; they are filled, not left as a shared sentinel
+    assert len(signature(shingles('ab'))) == 120 and signature(shingles('')) is None
+    assert shingles('The  Band-gap!') == shingles('the band gap')
+    print("✅ Signature similarity test passed")
+
+
+def test_index_add_query_remove():
+    """Test queries, exclusion of a submission's own claims and removal across reopening."""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'claims.sqlite')
+        with ClaimIndex(db_path) as index:
+            index.add('alice/a.json', [('claims', 1, CLAIM), ('claims', 2, UNRELATED)])
+            index.add('bob/b.json', [('non_reproducible_claims', 1, REWORDED)])
+            index.flush()
+        
+        with ClaimIndex(db_path, readonly=True) as index:
+            matches = index.query(REWORDED)
+            assert [(m.path, m.field, m.position) for m in matches] == [
+                ('bob/b.json', 'non_reproducible_claims', 1), ('alice/a.json', 'claims', 1)]
+            assert matches[0].similarity == 1.0 and 0.6 < matches[1].similarity < 1.0
+            assert [m.path for m in index.query(REWORDED, exclude='bob/b.json')] == ['alice/a.json']
+            assert index.query("Entirely different words about superconductors.") == []
+        
+        with ClaimIndex(db_path) as index:
+            assert index.remove('alice/a.json') == 2
+            index.flush()
+            assert len(index) == 1 and [m.path for m in index.query(CLAIM)] == ['bob/b.json']
+        
+        # A missing database is an empty index and is not created
+        with ClaimIndex(os.path.join(tmp, 'missing.sqlite'), readonly=True) as index:
+            assert index.query(CLAIM) == [] and not index.exists()
+        assert not os.path.exists(os.path.join(tmp, 'missing.sqlite'))
+    print("✅ Index add/query/remove test passed")
+
+
+def test_similar_claims_after_organize():
+    """Test that the organizer indexes claims and the validator warns about near-duplicates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        source.mkdir()
+        (source / 'paper.json').write_text(json.dumps(SUBMISSION))
+        db_path = str(target / '.claim_index.sqlite')
+        with contextlib.redirect_stdout(io.StringIO()):
+            organize_files(str(source), str(target), claim_index_path=db_path)
+        
+        resubmission = Path(tmp, 'resubmission.json')
+        resubmission.write_text(json.dumps(dict(SUBMISSION, claims=[
+            {'claim': 'A new claim about perovskite stability.', 'instruction': ['Step 1']},
+            {'claim': REWORDED, 'instruction': ['Step 1']}], non_reproducible_claims=[])))
+        validator = SubmissionValidator(claim_index=open_claim_index(db_path))
+        is_valid, errors, warnings = validator.validate_file(str(resubmission))
+        assert is_valid
+        [issue] = validator.warnings
+        assert issue.code == 'claim.near_duplicate' and issue.path == 'claims[1].claim' and issue.claim == 2
+        assert 'test_user/paper.json claims[0]' in issue.message
+        
+        # An organized file is not a duplicate of itself
+        is_valid, errors, warnings = validator.validate_file(str(target / 'test_user' / 'paper.json'))
+        assert is_valid and not warnings
+    print("✅ Similar claims after organize test passed")
+
+
+def test_organizer_claim_index_is_opt_in():
+    """Test that the organizer creates the index only on request and then keeps it up to date."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        db_path = target / '.claim_index.sqlite'
+        
+        def organize(name, claim, *flags):
+            source.mkdir(exist_ok=True)
+            claims = [{'claim': claim, 'instruction': ['Step 1']}]
+            (source / name).write_text(json.dumps(dict(SUBMISSION, claims=claims)))
+            argv = sys.argv
+            sys.argv = ['organize_by_username.py', str(source), str(target), *flags]
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    assert run(build_parser()) == 0
+            finally:
+                sys.argv = argv
+        
+        organize('a.json', CLAIM)
+        assert not db_path.exists()
+        organize('b.json', UNRELATED, '--claim-index')
+        organize('c.json', REWORDED)
+        with ClaimIndex(str(db_path), readonly=True) as index:
+            assert sorted(match.path for match in index.query(CLAIM, threshold=0.5)) == \
+                ['test_user/a.json', 'test_user/c.json']
+        organize('d.json', CLAIM, '--no-claim-index')
+        with ClaimIndex(str(db_path), readonly=True) as index:
+            assert 'test_user/d.json' not in {match.path for match in index.query(CLAIM)}
+    print("✅ Organizer claim index opt-in test passed")
+
+
+def test_removed_files_stop_matching():
+    """Test that files deleted from the tree are dropped from the claim index by the organizer."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        source.mkdir()
+        paths = {'journal_path': str(target / '.organize_journal.jsonl'),
+                 'claim_index_path': str(target / '.claim_index.sqlite')}
+        
+        def organize(name, claim):
+            claims = [{'claim': claim, 'instruction': ['Step 1']}]
+            (source / name).write_text(json.dumps(dict(SUBMISSION, claims=claims)))
+            with contextlib.redirect_stdout(io.StringIO()):
+                organize_files(str(source), str(target), **paths)
+            with ClaimIndex(paths['claim_index_path'], readonly=True) as index:
+                return sorted(match.path for match in index.query(CLAIM, threshold=0.5))
+        
+        organize('a.json', CLAIM)
+        assert organize('b.json', REWORDED) == ['test_user/a.json', 'test_user/b.json']
+        # Noticed when the same content is submitted again
+        os.remove(target / 'test_user' / 'a.json')
+        assert organize('again.json', CLAIM) == ['test_user/again.json', 'test_user/b.json']
+        # Noticed when the journal is compacted against the tree
+        os.remove(target / 'test_user' / 'b.json')
+        with mock.patch.object(OrganizeJournal, 'needs_compaction', return_value=True):
+            assert organize('c.json', UNRELATED) == ['test_user/again.json']
+    print("✅ Removed files stop matching test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running claim index tests...\n")
+    
+    tests = [
+        test_signature_estimates_similarity,
+        test_index_add_query_remove,
+        test_similar_claims_after_organize,
+        test_organizer_claim_index_is_opt_in,
+        test_removed_files_stop_matching
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
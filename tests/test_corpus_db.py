@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test the incremental SQLite corpus database.
+"""
+
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import sqlite3
+
+from corpus_db import CorpusDB
+from corpus_fixtures import write_organized
+
+
+def test_build_and_search():
+    """Test ingest of all tables and full-text search."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'organized')
+        write_organized(root, 'alice', 'a.json', ['The bandgap is 3.2 eV', 'Conductivity is high'])
+        write_organized(root, 'bob', 'b.json', ['Adsorption capacity of MOF-74'], claim_type='pip_libraries')
+        
+        with CorpusDB(os.path.join(tmp, 'corpus.sqlite')) as db:
+            stats = db.build(root)
+            hits = db.search_claims('bandgap')
+            steps = db.search_claims('requirements')
+            pip_users = db.submissions(claim_type='pip_libraries')
+            claims = db.claims('alice/a.json')
+            non_reproducible = db.conn.execute("SELECT COUNT(*) FROM non_reproducible_claims").fetchone()[0]
+    
+    assert stats['added'] == 2 and stats['errors'] == 0
+    assert [h['path'] for h in hits] == ['alice/a.json']
+    assert len(steps) == 3
+    assert [s['username'] for s in pip_users] == ['bob']
+    assert claims[1]['instruction'] == ['pip install -r requirements.txt', 'python 1.py']
+    assert non_reproducible == 2
+    print("✅ Build and search test passed")
+
+
+def test_incremental_rebuild():
+    """Test that only changed files are re-ingested and removals are applied."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'organized')
+        changed = write_organized(root, 'alice', 'a.json', ['The bandgap is 3.2 eV'])
+        removed = write_organized(root, 'bob', 'b.json', ['Bandgap of perovskite'])
+        write_organized(root, 'carol', 'c.json', ['Ionic conductivity'])
+        
+        with CorpusDB(os.path.join(tmp, 'corpus.sqlite')) as db:
+            db.build(root)
+            time.sleep(0.01)
+            write_organized(root, 'alice', 'a.json', ['The melting point is 1200 K'])
+            removed.unlink()
+            stats = db.build(root)
+            
+            assert stats == {'added': 0, 'updated': 1, 'removed': 1, 'unchanged': 1, 'errors': 0}
+            assert db.search_claims('bandgap') == []
+            assert [h['path'] for h in db.search_claims('melting')] == ['alice/a.json']
+            assert db.conn.execute("SELECT COUNT(*) FROM claims").fetchone()[0] == 2
+            assert db.conn.execute("SELECT COUNT(*) FROM instruction_steps").fetchone()[0] == 4
+            assert db.build(root)['unchanged'] == 2
+    print("✅ Incremental rebuild test passed")
+
+
+def test_search_literal_terms():
+    """Test that punctuation in queries is matched as text, not FTS5 syntax."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'organized')
+        write_organized(root, 'alice', 'a.json', ['The band-gap is 1.2 eV', "Li-S cells don't fade"])
+        write_organized(root, 'bob', 'b.json', ['A gap of 2.5 eV in the "wide" band'])
+        
+        with CorpusDB(os.path.join(tmp, 'corpus.sqlite')) as db:
+            db.build(root)
+            def paths(query, **kwargs):
+                return [h['path'] for h in db.search_claims(query, **kwargs)]
+            
+            assert paths('band-gap') == ['alice/a.json']
+            assert paths('1.2 eV') == ['alice/a.json']
+            assert paths('Li-S') == ['alice/a.json']
+            assert paths("don't") == ['alice/a.json']
+            assert paths('"wide" band') == ['bob/b.json']
+            assert sorted(paths('gap eV')) == ['alice/a.json', 'bob/b.json']
+            assert paths('   ') == []
+            assert sorted(paths('fade OR wide', raw=True)) == ['alice/a.json', 'bob/b.json']
+            try:
+                db.search_claims('band-gap', raw=True)
+                assert False, "raw FTS5 syntax error was not raised"
+            except sqlite3.OperationalError:
+                pass
+    print("✅ Literal search terms test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running corpus database tests...\n")
+    
+    tests = [
+        test_build_and_search,
+        test_incremental_rebuild,
+        test_search_literal_terms
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the compact in-memory corpus model.
+"""
+
+import functools
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import corpus_fixtures
+from corpus_model import Claim, Corpus, Submission
+
+# Submissions whose claims all carry a context
+make_submission = functools.partial(corpus_fixtures.make_submission, context='DFT with PBE')
+
+
+def test_load_and_round_trip():
+    """Test loading an organized tree, error counting and rebuilding the submitted form."""
+    with tempfile.TemporaryDirectory() as tmp:
+        submissions = {
+            'alice/a.json': make_submission('alice', 'a', ['The bandgap is 3.2 eV', 'Conductivity is high']),
+            'bob/b.json': make_submission('bob', 'b', ['Adsorption capacity of MOF-74'], 'pip_libraries'),
+        }
+        for relative, data in submissions.items():
+            Path(tmp, relative).parent.mkdir(parents=True, exist_ok=True)
+            Path(tmp, relative).write_text(json.dumps(data))
+        Path(tmp, 'bob', 'broken.json').write_text('{')
+        corpus = Corpus.load(tmp)
+    
+    assert [submission.path for submission in corpus] == ['alice/a.json', 'bob/b.json']
+    assert corpus.errors == 1
+    for submission in corpus:
+        assert submission.to_dict() == submissions[submission.path]
+    assert corpus.stats() == {'submissions': 2, 'claims': 3, 'steps': 6, 'distinct_steps': 3,
+                              'interned_strings': 7, 'errors': 1}
+    print("✅ Load and round trip test passed")
+
+
+def test_compact_storage():
+    """Test slots, shared strings and the flat step array."""
+    first = json.loads(json.dumps(make_submission('alice', 'a', ['One', 'Two'])))
+    second = json.loads(json.dumps(make_submission('alice', 'b', ['Three'])))
+    assert first['username'] is not second['username']
+    corpus = Corpus.from_records([('alice/a.json', first), ('alice/b.json', second)])
+    a, b = corpus.records
+    
+    assert not hasattr(a, '__dict__') and not hasattr(a.claims[0], '__dict__')
+    assert a.username is b.username and a.claims[0].context is b.claims[0].context
+    assert corpus.step_table == ['pip install -r requirements.txt', 'python 0.py', 'python 1.py']
+    assert list(corpus.step_ids) == [0, 1, 0, 2, 0, 1]
+    assert [(claim.start, claim.stop) for claim in a.claims + b.claims] == [(0, 2), (2, 4), (4, 6)]
+    assert list(b.claims[0].steps()) == ['pip install -r requirements.txt', 'python 0.py']
+    assert corpus.common_steps(1) == [('pip install -r requirements.txt', 3)]
+    print("✅ Compact storage test passed")
+
+
+def test_iterator_queries():
+    """Test filtered submission and claim iterators."""
+    corpus = Corpus.from_records([
+        ('alice/a.json', make_submission('alice', 'a', ['One', 'Two'])),
+        ('bob/b.json', make_submission('bob', 'b', ['Three'], 'pip_libraries')),
+    ])
+    
+    submissions = corpus.submissions(claim_type='pip_libraries')
+    assert not isinstance(submissions, list)
+    assert [submission.path for submission in submissions] == ['bob/b.json']
+    pairs = list(corpus.claims(username='alice'))
+    assert all(isinstance(s, Submission) and isinstance(c, Claim) for s, c in pairs)
+    assert [claim.text for _, claim in pairs] == ['One', 'Two'] and len(pairs[0][1]) == 2
+    try:
+        next(corpus.submissions(color='red'))
+    except ValueError as e:
+        assert 'color' in str(e)
+    else:
+        raise AssertionError("unknown field accepted")
+    print("✅ Iterator queries test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running corpus model tests...\n")
+    
+    tests = [
+        test_load_and_round_trip,
+        test_compact_storage,
+        test_iterator_queries
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test packing the organized corpus into compressed segments.
+"""
+
+import gzip
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from corpus_fixtures import write_organized
+from corpus_pack import CorpusPacker, PackedCorpus
+
+
+def test_pack_and_lookup():
+    """Test scans, user and identifier lookups across several segments."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, pack_dir = os.path.join(tmp, 'organized'), os.path.join(tmp, 'packed')
+        for i in range(50):
+            write_organized(root, f'user_{i % 5}', f'{i}.json', identifier=f'10.1234/paper.{i}')
+        
+        with CorpusPacker(pack_dir, segment_bytes=1024) as packer:
+            stats = packer.pack(root)
+        segments = sorted(Path(pack_dir).glob('segment-*.jsonl.gz'))
+        with gzip.open(segments[0], 'rt') as f:
+            first = json.loads(f.readline())
+        
+        with PackedCorpus(pack_dir) as corpus:
+            scanned = [record['path'] for record in corpus.scan()]
+            alice = corpus.by_user('user_3')
+            found = corpus.by_identifier('https://doi.org/10.1234/PAPER.7')
+            missing = corpus.by_user('nobody') + corpus.by_identifier('10.1234/none')
+    
+    assert stats['added'] == 50 and len(segments) > 1
+    assert first['path'] in scanned and len(scanned) == 50
+    assert sorted(record['path'] for record in alice) == sorted(f'user_3/{i}.json' for i in range(3, 50, 5))
+    assert [record['data']['identifier'] for record in found] == ['10.1234/paper.7']
+    assert missing == []
+    print("✅ Pack and lookup test passed")
+
+
+def test_incremental_pack():
+    """Test that changed files supersede old records and removed files vanish."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, pack_dir = os.path.join(tmp, 'organized'), os.path.join(tmp, 'packed')
+        changed = write_organized(root, 'alice', 'a.json')
+        removed = write_organized(root, 'alice', 'b.json')
+        write_organized(root, 'bob', 'c.json')
+        with CorpusPacker(pack_dir) as packer:
+            packer.pack(root)
+        
+        write_organized(root, 'alice', 'a.json', paper_title='Revised')
+        stat = changed.stat()
+        os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        removed.unlink()
+        with CorpusPacker(pack_dir) as packer:
+            stats = packer.pack(root)
+        
+        with PackedCorpus(pack_dir) as corpus:
+            titles = {record['path']: record['data']['paper_title'] for record in corpus.scan()}
+            alice = [record['data']['paper_title'] for record in corpus.by_user('alice')]
+            gone = corpus.by_identifier('10.1234/b')
+            live = len(corpus)
+    
+    assert (stats['updated'], stats['removed'], stats['unchanged']) == (1, 1, 1)
+    assert titles == {'alice/a.json': 'Revised', 'bob/c.json': 'Paper c.json'}
+    assert alice == ['Revised'] and gone == [] and live == 2
+    print("✅ Incremental pack test passed")
+
+
+def test_interrupted_pack_is_discarded():
+    """Test that records appended without a commit are dropped on reopen."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, pack_dir = os.path.join(tmp, 'organized'), os.path.join(tmp, 'packed')
+        write_organized(root, 'alice', 'a.json')
+        with CorpusPacker(pack_dir) as packer:
+            packer.pack(root)
+        
+        packer = CorpusPacker(pack_dir)
+        packer.append('alice/ghost.json', {'username': 'alice', 'identifier': '10.1234/ghost'})
+        packer.close()
+        
+        with CorpusPacker(pack_dir) as packer:
+            packer.pack(root)
+        with PackedCorpus(pack_dir) as corpus:
+            paths = [record['path'] for record in corpus.scan()]
+            ghosts = corpus.by_identifier('10.1234/ghost')
+    
+    assert paths == ['alice/a.json'] and ghosts == []
+    print("✅ Interrupted pack test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running corpus pack tests...\n")
+    
+    tests = [
+        test_pack_and_lookup,
+        test_incremental_pack,
+        test_interrupted_pack_is_discarded
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
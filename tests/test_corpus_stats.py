@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test the vectorized corpus statistics and their incremental refresh.
+"""
+
+import functools
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+import corpus_fixtures
+from corpus_stats import CorpusStats, render_markdown, url_host
+
+# Submissions of a given shape, with a paper PDF and code URL unless overridden
+write_organized = functools.partial(corpus_fixtures.write_organized, claims=2, steps=3,
+                                    paper_pdf='https://arxiv.org/pdf/2301.00001.pdf',
+                                    code_url='https://github.com/org/repo')
+
+
+def test_summary():
+    """Test group-by summaries, category counts and histograms."""
+    with tempfile.TemporaryDirectory() as tmp:
+        write_organized(tmp, 'alice', 'a.json', claims=2, steps=3)
+        write_organized(tmp, 'alice', 'b.json', claims=1, steps=1, non_reproducible=0,
+                        claim_type='pip_libraries', code_url='https://www.GitLab.com/x')
+        write_organized(tmp, 'bob', 'c.json', claims=0, non_reproducible=0, code_url=None)
+        stats = CorpusStats()
+        assert stats.refresh(tmp)['added'] == 3
+        summary = stats.summary()
+    
+    assert summary['totals'] == {'submissions': 3, 'users': 2, 'claims': 3, 'non_reproducible_claims': 1,
+                                 'steps': 7, 'reproducible_share': 0.75}
+    assert summary['users'][0] == {'username': 'alice', 'submissions': 2, 'claims': 3,
+                                   'non_reproducible_claims': 1, 'steps': 7}
+    assert summary['claim_types'] == {'custom_code': 2, 'pip_libraries': 1}
+    assert summary['hosts']['code_url'] == {'github.com': 1, 'gitlab.com': 1}
+    assert summary['histograms']['claims_per_submission'] == [1, 1, 1]
+    assert summary['histograms']['steps_per_claim'] == [0, 1, 0, 2]
+    # bob's submission has no claims at all and is left out of the share histogram
+    assert summary['histograms']['reproducible_share']['counts'] == [0] * 6 + [1, 0, 0, 1]
+    assert '| alice | 2 | 3 | 1 |' in render_markdown(summary)
+    assert url_host('not a url') == '' and url_host(None) == ''
+    json.dumps(summary)
+    print("✅ Summary test passed")
+
+
+def test_incremental_refresh():
+    """Test that a refresh parses only changed files and matches a full rebuild."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'organized')
+        state = os.path.join(tmp, 'stats.npz')
+        for i in range(6):
+            write_organized(root, f'user_{i % 3}', f's{i}.json', claims=i % 3 + 1)
+        stats = CorpusStats(state)
+        stats.refresh(root)
+        stats.save()
+        
+        write_organized(root, 'user_0', 's0.json', claims=5, steps=1)
+        os.remove(os.path.join(root, 'user_1', 's1.json'))
+        write_organized(root, 'user_9', 'new.json')
+        # Touched but unchanged content is not re-parsed
+        os.utime(os.path.join(root, 'user_2', 's2.json'), ns=(1, 1))
+        Path(root, 'user_2', 'broken.json').write_text('{')
+        
+        stats = CorpusStats(state)
+        assert len(stats) == 6
+        counts = stats.refresh(root)
+        assert counts == {'added': 1, 'updated': 1, 'removed': 1, 'unchanged': 4, 'errors': 1}
+        full = CorpusStats()
+        full.refresh(root)
+        assert stats.summary() == full.summary()
+        # 1+2+3+1+2+3 claims, with s0 now 5 claims, s1 (2) removed and new.json (2) added
+        assert stats.summary()['totals']['claims'] == 16
+    print("✅ Incremental refresh test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running corpus stats tests...\n")
+    
+    tests = [
+        test_summary,
+        test_incremental_refresh
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test the shared JSON/YAML loader.
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import yaml
+
+import data_loader
+from validate_submission import SubmissionValidator
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts')
+
+YAML_TEXT = """
+username: test_user
+paper_title: "Test: Paper"
+claims:
+  - claim: Test claim
+    instruction: [Step 1, 2]
+    date: 2024-01-01
+"""
+
+
+def test_json_does_not_import_yaml():
+    """Test that validating a JSON file never imports PyYAML."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / 'submission.json'
+        path.write_text('{"username": "test_user"}')
+        code = (f"import sys; sys.path.insert(0, {SCRIPTS!r}); "
+                f"from validate_submission import SubmissionValidator; "
+                f"SubmissionValidator().validate_file({str(path)!r}); "
+                f"print('yaml' in sys.modules)")
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+        assert output.strip() == 'False'
+    print("✅ Lazy YAML import test passed")
+
+
+def test_loaders_agree():
+    """Test that the C and pure-Python loaders build the same data."""
+    expected = yaml.safe_load(YAML_TEXT)
+    assert data_loader.loads(YAML_TEXT, '.yaml') == expected
+    try:
+        data_loader._yaml = (yaml.SafeLoader, yaml.YAMLError)
+        assert data_loader.loads(YAML_TEXT, '.yml') == expected
+        try:
+            data_loader.loads('key: [unclosed', '.yaml')
+            assert False, "invalid YAML was accepted"
+        except data_loader.ParseError as e:
+            assert e.format == 'YAML' and isinstance(e.error, yaml.YAMLError)
+    finally:
+        data_loader._yaml = None
+    print("✅ Loaders agree test passed")
+
+
+def test_error_messages():
+    """Test that parse failures keep the validator's error messages."""
+    validator = SubmissionValidator()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cases = {'bad.json': '{"username": ', 'bad.yaml': 'key: [unclosed', 'list.yaml': '- a\n- b\n'}
+        for name, content in cases.items():
+            (Path(temp_dir) / name).write_text(content)
+        
+        _, errors, _ = validator.validate_file(os.path.join(temp_dir, 'bad.json'))
+        assert errors[0].startswith('Invalid JSON format: Expecting value')
+        bad_yaml = os.path.join(temp_dir, 'bad.yaml')
+        _, errors, _ = validator.validate_file(bad_yaml)
+        assert errors[0].startswith('Invalid YAML format: ')
+        assert f'in "{bad_yaml}", line 1' in errors[0] and '<unicode string>' not in errors[0]
+        try:
+            data_loader.load_file(bad_yaml)
+            assert False, "invalid YAML was accepted"
+        except data_loader.ParseError as e:
+            assert f'in "{bad_yaml}"' in str(e)
+        _, errors, _ = validator.validate_file(os.path.join(temp_dir, 'list.yaml'))
+        assert errors == ["Data must be a JSON/YAML object (dictionary)"]
+        try:
+            data_loader.load_file(os.path.join(temp_dir, 'notes.txt'))
+            assert False, "unsupported extension was accepted"
+        except ValueError as e:
+            assert str(e) == "Unsupported file type: .txt"
+    print("✅ Error messages test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running data loader tests...\n")
+    
+    tests = [
+        test_json_does_not_import_yaml,
+        test_loaders_agree,
+        test_error_messages
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
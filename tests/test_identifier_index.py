@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Test identifier normalization and duplicate-paper detection.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from identifier_index import IdentifierIndex, normalize_identifier
+from organize_by_username import organize_files
+from validate_submission import SubmissionValidator
+
+
+SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://arxiv.org/pdf/2301.12345v2.pdf',
+    'identifier': '10.1038/s41563-023-01234-5',
+    'claim_type': 'pip_libraries',
+    'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}]
+}
+
+
+def test_normalize_identifier():
+    """Test that equivalent DOI/arXiv/URL spellings share one key."""
+    assert normalize_identifier('https://doi.org/10.1038/S41563-023-01234-5') == \
+        normalize_identifier('doi:10.1038/s41563-023-01234-5') == 'doi:10.1038/s41563-023-01234-5'
+    assert normalize_identifier('arXiv:2301.12345v2') == \
+        normalize_identifier('https://arxiv.org/abs/2301.12345') == 'arxiv:2301.12345'
+    assert normalize_identifier('cond-mat/0102536v1') == 'arxiv:cond-mat/0102536'
+    assert normalize_identifier('https://www.Example.com/paper/') == 'url:example.com/paper'
+    assert normalize_identifier('  ') is None
+    print("✅ Normalize identifier test passed")
+
+
+def test_index_shards_roundtrip():
+    """Test that flushed entries are found by a fresh index instance."""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = IdentifierIndex(os.path.join(tmp, 'idx'))
+        index.add('doi:10.1/a', 'alice/a.json')
+        index.add('doi:10.1/a', 'bob/a.json')
+        index.add('arxiv:2301.00001', 'alice/b.json')
+        index.remove('doi:10.1/a', 'bob/a.json')
+        index.flush()
+        
+        reopened = IdentifierIndex(os.path.join(tmp, 'idx'))
+        assert reopened.lookup('doi:10.1/a') == ['alice/a.json']
+        assert reopened.lookup('arxiv:2301.00001') == ['alice/b.json']
+        assert reopened.lookup('doi:10.1/missing') == []
+    print("✅ Index shards roundtrip test passed")
+
+
+def test_duplicate_detected_after_organize():
+    """Test that the organizer indexes papers and the validator flags duplicates."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        source.mkdir()
+        (source / 'paper.json').write_text(json.dumps(SUBMISSION))
+        index_dir = str(target / '.identifier_index')
+        with contextlib.redirect_stdout(io.StringIO()):
+            organize_files(str(source), str(target), identifier_index_dir=index_dir)
+        
+        # Same paper, cited by its DOI URL instead of the bare DOI
+        resubmission = Path(tmp, 'resubmission.json')
+        resubmission.write_text(json.dumps(dict(SUBMISSION, identifier='https://doi.org/10.1038/S41563-023-01234-5')))
+        warn = SubmissionValidator(identifier_index=IdentifierIndex(index_dir))
+        reject = SubmissionValidator(identifier_index=IdentifierIndex(index_dir), reject_duplicates=True)
+        
+        is_valid, errors, warnings = warn.validate_file(str(resubmission))
+        assert is_valid and any('test_user/paper.json' in w for w in warnings)
+        is_valid, errors, warnings = reject.validate_file(str(resubmission))
+        assert not is_valid and any('already exists' in e for e in errors)
+        
+        # An organized file is not a duplicate of itself
+        is_valid, errors, warnings = reject.validate_file(str(target / 'test_user' / 'paper.json'))
+        assert is_valid and not warnings
+    print("✅ Duplicate detection test passed")
+
+
+def test_deleted_files_leave_the_index():
+    """Test that a paper deleted from the tree is no longer reported or kept in the index."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        source.mkdir()
+        (source / 'paper.json').write_text(json.dumps(SUBMISSION))
+        paths = {'journal_path': str(target / '.organize_journal.jsonl'),
+                 'identifier_index_dir': str(target / '.identifier_index')}
+        with contextlib.redirect_stdout(io.StringIO()):
+            organize_files(str(source), str(target), **paths)
+        key = normalize_identifier(SUBMISSION['identifier'])
+        assert IdentifierIndex(paths['identifier_index_dir']).lookup(key) == ['test_user/paper.json']
+        
+        # Deleted by hand: not a duplicate any more, even before the organizer notices
+        os.remove(target / 'test_user' / 'paper.json')
+        resubmission = Path(tmp, 'resubmission.json')
+        resubmission.write_text(json.dumps(SUBMISSION))
+        reject = SubmissionValidator(identifier_index=IdentifierIndex(paths['identifier_index_dir']),
+                                     reject_duplicates=True)
+        is_valid, errors, warnings = reject.validate_file(str(resubmission))
+        assert is_valid and not warnings
+        
+        # The organizer drops the stale path when the same content comes back
+        (source / 'again.json').write_text(json.dumps(SUBMISSION))
+        with contextlib.redirect_stdout(io.StringIO()):
+            organize_files(str(source), str(target), **paths)
+        assert IdentifierIndex(paths['identifier_index_dir']).lookup(key) == ['test_user/again.json']
+    print("✅ Deleted files leave the index test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running identifier index tests...\n")
+    
+    tests = [
+        test_normalize_identifier,
+        test_index_shards_roundtrip,
+        test_duplicate_detected_after_organize,
+        test_deleted_files_leave_the_index
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
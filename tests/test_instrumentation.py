@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the opt-in timing and counters instrumentation.
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import instrumentation
+from validate_submission import validate_paths
+
+
+SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/test',
+    'claim_type': 'pip_libraries',
+    'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}]
+}
+
+
+def test_disabled_is_noop():
+    """Test that the default instrumentation records nothing."""
+    assert not instrumentation.current.enabled
+    with instrumentation.current.phase('parse'):
+        pass
+    instrumentation.current.count('files')
+    assert instrumentation.current.drain() is None
+    print("✅ Disabled instrumentation test passed")
+
+
+def test_drain_and_merge():
+    """Test that worker snapshots fold into the parent's report."""
+    worker = instrumentation.Instrumentation(slowest=2)
+    worker.add_time('parse', 0.5)
+    worker.count('files', 3)
+    for seconds, path in ((0.1, 'a.json'), (0.3, 'b.json'), (0.2, 'c.json')):
+        worker.record_file(path, seconds)
+    
+    parent = instrumentation.Instrumentation(slowest=2)
+    parent.add_time('parse', 0.25)
+    parent.merge(worker.drain())
+    report = parent.report()
+    
+    assert report['phases']['parse'] == {'seconds': 0.75, 'calls': 2}
+    assert report['counters'] == {'files': 3}
+    assert [entry['path'] for entry in report['slowest_files']] == ['b.json', 'c.json']
+    assert worker.drain() == {'phases': {}, 'counters': {}, 'files': []}
+    print("✅ Drain and merge test passed")
+
+
+def test_timing_report_for_batch():
+    """Test that a profiled batch run writes phases, counters and slow files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for i in range(3):
+            path = Path(temp_dir) / f"submission_{i}.json"
+            path.write_text(json.dumps(dict(SUBMISSION, paper_title=f"Paper {i}")))
+            paths.append(str(path))
+        report_path = os.path.join(temp_dir, 'timing.json')
+        
+        with instrumentation.profiled(report_path):
+            results = validate_paths(paths, jobs=1)
+        assert all(is_valid for _, is_valid, _, _ in results)
+        assert not instrumentation.current.enabled
+        
+        with open(report_path) as f:
+            report = json.load(f)
+        assert {'read', 'parse', 'rules', 'validate_file'} <= set(report['phases'])
+        assert report['phases']['parse']['calls'] == 3
+        assert report['counters']['bytes_read'] == sum(os.path.getsize(p) for p in paths)
+        assert len(report['slowest_files']) == 3
+    print("✅ Timing report test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running instrumentation tests...\n")
+    
+    tests = [
+        test_disabled_is_noop,
+        test_drain_and_merge,
+        test_timing_report_for_batch
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Test the link checker against a local stub HTTP server (no network access).
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from link_checker import LinkCache, LinkChecker, LinkResult
+from validate_submission import run_batch
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _respond(self, body: bool):
+        with self.server.lock:
+            self.server.requests.append((self.command, self.path))
+            self.server.active += 1
+            self.server.peak = max(self.server.peak, self.server.active)
+        try:
+            path = self.path
+            if path.startswith('/slow'):
+                time.sleep(0.5)
+            if path.startswith('/nohead') and self.command == 'HEAD':
+                status = 405
+            elif path.startswith('/missing'):
+                status = 404
+            elif path.startswith('/forbidden'):
+                status = 403
+            elif path.startswith('/busy'):
+                status = 503
+            else:
+                status = 301 if path.startswith('/redirect') else 200
+            self.send_response(status)
+            if status == 301:
+                self.send_header('Location', '/ok')
+            payload = b'stub body' if body else b''
+            self.send_header('Content-Length', str(len(b'stub body')))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with self.server.lock:
+                self.server.active -= 1
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def do_GET(self):
+        self._respond(body=True)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextlib.contextmanager
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = []
+    server.connections = server.active = server.peak = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_status_and_fallbacks():
+    """Test HEAD, GET fallback, redirects, HTTP errors and timeouts."""
+    with stub_server() as (server, base):
+        checker = LinkChecker(timeout=0.2)
+        results = checker.check([f"{base}/ok", f"{base}/nohead", f"{base}/redirect",
+                                 f"{base}/missing", f"{base}/forbidden", f"{base}/slow", f"{base}/ok"])
+    
+    assert results[f"{base}/ok"] == LinkResult(f"{base}/ok", 200)
+    assert results[f"{base}/nohead"].ok
+    assert ('GET', '/nohead') in server.requests
+    assert results[f"{base}/redirect"].status == 200
+    assert results[f"{base}/missing"].status == 404 and results[f"{base}/missing"].dead
+    forbidden = results[f"{base}/forbidden"]
+    assert forbidden.status == 403 and not forbidden.ok and not forbidden.dead
+    assert results[f"{base}/slow"].status is None and results[f"{base}/slow"].error
+    assert server.requests.count(('HEAD', '/ok')) == 2  # the URL itself and the redirect target
+    print("✅ Status and fallbacks test passed")
+
+
+def test_per_host_pool():
+    """Test that one host gets at most per_host connections, reused with keep-alive."""
+    with stub_server() as (server, base):
+        checker = LinkChecker(per_host=2)
+        results = checker.check(f"{base}/ok/{i}" for i in range(40))
+    
+    assert all(result.ok for result in results.values())
+    assert len(server.requests) == 40
+    assert server.peak <= 2
+    assert server.connections <= 2
+    print("✅ Per-host pool test passed")
+
+
+def test_ttl_cache():
+    """Test that cached results are reused until they expire and transient failures are not cached."""
+    with tempfile.TemporaryDirectory() as tmp, stub_server() as (server, base):
+        cache_path = os.path.join(tmp, 'links.json')
+        urls = [f"{base}/ok", f"{base}/missing", f"{base}/slow", f"{base}/forbidden", f"{base}/busy"]
+        LinkChecker(LinkCache(cache_path), timeout=0.2).check(urls)
+        fetched = len(server.requests)
+        
+        cache = LinkCache(cache_path)
+        results = LinkChecker(cache, timeout=0.2).check(urls)
+        assert results[f"{base}/missing"].status == 404 and results[f"{base}/busy"].status == 503
+        assert cache.hits == 2 and cache.misses == 3
+        assert {path for _, path in server.requests[fetched:]} == {'/slow', '/forbidden', '/busy'}
+        
+        fetched = len(server.requests)
+        cache = LinkCache(cache_path, ttl=3600, failure_ttl=0)
+        time.sleep(0.01)
+        LinkChecker(cache, timeout=0.2).check(urls[:2])
+        assert {path for _, path in server.requests[fetched:]} == {'/missing'}
+    print("✅ TTL cache test passed")
+
+
+def test_batch_link_check():
+    """Test that --batch with a link checker fails files with dead links and warns about blocked ones."""
+    submission = {
+        'username': 'test_user',
+        'paper_title': 'Test Paper Title',
+        'identifier': '10.1234/example',
+        'claim_type': 'custom_code',
+        'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}]
+    }
+    with tempfile.TemporaryDirectory() as tmp, stub_server() as (server, base):
+        for name, pdf in (('good', '/ok'), ('dead', '/missing'), ('blocked', '/forbidden')):
+            with open(os.path.join(tmp, f"{name}.json"), 'w') as f:
+                json.dump(dict(submission, paper_pdf=base + pdf, code_url=f"{base}/ok"), f)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = run_batch([tmp], jobs=1, link_checker=LinkChecker())
+    
+    report = output.getvalue()
+    assert exit_code == 1
+    assert f"paper_pdf is unreachable: {base}/missing (HTTP 404)" in report
+    assert f"paper_pdf could not be checked: {base}/forbidden (HTTP 403)" in report
+    assert "Passed: 2" in report
+    # The shared code_url was fetched once for both files
+    assert server.requests.count(('HEAD', '/ok')) == 1
+    print("✅ Batch link check test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running link checker tests...\n")
+    
+    tests = [
+        test_status_and_fallbacks,
+        test_per_host_pool,
+        test_ttl_cache,
+        test_batch_link_check
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Test organizing submission files by username.
+"""
+
+import contextlib
+import errno
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import organize_by_username
+from organize_by_username import NameIndex, move_file, organize_files
+from organize_journal import JournalWriter, OrganizeJournal, file_sha256
+
+
+def write_submission(path, username='test_user', **extra):
+    """Write a minimal submission for username at path."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(dict({'username': username, 'paper_title': 'Test'}, **extra)))
+
+
+def run_quietly(function, *args, **kwargs):
+    """Call function while discarding its progress output."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function(*args, **kwargs)
+
+
+def test_collision_names():
+    """Test same-named files get stem_1, stem_2, ... and skip taken names."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        for i in range(4):
+            write_submission(source / str(i) / 'paper.json')
+        write_submission(target / 'test_user' / 'paper_2.json')
+        
+        processed, errors = run_quietly(organize_files, str(source), str(target))
+        names = sorted(p.name for p in (target / 'test_user').iterdir())
+    
+    assert (processed, errors) == (4, 0)
+    assert names == ['paper.json', 'paper_1.json', 'paper_2.json', 'paper_3.json', 'paper_4.json']
+    print("✅ Collision names test passed")
+
+
+def test_name_index_release():
+    """Test that a released name can be reserved again."""
+    with tempfile.TemporaryDirectory() as tmp:
+        index = NameIndex()
+        first = index.reserve(Path(tmp), 'a.json')
+        index.release(first)
+        again = index.reserve(Path(tmp), 'a.json')
+    
+    assert first == again
+    print("✅ Name index release test passed")
+
+
+def test_move_across_devices():
+    """Test the copy fallback when a rename crosses filesystems."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'a.json'), Path(tmp, 'b.json')
+        source.write_text('{}')
+        with mock.patch.object(organize_by_username.os, 'rename',
+                               side_effect=OSError(errno.EXDEV, 'cross-device')):
+            move_file(source, target)
+        
+        assert not source.exists()
+        assert target.read_text() == '{}'
+        assert [p.name for p in Path(tmp).iterdir()] == ['b.json']
+    print("✅ Move across devices test passed")
+
+
+def test_skips_examples_and_bad_files():
+    """Test that example files stay put and files without usernames are errors."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        write_submission(source / 'example_submission_in.json')
+        write_submission(source / 'nobody.json', username='')
+        write_submission(source / 'ok.yaml')
+        
+        processed, errors = run_quietly(organize_files, str(source), str(target))
+        
+        assert (processed, errors) == (1, 1)
+        assert (source / 'example_submission_in.json').exists()
+        assert (target / 'test_user' / 'ok.yaml').exists()
+    print("✅ Skip examples and bad files test passed")
+
+
+def test_parallel_matches_serial():
+    """Test that --jobs gives the same counts and tree as the serial path."""
+    trees = []
+    counts = []
+    for jobs in (1, 3):
+        with tempfile.TemporaryDirectory() as tmp:
+            source, target = Path(tmp, 'source'), Path(tmp, 'target')
+            for i in range(30):
+                write_submission(source / f"{i:02d}" / 'paper.json', username=f"user{i % 4}")
+            write_submission(source / 'broken.json', username='!!!')
+            (source / 'unparseable.yaml').write_text('key: [unclosed')
+            
+            counts.append(run_quietly(organize_files, str(source), str(target), jobs=jobs))
+            trees.append(sorted(str(p.relative_to(target)) for p in target.rglob('*')))
+    
+    assert counts[0] == counts[1] == (30, 2)
+    assert trees[0] == trees[1]
+    print("✅ Parallel matches serial test passed")
+
+
+def test_journal_counts_and_rerun():
+    """Test journal user counts and that re-submitted content is not duplicated."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        journal_path = str(target / '.organize_journal.jsonl')
+        for i in range(3):
+            write_submission(source / f"paper_{i}.json", username=f"user{i % 2}", n=i)
+        run_quietly(organize_files, str(source), str(target), journal_path=journal_path)
+        
+        write_submission(source / 'paper_0.json', username='user0', n=0)
+        write_submission(source / 'new.json', username='user1', paper_title='New')
+        processed, errors = run_quietly(organize_files, str(source), str(target),
+                                        journal_path=journal_path)
+        journal = OrganizeJournal(journal_path)
+        
+        assert (processed, errors) == (1, 0)
+        # The duplicate input is left alone, or set aside with a quarantine directory
+        assert (source / 'paper_0.json').exists()
+        assert journal.user_counts == {'user0': 2, 'user1': 2}
+        assert sorted(p.name for p in (target / 'user0').iterdir()) == ['paper_0.json', 'paper_2.json']
+        
+        quarantine = Path(tmp, 'quarantine')
+        processed, errors = run_quietly(organize_files, str(source), str(target),
+                                        journal_path=journal_path, quarantine_dir=str(quarantine))
+        report = json.loads((quarantine / 'paper_0.json.issues.json').read_text())
+        assert (processed, errors) == (0, 0)
+        assert not (source / 'paper_0.json').exists() and (quarantine / 'paper_0.json').exists()
+        assert [issue['code'] for issue in report['warnings']] == ['file.duplicate']
+    print("✅ Journal counts and rerun test passed")
+
+
+def test_journal_resumes_interrupted_move():
+    """Test that a move interrupted after the copy is completed, not duplicated."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        journal_path = str(target / '.organize_journal.jsonl')
+        write_submission(source / 'paper.json')
+        # Simulate a cross-device move that died after placing the copy
+        (target / 'test_user').mkdir(parents=True)
+        (target / 'test_user' / 'paper.json').write_bytes((source / 'paper.json').read_bytes())
+        with JournalWriter(journal_path) as writer:
+            writer.write('begin', file_sha256(source / 'paper.json'), 'test_user/paper.json', 'test_user')
+        
+        processed, errors = run_quietly(organize_files, str(source), str(target),
+                                        journal_path=journal_path)
+        
+        assert (processed, errors) == (0, 0)
+        assert not (source / 'paper.json').exists()
+        assert [p.name for p in (target / 'test_user').iterdir()] == ['paper.json']
+        assert OrganizeJournal(journal_path).user_counts == {'test_user': 1}
+    print("✅ Journal resume test passed")
+
+
+def test_journal_bootstrap_and_compact():
+    """Test seeding a journal from an existing tree and compacting it."""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp)
+        for i in range(3):
+            write_submission(target / 'alice' / f"{i}.json", username='alice', n=i)
+        journal = OrganizeJournal(str(target / '.organize_journal.jsonl'))
+        journal.bootstrap(target)
+        journal.compact()
+        
+        assert OrganizeJournal(journal.path).user_counts == {'alice': 3}
+        assert OrganizeJournal(journal.path).lookup(file_sha256(target / 'alice' / '1.json')) == 'alice/1.json'
+    print("✅ Journal bootstrap test passed")
+
+
+def test_journal_counts_identical_and_removed_files():
+    """Test that files with identical content each count and removed files stop counting."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        journal_path = str(target / '.organize_journal.jsonl')
+        for name in ('a.json', 'b.json', 'c.json'):
+            write_submission(target / 'alice' / name, username='alice')
+        write_submission(target / 'bob' / 'd.json', username='bob', n=1)
+        journal = OrganizeJournal(journal_path)
+        journal.bootstrap(target)
+        assert journal.user_counts == {'alice': 3, 'bob': 1}
+        
+        # A deleted file is dropped when the same content is submitted again
+        os.remove(target / 'alice' / 'a.json')
+        os.remove(target / 'alice' / 'b.json')
+        os.remove(target / 'alice' / 'c.json')
+        write_submission(source / 'again.json', username='alice')
+        run_quietly(organize_files, str(source), str(target), journal_path=journal_path)
+        journal = OrganizeJournal(journal_path)
+        assert journal.user_counts == {'alice': 1, 'bob': 1}
+        assert journal.lookup(file_sha256(target / 'alice' / 'again.json')) == 'alice/again.json'
+        
+        # Compaction against the tree drops files deleted by hand
+        os.remove(target / 'bob' / 'd.json')
+        journal.compact(target)
+        assert OrganizeJournal(journal_path).user_counts == {'alice': 1}
+        assert sorted(OrganizeJournal(journal_path).entries) == ['alice/again.json']
+    print("✅ Journal identical and removed files test passed")
+
+
+def test_canonical_json():
+    """Test canonical JSON output, cross-format dedup and provenance."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        source.mkdir()
+        (source / 'paper.yaml').write_text(
+            "username: test_user\npaper_title: '  Test  '\n"
+            "identifier: https://doi.org/10.1000/ABC\ndate: 2024-01-01\n")
+        write_submission(source / 'copy.json', paper_title='Test', identifier='10.1000/abc', date='2024-01-01')
+        journal = str(target / '.organize_journal.jsonl')
+        provenance = target / '.provenance'
+        
+        processed, errors = run_quietly(organize_files, str(source), str(target), journal_path=journal,
+                                        canonical_json=True, provenance_dir=str(provenance))
+        stored = list((target / 'test_user').iterdir())
+        originals = list((provenance / 'test_user').iterdir())
+        content = stored[0].read_text()
+    
+    assert (processed, errors) == (1, 0)
+    assert len(stored) == 1 and stored[0].suffix == '.json'
+    assert len(originals) == 1 and originals[0].stem == stored[0].stem
+    assert content == ('{"date":"2024-01-01","identifier":"10.1000/abc",'
+                       '"paper_title":"Test","username":"test_user"}\n')
+    print("✅ Canonical JSON test passed")
+
+
+def test_canonical_arxiv_version_and_key_collisions():
+    """Test that the stored form keeps the arXiv version and that colliding keys are rejected."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        write_submission(source / 'v2.json', identifier='https://arxiv.org/abs/2301.12345v2')
+        write_submission(source / 'v1.yaml', identifier='arXiv:2301.12345v1')
+        (source / 'keys.yaml').write_text("username: test_user\npaper_title: A\n'paper_title ': B\n")
+        
+        processed, errors = run_quietly(organize_files, str(source), str(target), canonical_json=True,
+                                        journal_path=str(target / '.organize_journal.jsonl'))
+        stored = [json.loads(path.read_text()) for path in (target / 'test_user').iterdir()]
+    
+    # One version was stored, the other is the same submission; the colliding keys are an error
+    assert (processed, errors) == (1, 1)
+    assert [data['identifier'] for data in stored] in (['arXiv:2301.12345v1'], ['arXiv:2301.12345v2'])
+    print("✅ Canonical arXiv version and key collisions test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running organizer tests...\n")
+    
+    tests = [
+        test_collision_names,
+        test_name_index_release,
+        test_move_across_devices,
+        test_skips_examples_and_bad_files,
+        test_parallel_matches_serial,
+        test_journal_counts_and_rerun,
+        test_journal_resumes_interrupted_move,
+        test_journal_bootstrap_and_compact,
+        test_journal_counts_identical_and_removed_files,
+        test_canonical_json,
+        test_canonical_arxiv_version_and_key_collisions
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
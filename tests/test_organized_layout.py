@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Test the hash-prefix sharded layout, its resolver and in-place migration.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import corpus_fixtures
+from claim_index import ClaimIndex
+from identifier_index import IdentifierIndex, normalize_identifier
+from organize_by_username import organize_files
+from organize_journal import OrganizeJournal
+import organized_layout
+from organized_layout import MIGRATION_FILE, Layout, OrganizedTree, load_layout, migrate, save_layout
+
+
+def make_submission(identifier, claim):
+    return corpus_fixtures.make_submission('test_user', 'paper', [claim], claim_type='pip_libraries',
+                                           steps=['Step 1'], non_reproducible=0,
+                                           paper_title='Test Paper Title', identifier=identifier)
+
+
+def write_source(source):
+    """Write three submissions of one user, two of them named paper.json."""
+    for subdir, identifier in (('a', '10.1234/one'), ('b', '10.1234/two')):
+        Path(source, subdir).mkdir(parents=True)
+        Path(source, subdir, 'paper.json').write_text(json.dumps(
+            make_submission(identifier, f"Thin films of {identifier} show a bandgap of 1.55 eV.")))
+    Path(source, 'other.json').write_text(json.dumps(make_submission('10.1234/three', 'Another claim.')))
+
+
+def organize(source, target, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        result = organize_files(str(source), str(target), **kwargs)
+    return result, output.getvalue()
+
+
+def test_organize_into_shards():
+    """Test that the organizer places files in their shard and readers resolve them."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        write_source(source)
+        layout = Layout(shard_width=1)
+        save_layout(target, layout)
+        (processed, errors), output = organize(source, target, journal_path=str(target / '.journal.jsonl'))
+        assert (processed, errors) == (3, 0)
+        
+        tree = OrganizedTree(str(target))
+        assert tree.layout == layout and load_layout(tmp) == Layout()
+        names = sorted(path.name for path in tree.files('test_user'))
+        assert names == ['other.json', 'paper.json', 'paper_1.json']
+        for name in names:
+            path = tree.path('test_user', name)
+            assert path.is_file() and path.parent.name == layout.shard(name) and len(path.parent.name) == 1
+            assert tree.resolve(f"test_user/{name}") == path
+            assert tree.resolve(layout.relative('test_user', name)) == path
+        assert tree.resolve('test_user/missing.json') is None and tree.resolve('test_user') is None
+        
+        journal = OrganizeJournal(str(target / '.journal.jsonl'))
+        assert sorted(journal.entries) == sorted(
+            layout.relative('test_user', name) for name in names)
+        assert journal.user_counts == {'test_user': 3}
+        (processed, errors), output = organize(source, target)
+        assert 'test_user: 3 file(s)' in output
+    print("✅ Organize into shards test passed")
+
+
+def test_migrate_in_place():
+    """Test re-sharding a tree and back, keeping the journal and indexes pointed at the files."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        write_source(source)
+        paths = {
+            'journal_path': str(target / '.organize_journal.jsonl'),
+            'identifier_index_dir': str(target / '.identifier_index'),
+            'claim_index_path': str(target / '.claim_index.sqlite'),
+        }
+        organize(source, target, **paths)
+        flat = sorted(path.relative_to(target).as_posix() for path in OrganizedTree(str(target)).files())
+        assert flat == ['test_user/other.json', 'test_user/paper.json', 'test_user/paper_1.json']
+        
+        layout = Layout(shard_width=2)
+        assert migrate(str(target), layout, **paths) == {'moved': 3, 'renamed': 0, 'unchanged': 0}
+        tree = OrganizedTree(str(target))
+        sharded = sorted(path.relative_to(target).as_posix() for path in tree.files())
+        assert sharded == sorted(layout.relative('test_user', Path(p).name) for p in flat)
+        assert all(tree.resolve(reference) for reference in flat)
+        assert sorted(os.listdir(target / 'test_user')) == sorted({layout.shard(Path(p).name) for p in flat})
+        
+        journal = OrganizeJournal(paths['journal_path'])
+        assert sorted(journal.entries) == sharded
+        index = IdentifierIndex(paths['identifier_index_dir'])
+        other = layout.relative('test_user', 'other.json')
+        assert index.lookup(normalize_identifier('10.1234/three')) == [other]
+        with ClaimIndex(paths['claim_index_path'], readonly=True) as claims:
+            assert {match.path for match in claims.query("Another claim.")} == {other}
+        # Running it again finds everything in place
+        assert migrate(str(target), layout, **paths)['unchanged'] == 3
+        
+        assert migrate(str(target), Layout(), **paths)['moved'] == 3
+        assert sorted(os.listdir(target / 'test_user')) == ['other.json', 'paper.json', 'paper_1.json']
+        assert sorted(OrganizeJournal(paths['journal_path']).entries) == flat
+    print("✅ Migrate in place test passed")
+
+
+def test_resume_interrupted_migration():
+    """Test that re-running a migration interrupted after some renames rewrites the stored paths."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        write_source(source)
+        paths = {
+            'journal_path': str(target / '.organize_journal.jsonl'),
+            'identifier_index_dir': str(target / '.identifier_index'),
+            'claim_index_path': str(target / '.claim_index.sqlite'),
+        }
+        organize(source, target, **paths)
+        layout = Layout(shard_width=2)
+        
+        rename, renamed = os.rename, []
+        
+        def rename_once(src, dst):
+            if renamed:
+                raise KeyboardInterrupt
+            rename(src, dst)
+            renamed.append(dst)
+        
+        organized_layout.os.rename = rename_once
+        try:
+            migrate(str(target), layout, **paths)
+            assert False, "migration was not interrupted"
+        except KeyboardInterrupt:
+            pass
+        finally:
+            organized_layout.os.rename = rename
+        assert len(renamed) == 1 and (target / MIGRATION_FILE).exists()
+        
+        assert migrate(str(target), layout, **paths) == {'moved': 0, 'renamed': 0, 'unchanged': 3}
+        assert not (target / MIGRATION_FILE).exists()
+        sharded = sorted(path.relative_to(target).as_posix() for path in OrganizedTree(str(target)).files())
+        assert sharded == sorted(layout.relative('test_user', name)
+                                 for name in ('other.json', 'paper.json', 'paper_1.json'))
+        journal = OrganizeJournal(paths['journal_path'])
+        assert sorted(journal.entries) == sharded
+        other = layout.relative('test_user', 'other.json')
+        index = IdentifierIndex(paths['identifier_index_dir'])
+        assert index.lookup(normalize_identifier('10.1234/three')) == [other]
+        with ClaimIndex(paths['claim_index_path'], readonly=True) as claims:
+            assert {match.path for match in claims.query("Another claim.")} == {other}
+    print("✅ Resume interrupted migration test passed")
+
+
+def test_migration_conflict_kept_in_plan():
+    """Test that a planned move whose target is taken is reported and kept in the plan, not dropped."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source, target = Path(tmp, 'source'), Path(tmp, 'target')
+        write_source(source)
+        journal_path = str(target / '.organize_journal.jsonl')
+        organize(source, target, journal_path=journal_path)
+        layout = Layout(shard_width=1)
+        
+        rename = os.rename
+        
+        def interrupt(src, dst):
+            raise KeyboardInterrupt
+        
+        organized_layout.os.rename = interrupt
+        try:
+            migrate(str(target), layout, journal_path=journal_path)
+            assert False, "migration was not interrupted"
+        except KeyboardInterrupt:
+            pass
+        finally:
+            organized_layout.os.rename = rename
+        with open(target / MIGRATION_FILE, 'r', encoding='utf-8') as f:
+            plan = json.load(f)
+        old, new = 'test_user/other.json', layout.relative('test_user', 'other.json')
+        assert plan[old] == new
+        (target / new).parent.mkdir(exist_ok=True)
+        (target / new).write_text('{}')
+        
+        try:
+            migrate(str(target), layout, journal_path=journal_path)
+            assert False, "conflicting move was dropped silently"
+        except FileExistsError as e:
+            assert old in str(e)
+        with open(target / MIGRATION_FILE, 'r', encoding='utf-8') as f:
+            assert json.load(f) == {old: new}
+        assert (target / old).is_file()
+        assert sorted(OrganizeJournal(journal_path).entries) == sorted(
+            [old] + [layout.relative('test_user', name) for name in ('paper.json', 'paper_1.json')])
+        
+        (target / new).unlink()
+        assert migrate(str(target), layout, journal_path=journal_path)['unchanged'] == 3
+        assert not (target / MIGRATION_FILE).exists() and not (target / old).exists()
+        assert json.loads((target / new).read_text())['identifier'] == '10.1234/three'
+        assert new in OrganizeJournal(journal_path).entries
+    print("✅ Migration conflict kept in plan test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running organized layout tests...\n")
+    
+    tests = [
+        test_organize_into_shards,
+        test_migrate_in_place,
+        test_resume_interrupted_migration,
+        test_migration_conflict_kept_in_plan
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Test the single-parse validate-and-organize pipeline and its quarantine.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from organize_by_username import organize_files
+
+
+SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'pip_libraries',
+    'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}],
+    'non_reproducible_claims': []
+}
+
+
+def make_source(tmp):
+    """Write one valid, one invalid and one unparsable submission."""
+    source = Path(tmp, 'source')
+    source.mkdir()
+    (source / 'good.json').write_text(json.dumps(SUBMISSION))
+    (source / 'empty_claims.json').write_text(json.dumps(dict(SUBMISSION, username='other_user', claims=[])))
+    (source / 'broken.yaml').write_text("username: [unclosed\n")
+    return source
+
+
+def organize(*args, **kwargs):
+    with contextlib.redirect_stdout(io.StringIO()) as output:
+        result = organize_files(*args, **kwargs)
+    return result, output.getvalue()
+
+
+def test_invalid_files_are_quarantined():
+    """Test that valid files are organized and invalid ones quarantined with their issues."""
+    for jobs in (1, 2):
+        with tempfile.TemporaryDirectory() as tmp:
+            source = make_source(tmp)
+            target, quarantine = Path(tmp, 'target'), Path(tmp, 'quarantine')
+            (processed, errors), output = organize(str(source), str(target), jobs=jobs, validate=True,
+                                                   quarantine_dir=str(quarantine))
+            assert (processed, errors) == (1, 2), output
+            assert (target / 'test_user' / 'good.json').exists()
+            assert not (target / 'other_user').exists()
+            assert sorted(p.name for p in source.iterdir()) == []
+            
+            report = json.loads((quarantine / 'empty_claims.json.issues.json').read_text())
+            assert (quarantine / 'empty_claims.json').exists()
+            assert report['source'] == str(source / 'empty_claims.json')
+            assert [issue['code'] for issue in report['errors']] == ['claims.empty']
+            report = json.loads((quarantine / 'broken.yaml.issues.json').read_text())
+            assert report['errors'][0]['code'] == 'parse.yaml'
+            assert 'Rejected as invalid: 2' in output
+    print("✅ Invalid files quarantined test passed")
+
+
+def test_rejects_stay_without_quarantine():
+    """Test that without a quarantine directory rejected files stay in the source."""
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_source(tmp)
+        target = Path(tmp, 'target')
+        (processed, errors), output = organize(str(source), str(target), validate=True,
+                                               required_fields=['username', 'claims'])
+        assert (processed, errors) == (1, 2)
+        assert sorted(p.name for p in source.iterdir()) == ['broken.yaml', 'empty_claims.json']
+        assert 'At least one claim is required' in output
+        
+        # Without validation the same invalid submission is organized
+        (processed, errors), output = organize(str(source), str(target))
+        assert (target / 'other_user' / 'empty_claims.json').exists()
+    print("✅ Rejects stay without quarantine test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running process submissions tests...\n")
+    
+    tests = [
+        test_invalid_files_are_quarantined,
+        test_rejects_stay_without_quarantine
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test the static browse and search shards built for the docs site.
+"""
+
+import contextlib
+import functools
+import gzip
+import io
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+import corpus_fixtures
+from site_index import SiteIndex, shard_of
+
+# Submissions with a title and claim texts, one instruction step and a paper PDF
+write_organized = functools.partial(corpus_fixtures.write_organized, steps=['python run.py'],
+                                    non_reproducible=0, paper_pdf='https://example.com/paper.pdf')
+
+
+def build(out_dir, root):
+    with contextlib.redirect_stdout(io.StringIO()):
+        index = SiteIndex(out_dir, page_size=2)
+        return index, index.build(root)
+
+
+def paths(entries):
+    return [entry['path'] for entry in entries]
+
+
+def test_build_and_search():
+    """Test the manifest, listing pages and term shards of a fresh build."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = os.path.join(tmp, 'organized'), os.path.join(tmp, 'corpus')
+        write_organized(root, 'alice', 'a.json', ['The bandgap is 1.55 eV'],
+                        paper_title='Perovskite bandgap tuning')
+        write_organized(root, 'alice', 'b.json', ['CO2 uptake of MOF-74'], paper_title='MOF adsorption')
+        write_organized(root, 'bob', 'c.json', ['Oxide films are stable'], paper_title='Bandgap of oxides')
+        index, stats = build(out, root)
+        
+        assert stats['added'] == 3 and stats['pages_written'] == 2
+        manifest = json.loads(Path(out, 'manifest.json').read_text())
+        assert (manifest['documents'], manifest['pages'], manifest['page_size']) == (3, 2, 2)
+        with gzip.open(Path(out, 'pages', '00001.json.gz'), 'rt') as f:
+            [entry] = json.load(f)
+        assert entry['path'] == 'bob/c.json' and entry['user'] == 'bob' and entry['claims'] == 1
+        with gzip.open(Path(out, 'index', f"{shard_of('bandgap')}.json.gz"), 'rt') as f:
+            assert json.load(f)['bandgap'] == [0, 2]
+        
+        assert paths(index.search('BANDGAP')) == ['bob/c.json', 'alice/a.json']
+        assert paths(index.search('bandgap adsorption')) == []
+        assert paths(index.search('the bandgap oxides')) == ['bob/c.json']
+        assert paths(index.search('CO2 uptake')) == ['alice/b.json']
+        assert index.search('the of') == []
+    print("✅ Build and search test passed")
+
+
+def test_incremental_build():
+    """Test that rebuilds touch only changed pages and shards and match a fresh build."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root, out = os.path.join(tmp, 'organized'), os.path.join(tmp, 'corpus')
+        for name in 'abcde':
+            write_organized(root, 'alice', f'{name}.json', [f'Claim about sample{name}'],
+                            paper_title=f'Paper {name}')
+        build(out, root)
+        before = {path: path.read_bytes() for path in Path(out).rglob('*.gz')}
+        
+        index, stats = build(out, root)
+        assert stats['unchanged'] == 5 and stats['pages_written'] == stats['shards_written'] == 0
+        assert {path: path.read_bytes() for path in Path(out).rglob('*.gz')} == before
+        
+        # A fresh checkout: new mtimes and no stat cache, yet nothing is re-parsed
+        os.remove(os.path.join(root, '.site_index_cache.json'))
+        for path in Path(root).rglob('*.json'):
+            os.utime(path, ns=(1, 1))
+        index, stats = build(out, root)
+        assert stats['unchanged'] == 5 and stats['pages_written'] == stats['shards_written'] == 0
+        
+        write_organized(root, 'alice', 'c.json', ['Claim about graphene'], paper_title='Paper c')
+        write_organized(root, 'bob', 'f.json', ['Claim about graphene'], paper_title='Paper f')
+        Path(root, 'alice', 'b.json').write_text('{')
+        index, stats = build(out, root)
+        assert (stats['updated'], stats['added'], stats['errors']) == (1, 1, 1)
+        assert stats['pages_written'] == 2 and stats['shards_written'] < len(before)
+        assert paths(index.search('graphene')) == ['bob/f.json', 'alice/c.json']
+        assert index.search('samplec') == [] and paths(index.search('sampleb')) == ['alice/b.json']
+        
+        # Removing most documents renumbers the ids and drops surplus pages
+        for name in 'abcd':
+            os.remove(os.path.join(root, 'alice', f'{name}.json'))
+        index, stats = build(out, root)
+        assert stats['removed'] == 4
+        assert [entry['path'] for entry in index.entries] == ['alice/e.json', 'bob/f.json']
+        assert sorted(os.listdir(Path(out, 'pages'))) == ['00000.json.gz']
+        
+        fresh, _ = build(os.path.join(tmp, 'fresh'), root)
+        assert fresh.postings == index.postings and fresh.entries == index.entries
+    print("✅ Incremental build test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running site index tests...\n")
+    
+    tests = [
+        test_build_and_search,
+        test_incremental_build
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
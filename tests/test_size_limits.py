@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test size limits against oversized and adversarial submissions.
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from data_loader import LimitError, ParseLimits, loads
+from validate_submission import SubmissionValidator, run_jsonl
+
+SMALL = ParseLimits(max_bytes=4096, max_claims=5, max_steps=3, max_string=200,
+                    max_yaml_nodes=500, max_yaml_aliases=10)
+
+BILLION_LAUGHS = 'a: &a ["lol","lol","lol","lol","lol","lol","lol","lol","lol"]\n' + ''.join(
+    f"{name}: &{name} [{', '.join([f'*{previous}'] * 9)}]\n"
+    for previous, name in zip('abcdefgh', 'bcdefghi'))
+
+
+def validate(tmp, name, content, limits=SMALL):
+    """Write content to tmp/name and return the validator's errors."""
+    path = Path(tmp, name)
+    path.write_text(content)
+    return SubmissionValidator(limits=limits).validate_file(str(path))[1]
+
+
+def assert_limit(text, file_ext, fragment, limits=SMALL):
+    """Assert that parsing text raises a LimitError mentioning fragment."""
+    try:
+        loads(text, file_ext, limits)
+    except LimitError as e:
+        assert fragment in str(e), str(e)
+        return
+    assert False, f"no limit error for {text[:40]!r}"
+
+
+def test_file_size_limit():
+    """Test that oversized files are rejected before parsing."""
+    with tempfile.TemporaryDirectory() as tmp:
+        content = json.dumps({'username': 'x' * 5000})
+        errors = validate(tmp, 'big.json', content)
+    assert errors == [f"Submission too large: file is {len(content)} bytes (limit 4096)"]
+    print("✅ File size limit test passed")
+
+
+def test_json_limits():
+    """Test claim, step and string limits on JSON."""
+    claims = [{'claim': 'c', 'instruction': ['s']} for _ in range(6)]
+    assert_limit(json.dumps({'claims': claims, 'pad': ' ' * 300}), '.json', "'claims' has 6 items (limit 5)")
+    steps = {'claims': [{'claim': 'c', 'instruction': ['step'] * 4}], 'pad': ' ' * 300}
+    assert_limit(json.dumps(steps), '.json', "'instruction' has 4 items (limit 3)")
+    assert_limit(json.dumps({'claims': [{'claim': 'x' * 201}]}), '.json', "a string of 201 characters")
+    assert_limit(json.dumps({'x' * 201: 1}), '.json', "a string of 201 characters")
+    # Strings in nested lists and in a top-level array, as on the YAML path
+    assert_limit(json.dumps([['x' * 201]]), '.json', "a string of 201 characters")
+    assert_limit(json.dumps({'notes': [['x' * 201]]}), '.json', "a string of 201 characters")
+    assert_limit(json.dumps([{'claims': [], 'notes': [[['x' * 201]]]}]), '.json', "a string of 201 characters")
+    assert_limit(json.dumps('x' * 201), '.json', "a string of 201 characters")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        errors = validate(tmp, 'claims.json', json.dumps({'claims': claims, 'pad': ' ' * 300}))
+    assert errors == ["Submission too large: 'claims' has 6 items (limit 5)"]
+    print("✅ JSON limits test passed")
+
+
+def test_yaml_limits():
+    """Test claim, step, string and alias limits on YAML."""
+    assert_limit('claims:\n' + '- claim: c\n' * 6, '.yaml', "'claims' has more than 5 items")
+    assert_limit('claims:\n- instruction: [a, b, c, d]\n', '.yaml', "'instruction' has more than 3 items")
+    assert_limit(f"claims:\n- claim: {'x' * 201}\n", '.yaml', "a string of 201 characters")
+    aliases = 'base: &b x\n' + ''.join(f"k{i}: *b\n" for i in range(11))
+    assert_limit(aliases, '.yaml', "more than 10 YAML aliases")
+    print("✅ YAML limits test passed")
+
+
+def test_alias_bomb():
+    """Test that a billion-laughs document is rejected without being expanded."""
+    assert_limit(BILLION_LAUGHS, '.yaml', "more than 5 YAML aliases", ParseLimits(max_yaml_aliases=5))
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        errors = validate(tmp, 'bomb.yaml', BILLION_LAUGHS, ParseLimits())
+        elapsed = time.perf_counter() - start
+    assert errors == ["Submission too large: more than 200000 YAML nodes with aliases expanded"]
+    assert elapsed < 1
+    print("✅ Alias bomb test passed")
+
+
+def test_limits_allow_normal_submissions():
+    """Test that shared anchors and ordinary content stay within the limits."""
+    text = 'step: &s pip install numpy\nclaims:\n- claim: c\n  instruction: [*s, python run.py]\n'
+    assert loads(text, '.yaml', SMALL)['claims'][0]['instruction'] == ['pip install numpy', 'python run.py']
+    assert loads(json.dumps({'claims': [{'instruction': ['a'] * 3}] * 5}), '.json', SMALL)
+    print("✅ Normal submissions test passed")
+
+
+def test_jsonl_oversized_line():
+    """Test that an oversized JSON Lines record is skipped in bounded chunks."""
+    small_line = json.dumps({'username': 'a'})
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = os.path.join(tmp, 'feed.jsonl')
+        invalid_out = os.path.join(tmp, 'invalid.jsonl')
+        with open(feed, 'w') as f:
+            f.write(small_line + '\n' + json.dumps({'username': 'x' * 10000}) + '\n' + small_line + '\n')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            run_jsonl([feed], required_fields=['username'], invalid_out=invalid_out, limits=SMALL)
+        with open(invalid_out) as f:
+            invalid = f.read()
+    
+    report = output.getvalue()
+    assert f"❌ {feed}:2" in report and "line is over 4096 bytes" in report
+    assert "Records validated: 3" in report
+    assert 'x' * 100 not in invalid
+    print("✅ JSONL oversized line test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running size limit tests...\n")
+    
+    tests = [
+        test_file_size_limit,
+        test_json_limits,
+        test_yaml_limits,
+        test_alias_bomb,
+        test_limits_allow_normal_submissions,
+        test_jsonl_oversized_line
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,8 +8,10 @@ import yaml
 import tempfile
 import os
 import sys
+import traceback
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
+from submission_schema import Issue, compile_schema
 from validate_submission import SubmissionValidator
 
 
@@ -384,6 +386,109 @@ def test_invalid_claim_type():
     print("✅ Invalid claim_type test passed")
 
 
+INVALID_SUBMISSION = {
+    'username': 'test user',  # Space is not allowed
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'custom_code',
+    'claims': [
+        {'claim': 'Test claim 1', 'context': '', 'instruction': ['Step 1']},
+        {'claim': 'Test claim 2', 'instruction': ['Step 1', '  ']}
+    ]
+}
+
+
+def test_structured_issues():
+    """Test that failures carry a code, path and claim index besides the message."""
+    validator = SubmissionValidator()
+    is_valid, errors, warnings = validator.validate_data(INVALID_SUBMISSION)
+    
+    assert not is_valid
+    assert validator.errors == [
+        Issue('username.chars', 'username', None,
+              "Username can only contain letters, numbers, hyphens, and underscores"),
+        Issue('code_url.missing', 'code_url', None, "code_url is required for custom_code claim type"),
+        Issue('claim.step_empty', 'claims[1].instruction[1]', 2,
+              "Claim 2 instruction step 2 must be a non-empty string"),
+    ]
+    assert validator.warnings == [
+        Issue('claim.context_empty', 'claims[0].context', 1,
+              "Claim 1 context should be a non-empty string if provided", 'warning'),
+    ]
+    # The returned strings are the rendered messages
+    assert errors == [issue.message for issue in validator.errors]
+    assert warnings == [str(issue) for issue in validator.warnings]
+    print("✅ Structured issues test passed")
+
+
+def test_fail_fast():
+    """Test that fail-fast stops at the first error with the same verdict."""
+    validator = SubmissionValidator(fail_fast=True)
+    is_valid, errors, warnings = validator.validate_data(INVALID_SUBMISSION)
+    
+    assert not is_valid
+    assert [issue.code for issue in validator.issues] == ['username.chars']
+    assert errors == ["Username can only contain letters, numbers, hyphens, and underscores"]
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        json.dump(dict(INVALID_SUBMISSION, username='test_user', code_url='https://github.com/test/repo'), f)
+    try:
+        is_valid, errors, warnings = validator.validate_file(f.name)
+    finally:
+        os.unlink(f.name)
+    # Warnings found before the first error are kept
+    assert not is_valid
+    assert [issue.code for issue in validator.issues] == ['claim.step_empty', 'claim.context_empty']
+    print("✅ Fail-fast test passed")
+
+
+def test_compiled_checks():
+    """Test the generated check functions, their source and schema errors."""
+    schema = [
+        {'field': 'size', 'rules': [
+            {'check': 'max_length', 'limit': 3, 'code': 'size.long', 'message': "Too long"},
+            {'check': 'requires_when', 'value': 'big', 'field': 'unit', 'code': 'unit.missing',
+             'message': "Unit is required"},
+        ]},
+        {'field': 'rows', 'rules': [
+            {'check': 'items', 'code': 'row.type', 'message': "Row {index} must be a dictionary", 'schema': [
+                {'field': 'cells', 'rules': [
+                    {'check': 'each_non_empty_string', 'severity': 'warning', 'code': 'cell.empty',
+                     'message': "Row {index} cell {step} is empty"},
+                ]},
+            ]},
+        ]},
+    ]
+    check_size, check_rows = compile_schema(schema)
+    assert check_size.__name__ == 'check_size' and 'def check_size(' in check_size.source
+    
+    errors, warnings = [], []
+    check_size({'size': 'big'}, errors, warnings)
+    check_rows({'rows': [{'cells': ['a', ' ']}, 'row']}, errors, warnings)
+    assert errors == [Issue('unit.missing', 'unit', None, "Unit is required"),
+                      Issue('row.type', 'rows[1]', 2, "Row 2 must be a dictionary")]
+    assert warnings == [Issue('cell.empty', 'rows[0].cells[1]', 1, "Row 1 cell 2 is empty", 'warning')]
+    
+    # Tracebacks point into the generated source
+    try:
+        check_size({'size': 3}, [], [])
+        assert False, "len() of an int did not raise"
+    except TypeError as e:
+        frame = traceback.extract_tb(e.__traceback__)[-1]
+    assert frame.filename == '<schema:size>'
+    assert frame.line == check_size.source.splitlines()[frame.lineno - 1].strip()
+    
+    for rule in ({'check': 'not_empty', 'message': "No code"},
+                 {'check': 'no_such_check', 'code': 'x', 'message': "x"}):
+        try:
+            compile_schema([{'field': 'x', 'rules': [rule]}])
+            assert False, f"{rule} was accepted"
+        except ValueError:
+            pass
+    print("✅ Compiled checks test passed")
+
+
 def main():
     """Run all tests."""
     print("Running validation tests with new fields...\n")
@@ -400,7 +505,10 @@ def main():
         test_optional_context_field,
         test_non_reproducible_claims_optional,
         test_non_reproducible_claims_with_reason,
-        test_invalid_claim_type
+        test_invalid_claim_type,
+        test_structured_issues,
+        test_fail_fast,
+        test_compiled_checks
     ]
     
     for test in tests:
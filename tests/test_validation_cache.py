@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the content-hash validation cache.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from validate_submission import SubmissionValidator
+from validation_cache import ValidationCache
+
+
+SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'custom_code',
+    'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}]
+}
+
+
+def test_cache_hit_skips_parsing():
+    """Test that an unchanged file is answered from the cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'submission.json')
+        with open(path, 'w') as f:
+            json.dump(SUBMISSION, f)
+        cache = ValidationCache(os.path.join(tmp, 'cache'))
+        validator = SubmissionValidator(cache=cache)
+        
+        first = validator.validate_file(path)
+        issues = validator.issues
+        validator._validate_content = None  # any parse attempt would now fail
+        second = validator.validate_file(path)
+    
+    assert first == second
+    assert validator.issues == issues and issues[0].code == 'code_url.missing'
+    assert not first[0] and any("code_url" in e for e in first[1])
+    assert cache.hits == 1 and cache.misses == 1
+    print("✅ Cache hit skips parsing test passed")
+
+
+def test_cache_invalidated_by_content_and_fields():
+    """Test that edits and different required fields miss the cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'submission.json')
+        with open(path, 'w') as f:
+            json.dump(SUBMISSION, f)
+        cache = ValidationCache(os.path.join(tmp, 'cache'))
+        
+        assert not SubmissionValidator(cache=cache).validate_file(path)[0]
+        with open(path, 'w') as f:
+            json.dump(dict(SUBMISSION, code_url='https://github.com/test/repo'), f)
+        assert SubmissionValidator(cache=cache).validate_file(path)[0]
+        SubmissionValidator(['username'], cache=cache).validate_file(path)
+    
+    assert cache.misses == 3 and cache.hits == 0
+    print("✅ Cache invalidation test passed")
+
+
+def test_yaml_parse_errors_name_their_file():
+    """Test that identical invalid YAML files each report their own name despite the cache."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ValidationCache(os.path.join(tmp, 'cache'))
+        for name in ('first.yaml', 'second.yaml'):
+            path = os.path.join(tmp, name)
+            with open(path, 'w') as f:
+                f.write('key: [unclosed')
+            _, errors, _ = SubmissionValidator(cache=cache).validate_file(path)
+            assert f'in "{path}"' in errors[0]
+    
+    assert cache.hits == 0
+    print("✅ YAML parse errors name their file test passed")
+
+
+def test_prune_by_age_and_size():
+    """Test eviction of stale entries and of the oldest entries over budget."""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ValidationCache(tmp, max_age=3600)
+        for i in range(4):
+            cache.put(ValidationCache.key(str(i).encode()), {'errors': [], 'warnings': []})
+        stale = cache._entry_path(ValidationCache.key(b'0'))
+        old = time.time() - 7200
+        os.utime(stale, (old, old))
+        
+        assert cache.prune() == 1
+        cache.max_bytes = 1
+        assert cache.prune() == 3
+        assert cache.get(ValidationCache.key(b'3')) is None
+    print("✅ Cache prune test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running validation cache tests...\n")
+    
+    tests = [
+        test_cache_hit_skips_parsing,
+        test_cache_invalidated_by_content_and_fields,
+        test_yaml_parse_errors_name_their_file,
+        test_prune_by_age_and_size
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
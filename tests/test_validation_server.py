@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the local HTTP/JSON validation service.
+"""
+
+import contextlib
+import http.client
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from validation_server import ValidationServer
+
+
+VALID_SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'custom_code',
+    'code_url': 'https://github.com/test/repo',
+    'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}]
+}
+
+
+@contextlib.contextmanager
+def running_server():
+    server = ValidationServer(('127.0.0.1', 0))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def request(port: int, method: str, path: str, body: str = None, content_type: str = 'application/json'):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=10)
+    try:
+        headers = {'Content-Type': content_type, 'Origin': 'https://example.github.io'}
+        connection.request(method, path, body=body.encode('utf-8') if body is not None else None,
+                           headers=headers)
+        response = connection.getresponse()
+        payload = response.read()
+        return response.status, dict(response.getheaders()), json.loads(payload) if payload else None
+    finally:
+        connection.close()
+
+
+def test_single_and_batch():
+    """Test structured results for one submission, a batch and YAML input."""
+    invalid = dict(VALID_SUBMISSION, claims=[{'claim': 'Test claim', 'instruction': []}])
+    with running_server() as port:
+        status, headers, result = request(port, 'POST', '/validate', json.dumps(VALID_SUBMISSION))
+        assert status == 200 and result == {'valid': True, 'errors': [], 'warnings': []}
+        assert headers['Access-Control-Allow-Origin'] == '*'
+        
+        status, _, result = request(port, 'POST', '/validate', json.dumps([VALID_SUBMISSION, invalid]))
+        assert status == 200
+        assert [r['valid'] for r in result['results']] == [True, False]
+        assert result['results'][1]['errors'] == [{
+            'code': 'claim.instruction_empty', 'path': 'claims[0].instruction', 'claim': 1,
+            'message': "Claim 1 'instruction' list cannot be empty", 'severity': 'error'}]
+        
+        yaml_text = "username: test_user\nclaims: []\n"
+        status, _, result = request(port, 'POST', '/validate?fail_fast=1', yaml_text, 'application/yaml')
+        assert status == 200 and not result['valid'] and len(result['errors']) == 1
+    print("✅ Single and batch test passed")
+
+
+def test_bad_requests_and_cors():
+    """Test malformed bodies, unknown paths and the CORS preflight."""
+    with running_server() as port:
+        status, _, result = request(port, 'POST', '/validate', '{"username": ')
+        assert status == 400 and result['error'].startswith("Invalid JSON format")
+        assert request(port, 'POST', '/nowhere', '{}')[0] == 404
+        assert request(port, 'GET', '/health')[2]['status'] == 'ok'
+        
+        status, headers, _ = request(port, 'OPTIONS', '/validate')
+        assert status == 204
+        assert 'POST' in headers['Access-Control-Allow-Methods']
+        assert headers['Access-Control-Allow-Headers'] == 'Content-Type'
+    print("✅ Bad requests and CORS test passed")
+
+
+def test_concurrent_requests():
+    """Test that concurrent requests each get their own, correct result."""
+    submissions = [dict(VALID_SUBMISSION, username=f"user_{i}" if i % 2 else f"user {i}") for i in range(40)]
+    with running_server() as port:
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(
+                lambda data: request(port, 'POST', '/validate', json.dumps(data))[2], submissions))
+    
+    assert [r['valid'] for r in results] == [i % 2 == 1 for i in range(40)]
+    assert all(r['errors'][0]['code'] == 'username.chars' for r in results if not r['valid'])
+    print("✅ Concurrent requests test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running validation server tests...\n")
+    
+    tests = [
+        test_single_and_batch,
+        test_bad_requests_and_cors,
+        test_concurrent_requests
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Test the file watchers and incremental re-validation of watched trees.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+from file_watcher import InotifyWatcher, PollingWatcher, debounced
+from validate_submission import WatchSession
+
+
+VALID_SUBMISSION = {
+    'username': 'test_user',
+    'paper_title': 'Test Paper Title',
+    'paper_pdf': 'https://example.com/paper.pdf',
+    'identifier': '10.1234/example',
+    'claim_type': 'custom_code',
+    'code_url': 'https://github.com/test/repo',
+    'claims': [{'claim': 'Test claim', 'instruction': ['Step 1']}]
+}
+
+
+def write(path: str, data):
+    with open(path, 'w') as f:
+        json.dump(data, f)
+
+
+def read_until(watcher, expected: str) -> set:
+    changed = set()
+    deadline = time.monotonic() + 5
+    while expected not in changed and time.monotonic() < deadline:
+        changed |= watcher.read(0.1)
+    return changed
+
+
+def test_watchers_report_changes():
+    """Test that both watchers report created, modified, removed files and new directories."""
+    for make_watcher in (lambda root: PollingWatcher([root], interval=0.02), InotifyWatcher):
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                watcher = make_watcher(tmp)
+            except OSError:
+                continue
+            try:
+                path = os.path.join(tmp, 'a.json')
+                write(path, VALID_SUBMISSION)
+                assert path in read_until(watcher, path)
+                write(path, dict(VALID_SUBMISSION, username='someone_else'))
+                assert path in read_until(watcher, path)
+                os.unlink(path)
+                assert path in read_until(watcher, path)
+                
+                # Files in a new directory are reported by path or through the directory
+                os.makedirs(os.path.join(tmp, 'new'))
+                nested = os.path.join(tmp, 'new', 'b.json')
+                write(nested, VALID_SUBMISSION)
+                changed = read_until(watcher, nested)
+                assert nested in changed or os.path.join(tmp, 'new') in changed
+            finally:
+                watcher.close()
+    print("✅ Watchers report changes test passed")
+
+
+def test_debounce_merges_bursts():
+    """Test that a burst of writes becomes one set of changes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        watcher = PollingWatcher([tmp], interval=0.02)
+        paths = [os.path.join(tmp, f"{i}.json") for i in range(3)]
+
+        def burst():
+            for path in paths:
+                write(path, VALID_SUBMISSION)
+                time.sleep(0.03)
+        
+        writer = threading.Thread(target=burst)
+        writer.start()
+        changed = next(debounced(watcher, delay=0.3))
+        writer.join()
+    
+    assert changed == set(paths)
+    print("✅ Debounce test passed")
+
+
+def test_session_revalidates_only_changes():
+    """Test that updates re-validate changed files only and track removals."""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.join(tmp, 'submissions')
+        os.makedirs(root)
+        paths = [os.path.join(root, f"{i}.json") for i in range(5)]
+        for path in paths:
+            write(path, VALID_SUBMISSION)
+        write(paths[0], dict(VALID_SUBMISSION, claims=[]))
+        
+        session = WatchSession([root], jobs=1)
+        session.start()
+        assert session.failed == 1 and len(session.results) == 5
+        
+        validated = []
+        validate_file = session.validator.validate_file
+        session.validator.validate_file = lambda path: validated.append(path) or validate_file(path)
+        
+        write(paths[0], VALID_SUBMISSION)
+        os.unlink(paths[1])
+        os.makedirs(os.path.join(root, 'nested'))
+        nested = os.path.join(root, 'nested', 'x.json')
+        write(nested, {'username': 'bad user'})
+        with open(os.path.join(root, 'notes.txt'), 'w') as f:
+            f.write('ignored')
+        
+        updates = session.update([paths[0], paths[1], os.path.join(root, 'nested'),
+                                  os.path.join(root, 'notes.txt')])
+    
+    assert sorted(validated) == sorted([paths[0], nested])
+    assert [(path, result is None) for path, result in updates] == [
+        (paths[1], True), (paths[0], False), (nested, False)]
+    assert session.results[paths[0]][0] and not session.results[nested][0]
+    assert len(session.results) == 5 and session.failed == 1
+    print("✅ Session revalidates only changes test passed")
+
+
+def main():
+    """Run all tests."""
+    print("Running watch mode tests...\n")
+    
+    tests = [
+        test_watchers_report_changes,
+        test_debounce_merges_bursts,
+        test_session_revalidates_only_changes
+    ]
+    
+    for test in tests:
+        try:
+            test()
+        except AssertionError as e:
+            print(f"❌ {test.__name__} failed: {e}")
+            return 1
+        except Exception as e:
+            print(f"❌ {test.__name__} error: {e}")
+            return 1
+    
+    print("\n✅ All tests passed!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())